@@ -1,17 +1,64 @@
 """
 S.W.A.T.H.I. Database Models
-SQLAlchemy + SQLite — zero config, maximum power
+SQLAlchemy + SQLite — zero config, maximum power (or any server database via DATABASE_URL)
 """
 
-from sqlalchemy import create_engine, Column, Integer, String, Text, Float, DateTime, ForeignKey, Boolean
+from sqlalchemy import create_engine, event, Column, Integer, String, Text, Float, DateTime, Date, ForeignKey, Boolean, LargeBinary, UniqueConstraint, Index
+from sqlalchemy.exc import OperationalError
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker, relationship
 from datetime import datetime
 import os
 
-DATABASE_URL = "sqlite:///./swathi.db"
+DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./swathi.db")
 
-engine = create_engine(DATABASE_URL, connect_args={"check_same_thread": False}, echo=False)
+# SQLite tuning
+SQLITE_BUSY_TIMEOUT_MS = int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", "5000"))
+SQLITE_CACHE_SIZE_MB = int(os.getenv("SQLITE_CACHE_SIZE_MB", "64"))
+SQLITE_MMAP_SIZE_MB = int(os.getenv("SQLITE_MMAP_SIZE_MB", "256"))
+
+# Connection pool (server databases)
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "10"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "20"))
+DB_POOL_TIMEOUT = int(os.getenv("DB_POOL_TIMEOUT", "30"))
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+
+
+def _sqlite_pragmas(dbapi_conn, _record):
+    """Per-connection tuning — WAL lets readers run alongside the (single) writer"""
+    cursor = dbapi_conn.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA synchronous=NORMAL")  # fsync at checkpoints only; safe with WAL
+    cursor.execute(f"PRAGMA busy_timeout={SQLITE_BUSY_TIMEOUT_MS}")
+    cursor.execute(f"PRAGMA cache_size=-{SQLITE_CACHE_SIZE_MB * 1024}")  # negative = KiB
+    cursor.execute(f"PRAGMA mmap_size={SQLITE_MMAP_SIZE_MB * 1024 * 1024}")
+    cursor.execute("PRAGMA temp_store=MEMORY")
+    cursor.close()
+
+
+def create_db_engine(url: str = DATABASE_URL):
+    """SQLite gets WAL + pragmas on every connection; anything else gets a sized, self-healing pool"""
+    if url.startswith("sqlite"):
+        db_engine = create_engine(
+            url,
+            connect_args={"check_same_thread": False, "timeout": SQLITE_BUSY_TIMEOUT_MS / 1000},
+            echo=False,
+        )
+        event.listen(db_engine, "connect", _sqlite_pragmas)
+        return db_engine
+
+    return create_engine(
+        url,
+        pool_size=DB_POOL_SIZE,
+        max_overflow=DB_MAX_OVERFLOW,
+        pool_timeout=DB_POOL_TIMEOUT,
+        pool_recycle=DB_POOL_RECYCLE,
+        pool_pre_ping=True,
+        echo=False,
+    )
+
+
+engine = create_db_engine()
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 Base = declarative_base()
 
@@ -75,6 +122,46 @@ class Candidate(Base):
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
     job_description = relationship("JobDescription", back_populates="candidates")
+    skills = relationship("CandidateSkill", cascade="all, delete-orphan")
+
+
+class CandidateSkill(Base):
+    """One row per candidate × skill — the indexed twin of matched_skills / missing_skills"""
+    __tablename__ = "candidate_skills"
+    __table_args__ = (
+        UniqueConstraint("candidate_id", "kind", "skill_key", name="uq_candidate_skill"),
+        Index("ix_candidate_skills_lookup", "kind", "skill_key", "jd_id", "candidate_id"),
+    )
+
+    id = Column(Integer, primary_key=True)
+    candidate_id = Column(Integer, ForeignKey("candidates.id"), nullable=False, index=True)
+    jd_id = Column(Integer, nullable=False)  # denormalized for per-JD scoping
+    kind = Column(String(10), nullable=False)  # matched, missing
+    skill_key = Column(String(100), nullable=False)  # case-folded, whitespace-collapsed
+    skill = Column(String(100), nullable=False)  # as the AI wrote it
+
+
+# Tracker breakdown buckets, first match wins: category → substrings of the lowercased action
+ACTION_CATEGORIES = [
+    ("resumes_analyzed", ("analyzed", "resume")),
+    ("jds_created", ("jd_created", "jd_generated", "jd_uploaded")),
+    ("emails_sent", ("email",)),
+    ("status_updates", ("status",)),
+    ("chats", ("chat",)),
+]
+OTHER_CATEGORY = "other"
+
+
+def action_category(action: str) -> str:
+    action = (action or "").lower()
+    for category, needles in ACTION_CATEGORIES:
+        if any(n in action for n in needles):
+            return category
+    return OTHER_CATEGORY
+
+
+def _default_category(context):
+    return action_category(context.get_current_parameters().get("action"))
 
 
 class ActivityLog(Base):
@@ -83,6 +170,7 @@ class ActivityLog(Base):
 
     id = Column(Integer, primary_key=True, index=True)
     action = Column(String(100), nullable=False)  # resume_analyzed, status_changed, jd_created, etc.
+    category = Column(String(30), default=_default_category)  # see ACTION_CATEGORIES
     entity_type = Column(String(50), nullable=False)  # candidate, jd
     entity_id = Column(Integer, nullable=False)
     details = Column(Text, default="")
@@ -102,9 +190,172 @@ class EmailTemplate(Base):
     created_at = Column(DateTime, default=datetime.utcnow)
 
 
+class AnalysisJob(Base):
+    """A queued bulk analysis — survives restarts, drained by the background workers"""
+    __tablename__ = "analysis_jobs"
+
+    id = Column(Integer, primary_key=True, index=True)
+    jd_id = Column(Integer, ForeignKey("job_descriptions.id"), nullable=False)
+    status = Column(String(20), default="queued", index=True)  # queued, running, completed
+    total_files = Column(Integer, default=0)
+    prescreen_threshold = Column(Float, nullable=True)  # None = PRESCREEN_THRESHOLD default
+    created_at = Column(DateTime, default=datetime.utcnow)
+    started_at = Column(DateTime, nullable=True)
+    finished_at = Column(DateTime, nullable=True)
+
+    items = relationship("AnalysisJobItem", back_populates="job", cascade="all, delete-orphan")
+
+
+class AnalysisJobItem(Base):
+    """One resume inside an AnalysisJob"""
+    __tablename__ = "analysis_job_items"
+
+    id = Column(Integer, primary_key=True, index=True)
+    job_id = Column(Integer, ForeignKey("analysis_jobs.id"), nullable=False, index=True)
+    position = Column(Integer, default=0)  # upload order
+    filename = Column(String(300), nullable=False)
+    file_data = Column(LargeBinary, nullable=True)  # cleared once processed
+    status = Column(String(20), default="pending", index=True)  # pending, running, done, failed
+    candidate_id = Column(Integer, nullable=True)
+    error = Column(Text, default="")
+    started_at = Column(DateTime, nullable=True)
+    finished_at = Column(DateTime, nullable=True)
+    # While running: which worker holds the item, and until when (renewed by its heartbeat)
+    claimed_by = Column(String(100), nullable=True)
+    lease_expires_at = Column(DateTime, nullable=True)
+
+    job = relationship("AnalysisJob", back_populates="items")
+
+
+class PipelineCounter(Base):
+    """Materialized candidate counts per JD × status × recommendation — kept in step by every write path"""
+    __tablename__ = "pipeline_counters"
+    __table_args__ = (UniqueConstraint("jd_id", "status", "recommendation", name="uq_pipeline_counter"),)
+
+    id = Column(Integer, primary_key=True)
+    jd_id = Column(Integer, nullable=False, index=True)
+    status = Column(String(30), nullable=False)
+    recommendation = Column(String(50), nullable=False)
+    candidate_count = Column(Integer, default=0, nullable=False)
+    score_sum = Column(Float, default=0.0, nullable=False)
+
+
+class ScoreHistogramCounter(Base):
+    """Candidates per JD per whole-number score (floor) — any integer-width histogram can be summed from it"""
+    __tablename__ = "score_histogram_counters"
+    __table_args__ = (UniqueConstraint("jd_id", "score_floor", name="uq_score_histogram_counter"),)
+
+    id = Column(Integer, primary_key=True)
+    jd_id = Column(Integer, nullable=False, index=True)
+    score_floor = Column(Integer, nullable=False)  # 0-100
+    candidate_count = Column(Integer, default=0, nullable=False)
+
+
+class DailyAnalyzedCounter(Base):
+    """Candidates analyzed per JD per UTC day"""
+    __tablename__ = "daily_analyzed_counters"
+    __table_args__ = (UniqueConstraint("day", "jd_id", name="uq_daily_analyzed_counter"),)
+
+    id = Column(Integer, primary_key=True)
+    day = Column(Date, nullable=False, index=True)
+    jd_id = Column(Integer, nullable=False)
+    candidate_count = Column(Integer, default=0, nullable=False)
+
+
+class LLMCacheEntry(Base):
+    """Content-addressed cache of AI analyses — identical inputs never hit Groq twice"""
+    __tablename__ = "llm_cache"
+
+    id = Column(Integer, primary_key=True, index=True)
+    cache_key = Column(String(64), unique=True, index=True, nullable=False)  # sha256 of prompt inputs
+    model = Column(String(100), default="")
+    response = Column(Text, nullable=False)  # JSON
+    size_bytes = Column(Integer, default=0)
+    hits = Column(Integer, default=0)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    last_used_at = Column(DateTime, default=datetime.utcnow, index=True)
+
+
+class ImportCheckpoint(Base):
+    """Progress of one NDJSON import — a re-upload with the same import_id resumes after lines_done"""
+    __tablename__ = "import_checkpoints"
+
+    id = Column(Integer, primary_key=True, index=True)
+    import_id = Column(String(200), unique=True, index=True, nullable=False)
+    filename = Column(String(300), default="")
+    status = Column(String(20), default="running")  # running, completed, failed
+    lines_done = Column(Integer, default=0)  # committed input lines, valid or not
+    rows_inserted = Column(Integer, default=0)
+    rows_skipped = Column(Integer, default=0)  # identical row already present under the same id
+    rows_invalid = Column(Integer, default=0)
+    errors = Column(Text, default="[]")  # JSON: the first invalid / conflicting lines, as {"line", "error"}
+    created_at = Column(DateTime, default=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+
+# ── Full-text search (SQLite FTS5) ───────────────────────────
+# External-content index over the candidates table; triggers keep it in sync on every write.
+
+FTS_TABLE = "candidates_fts"
+FTS_COLUMNS = ["name", "email", "current_role", "resume_text", "overall_summary"]
+_fts_ready = False
+
+_FTS_DDL = [
+    f"""CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5(
+        {", ".join(FTS_COLUMNS)},
+        content='candidates', content_rowid='id', tokenize='unicode61 remove_diacritics 2'
+    )""",
+    f"""CREATE TRIGGER IF NOT EXISTS candidates_fts_ai AFTER INSERT ON candidates BEGIN
+        INSERT INTO {FTS_TABLE}(rowid, {", ".join(FTS_COLUMNS)})
+        VALUES (new.id, {", ".join("new." + c for c in FTS_COLUMNS)});
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS candidates_fts_ad AFTER DELETE ON candidates BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, {", ".join(FTS_COLUMNS)})
+        VALUES ('delete', old.id, {", ".join("old." + c for c in FTS_COLUMNS)});
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS candidates_fts_au AFTER UPDATE OF {", ".join(FTS_COLUMNS)} ON candidates BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, {", ".join(FTS_COLUMNS)})
+        VALUES ('delete', old.id, {", ".join("old." + c for c in FTS_COLUMNS)});
+        INSERT INTO {FTS_TABLE}(rowid, {", ".join(FTS_COLUMNS)})
+        VALUES (new.id, {", ".join("new." + c for c in FTS_COLUMNS)});
+    END""",
+]
+
+
+def _init_fts():
+    """Create the FTS5 index + sync triggers; backfill it the first time"""
+    global _fts_ready
+    if engine.dialect.name != "sqlite":
+        return
+
+    with engine.begin() as conn:
+        existed = conn.exec_driver_sql(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (FTS_TABLE,)
+        ).first()
+        try:
+            for ddl in _FTS_DDL:
+                conn.exec_driver_sql(ddl)
+        except OperationalError as e:
+            print(f"⚠️  Full-text search unavailable (SQLite built without FTS5?): {e}")
+            return
+        if not existed:
+            conn.exec_driver_sql(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')")
+    _fts_ready = True
+
+
+def fts_enabled() -> bool:
+    return _fts_ready
+
+
 def init_db():
-    """Create all tables"""
+    """Create all tables, then apply pending schema migrations"""
+    from migrations import run_migrations  # imports this module
+
     Base.metadata.create_all(bind=engine)
+    applied = run_migrations()
+    if applied:
+        print(f"🗄️  Applied migrations: {', '.join(applied)}")
+    _init_fts()
 
 
 def get_db():
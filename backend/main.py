@@ -17,23 +17,44 @@ from dotenv import load_dotenv
 # Load env from parent directory
 load_dotenv(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", ".env"))
 
-from database import init_db
+from database import init_db, SessionLocal
+from services.ai_service import close_client
+from services.file_service import shutdown_extractor, validate_backends
+from services import llm_cache, llm_scheduler, prompt_builder, response_cache
+from services.response_cache import ResponseCacheMiddleware
+from services.compression import CompressionMiddleware
+from services.serializers import FastJSONResponse
+from services.job_queue import start_workers, stop_workers
+from services.stats_service import ensure_counters
 from routes.jd_routes import router as jd_router
 from routes.candidate_routes import router as candidate_router
 from routes.dashboard_routes import router as dashboard_router
 from routes.email_routes import router as email_router
 from routes.chat_routes import router as chat_router
 from routes.tracker_routes import router as tracker_router
+from routes.data_routes import router as data_router
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Initialize DB on startup"""
     print("\n✨ S.W.A.T.H.I. is waking up...")
+    validate_backends()  # a bad PDF_BACKEND / DOCX_BACKEND stops startup instead of failing every upload
     print("🧠 Initializing database...")
     init_db()
+    db = SessionLocal()
+    try:
+        ensure_counters(db)
+    finally:
+        db.close()
+    print("⚙️  Starting analysis workers...")
+    start_workers()
     print("🚀 Ready to revolutionize HR!\n")
     yield
+    await stop_workers()
+    await close_client()
+    shutdown_extractor()
+    llm_cache.flush_touches()
     print("\n💤 S.W.A.T.H.I. signing off. See you next time!\n")
 
 
@@ -42,8 +63,12 @@ app = FastAPI(
     description="Smart Workforce Automation for Talent Hiring Intelligence",
     version="1.0.0",
     lifespan=lifespan,
+    default_response_class=FastJSONResponse,
 )
 
+# Cached GET responses + ETag/304 (inside CORS so cached replies still get CORS headers)
+app.add_middleware(ResponseCacheMiddleware)
+
 # CORS for React dev server
 app.add_middleware(
     CORSMiddleware,
@@ -51,8 +76,12 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "ETag"],
 )
 
+# brotli / gzip for responses over COMPRESSION_MIN_BYTES (outermost, so cached bodies are compressed too)
+app.add_middleware(CompressionMiddleware)
+
 # Register all routes
 app.include_router(jd_router)
 app.include_router(candidate_router)
@@ -60,6 +89,7 @@ app.include_router(dashboard_router)
 app.include_router(email_router)
 app.include_router(chat_router)
 app.include_router(tracker_router)
+app.include_router(data_router)
 
 
 @app.get("/")
@@ -78,6 +108,30 @@ def health():
     return {"status": "healthy", "engine": "S.W.A.T.H.I."}
 
 
+@app.get("/health/llm-cache")
+def llm_cache_stats():
+    """AI analysis cache hit/miss counters and footprint"""
+    return llm_cache.stats()
+
+
+@app.get("/health/llm-scheduler")
+def llm_scheduler_stats():
+    """Groq quota headroom and per-lane queue depth, waits, retries and 429s"""
+    return llm_scheduler.scheduler.stats()
+
+
+@app.get("/health/prompt-builder")
+def prompt_builder_stats():
+    """Prompt tokens in vs. sent after cleaning and budget trimming of resumes and JDs"""
+    return prompt_builder.stats()
+
+
+@app.get("/health/response-cache")
+def response_cache_stats():
+    """GET response cache hit/miss/304 counters and current write generation"""
+    return response_cache.stats()
+
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run("main:app", host="0.0.0.0", port=8000, reload=True)
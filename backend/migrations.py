@@ -0,0 +1,149 @@
+"""
+S.W.A.T.H.I. Schema Migrations
+Numbered, run-once schema changes applied on startup — create_all builds new tables, these evolve existing ones
+
+Show the current schema version / apply pending migrations (from backend/):
+    python -m migrations
+"""
+
+from datetime import datetime
+from typing import Callable, List, Tuple
+
+from sqlalchemy import inspect, text
+from sqlalchemy.orm import Session
+
+from database import engine, ACTION_CATEGORIES, OTHER_CATEGORY
+from services import skill_service, stats_service
+
+SCHEMA_VERSION_TABLE = "schema_version"
+
+MIGRATIONS: List[Tuple[int, str, Callable]] = []
+
+
+def migration(version: int, name: str):
+    """Register a migration; versions must be unique and only ever appended"""
+    def register(fn):
+        assert all(v != version for v, _, _ in MIGRATIONS), f"duplicate migration {version}"
+        MIGRATIONS.append((version, name, fn))
+        return fn
+    return register
+
+
+# ── Migrations ───────────────────────────────────────────────
+# Each runs inside its own transaction and must tolerate a fresh database where
+# create_all already produced the current models.
+
+@migration(1, "activity_log_category")
+def _activity_log_category(conn):
+    """ActivityLog.category for SQL-side tracker breakdowns, backfilled in priority order"""
+    columns = {c["name"] for c in inspect(conn).get_columns("activity_logs")}
+    if "category" not in columns:
+        conn.execute(text("ALTER TABLE activity_logs ADD COLUMN category VARCHAR(30)"))
+
+    for category, needles in ACTION_CATEGORIES:
+        match = " OR ".join(f"lower(action) LIKE :n{i}" for i in range(len(needles)))
+        conn.execute(
+            text(f"UPDATE activity_logs SET category = :category WHERE category IS NULL AND ({match})"),
+            {"category": category, **{f"n{i}": f"%{n}%" for i, n in enumerate(needles)}},
+        )
+    conn.execute(
+        text("UPDATE activity_logs SET category = :category WHERE category IS NULL"),
+        {"category": OTHER_CATEGORY},
+    )
+
+
+HOT_PATH_INDEXES = [
+    # Candidate lists: per-JD pipeline filters and per-JD ranking
+    ("ix_candidates_jd_status", "candidates", "jd_id, status"),
+    ("ix_candidates_jd_score", "candidates", "jd_id, match_score"),
+    # Global sorts / filters: top candidates, newest first, recommendation filter
+    ("ix_candidates_match_score", "candidates", "match_score"),
+    ("ix_candidates_analyzed_at", "candidates", "analyzed_at"),
+    ("ix_candidates_recommendation", "candidates", "recommendation, match_score"),
+    # Recent activity, today's tracker, weekly buckets
+    ("ix_activity_logs_created_at", "activity_logs", "created_at, category"),
+    # Job queue claim: oldest pending item
+    ("ix_analysis_job_items_claim", "analysis_job_items", "status, job_id, position"),
+]
+
+
+@migration(2, "hot_path_indexes")
+def _hot_path_indexes(conn):
+    for name, table, columns in HOT_PATH_INDEXES:
+        conn.execute(text(f"CREATE INDEX IF NOT EXISTS {name} ON {table} ({columns})"))
+    # Six distinct values — the planner would rather scan it than range-seek created_at
+    conn.execute(text("DROP INDEX IF EXISTS ix_activity_logs_category"))
+
+
+@migration(3, "candidate_skills_backfill")
+def _candidate_skills_backfill(conn):
+    """Fill candidate_skills (created by create_all) from the existing JSON skill columns"""
+    skill_service.backfill(conn)
+
+
+@migration(4, "analysis_job_item_leases")
+def _analysis_job_item_leases(conn):
+    """Claim owner + lease expiry, so only items whose worker stopped heartbeating are re-queued"""
+    columns = {c["name"] for c in inspect(conn).get_columns("analysis_job_items")}
+    if "claimed_by" not in columns:
+        conn.execute(text("ALTER TABLE analysis_job_items ADD COLUMN claimed_by VARCHAR(100)"))
+    if "lease_expires_at" not in columns:
+        conn.execute(text("ALTER TABLE analysis_job_items ADD COLUMN lease_expires_at TIMESTAMP"))
+
+
+@migration(5, "prescreened_out_of_stats")
+def _prescreened_out_of_stats(conn):
+    """Screened-out resumes were logged as analyses and counted in the score stats — re-file and recount"""
+    conn.execute(
+        text("UPDATE activity_logs SET action = 'candidate_screened_out', category = :category "
+             "WHERE action = 'resume_prescreened'"),
+        {"category": OTHER_CATEGORY},
+    )
+    stats_service.rebuild_counters(Session(bind=conn))
+
+
+@migration(6, "prescreened_in_pipeline_totals")
+def _prescreened_in_pipeline_totals(conn):
+    """Screened-out resumes count in candidate / status totals again (still not in score stats) — recount"""
+    stats_service.rebuild_counters(Session(bind=conn))
+
+
+# ── Runner ───────────────────────────────────────────────────
+
+def _ensure_version_table(conn):
+    conn.execute(text(
+        f"CREATE TABLE IF NOT EXISTS {SCHEMA_VERSION_TABLE} ("
+        "version INTEGER PRIMARY KEY, name VARCHAR(100) NOT NULL, applied_at TIMESTAMP NOT NULL)"
+    ))
+
+
+def current_version(conn) -> int:
+    _ensure_version_table(conn)
+    return conn.execute(text(f"SELECT COALESCE(MAX(version), 0) FROM {SCHEMA_VERSION_TABLE}")).scalar()
+
+
+def run_migrations() -> List[str]:
+    """Apply every migration newer than the recorded schema version, in order"""
+    with engine.begin() as conn:
+        version = current_version(conn)
+
+    applied = []
+    for number, name, fn in sorted(MIGRATIONS, key=lambda m: m[0]):
+        if number <= version:
+            continue
+        with engine.begin() as conn:
+            fn(conn)
+            conn.execute(
+                text(f"INSERT INTO {SCHEMA_VERSION_TABLE} (version, name, applied_at) VALUES (:v, :n, :t)"),
+                {"v": number, "n": name, "t": datetime.utcnow()},
+            )
+        applied.append(f"{number:03d}_{name}")
+    return applied
+
+
+if __name__ == "__main__":
+    from database import init_db
+
+    init_db()
+    with engine.begin() as conn:
+        print(f"✅ Schema at version {current_version(conn)} (latest {max(v for v, _, _ in MIGRATIONS)})")
@@ -9,14 +9,22 @@ import csv
 import io
 from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Form, Query
 from fastapi.responses import StreamingResponse
+from sqlalchemy import String
 from sqlalchemy.orm import Session
 from pydantic import BaseModel
 from typing import Optional, List
 from datetime import datetime
 
-from database import get_db, Candidate, JobDescription, ActivityLog
+from database import get_db, SessionLocal, Candidate, JobDescription, ActivityLog
 from services.ai_service import analyze_resume, compare_candidates
-from services.file_service import extract_text
+from services.file_service import extract_text_async
+from services.analysis_service import build_jd_text, save_analyzed_candidates, bulk_analyze, stream_bulk_analyze
+from services import stats_service
+from services.job_queue import enqueue_job, job_status
+from services.search_service import apply_search
+from services.skill_service import skill_filter, SKILL_KINDS, SKILL_MATCH_MODES
+from services.pagination import encode_cursor, decode_cursor, keyset_filter, keyset_order
+from services.serializers import FastJSONResponse, json_list, select_fields, project
 
 router = APIRouter(prefix="/api/candidates", tags=["Candidates"])
 
@@ -33,6 +41,111 @@ class CompareRequest(BaseModel):
     candidate_ids: List[int]
 
 
+# ── Query helpers ────────────────────────────────────────────
+
+# Output field → (selected expression, formatter). Lists select only what they return.
+FIELD_SPECS = {
+    "id": (Candidate.id, None),
+    "name": (Candidate.name, None),
+    "email": (Candidate.email, None),
+    "phone": (Candidate.phone, None),
+    "current_role": (Candidate.current_role, None),
+    "experience_years": (Candidate.experience_years, None),
+    "resume_filename": (Candidate.resume_filename, None),
+    "match_score": (Candidate.match_score, None),
+    "star_rating": (Candidate.star_rating, None),
+    "recommendation": (Candidate.recommendation, None),
+    "overall_summary": (Candidate.overall_summary, None),
+    "strengths": (Candidate.strengths, json_list),
+    "gaps": (Candidate.gaps, json_list),
+    "matched_skills": (Candidate.matched_skills, json_list),
+    "missing_skills": (Candidate.missing_skills, json_list),
+    "status": (Candidate.status, None),
+    "hr_notes": (Candidate.hr_notes, None),
+    "analyzed_at": (Candidate.analyzed_at, None),  # datetimes serialize as ISO-8601
+    "jd_id": (Candidate.jd_id, None),
+    "jd_title": (JobDescription.title, lambda v: v or "Unknown"),
+    "experience_analysis": (Candidate.experience_analysis, None),
+    "resume_text": (Candidate.resume_text, None),
+}
+# Heavy free-text fields — only on request
+TEXT_FIELDS = ["experience_analysis", "resume_text"]
+DEFAULT_FIELDS = [f for f in FIELD_SPECS if f not in TEXT_FIELDS]
+
+# Keyset sorting puts the sort value in the cursor header, so only ids, numbers, dates and short strings qualify
+SORT_MAX_STRING_LENGTH = 300
+SORTABLE_COLUMNS = {
+    c.name: getattr(Candidate, c.name) for c in Candidate.__table__.columns
+    if not isinstance(c.type, String) or (c.type.length or SORT_MAX_STRING_LENGTH + 1) <= SORT_MAX_STRING_LENGTH
+}
+
+MAX_PAGE_SIZE = 500
+EXPORT_CHUNK_ROWS = int(os.getenv("EXPORT_CHUNK_ROWS", "1000"))
+
+
+def _resolve_fields(fields: Optional[str], include_text: bool) -> List[str]:
+    if not fields:
+        return DEFAULT_FIELDS + (TEXT_FIELDS if include_text else [])
+    requested = [f.strip() for f in fields.split(",") if f.strip()]
+    unknown = [f for f in requested if f not in FIELD_SPECS]
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown fields: {', '.join(unknown)}")
+    return ["id"] + [f for f in requested if f != "id"]
+
+
+def candidate_list_query(
+    db: Session,
+    selected: List[str],
+    jd_id: Optional[int] = None,
+    status: Optional[str] = None,
+    min_score: Optional[float] = None,
+    max_score: Optional[float] = None,
+    recommendation: Optional[str] = None,
+    sort_by: str = "analyzed_at",
+    sort_order: str = "desc",
+    search: Optional[str] = None,
+    skills: Optional[str] = None,
+    skill_match: str = "all",
+    skill_kind: str = "matched",
+):
+    """The filtered, ordered candidate query behind GET /api/candidates → (query, sort_expr, descending).
+    Shared with services.query_plans so the plan check explains exactly what the route runs."""
+    query = db.query(*select_fields(FIELD_SPECS, selected))
+    if "jd_title" in selected:
+        query = query.outerjoin(JobDescription, JobDescription.id == Candidate.jd_id)
+    else:
+        query = query.select_from(Candidate)
+
+    if jd_id:
+        query = query.filter(Candidate.jd_id == jd_id)
+    if status:
+        query = query.filter(Candidate.status == status)
+    if min_score is not None:
+        query = query.filter(Candidate.match_score >= min_score)
+    if max_score is not None:
+        query = query.filter(Candidate.match_score <= max_score)
+    if recommendation:
+        query = query.filter(Candidate.recommendation == recommendation)
+    wanted_skills = [s for s in (skills or "").split(",") if s.strip()]
+    if wanted_skills:
+        if skill_match not in SKILL_MATCH_MODES or skill_kind not in SKILL_KINDS:
+            raise HTTPException(status_code=400, detail="skill_match must be all|any and skill_kind matched|missing")
+        query = query.filter(skill_filter(wanted_skills, skill_match, skill_kind, jd_id))
+    rank = None
+    if search:
+        query, rank = apply_search(query, search)
+
+    # Sorting — "relevance" ranks full-text matches best-first; id breaks ties so pages never overlap
+    if sort_by != "relevance" and sort_by not in SORTABLE_COLUMNS:
+        raise HTTPException(status_code=400, detail=f"sort_by must be relevance or one of: {', '.join(SORTABLE_COLUMNS)}")
+    if sort_by == "relevance" and rank is not None:
+        sort_expr, descending = rank, False
+    else:
+        sort_expr, descending = SORTABLE_COLUMNS.get(sort_by, Candidate.analyzed_at), sort_order == "desc"
+    query = query.order_by(*keyset_order(sort_expr, Candidate.id, descending))
+    return query, sort_expr, descending
+
+
 # ── Routes ───────────────────────────────────────────────────
 
 @router.post("/analyze")
@@ -53,52 +166,20 @@ async def analyze_single_resume(
 
     # Extract text
     try:
-        resume_text = extract_text(filename, file_bytes)
+        resume_text = await extract_text_async(filename, file_bytes)
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
 
     if not resume_text:
         raise HTTPException(status_code=400, detail="Could not extract text from resume")
 
-    # Build JD text
-    jd_text = f"{jd.title}\n\n{jd.description}\n\nRequirements:\n{jd.requirements}\n\nNice to have:\n{jd.nice_to_have}"
-
     # AI analysis
-    analysis = analyze_resume(resume_text, jd_text)
-
-    # Save candidate
-    candidate = Candidate(
-        jd_id=jd_id,
-        name=analysis.get("candidate_name", "Unknown"),
-        email=analysis.get("candidate_email", ""),
-        phone=analysis.get("candidate_phone", ""),
-        current_role=analysis.get("current_role", ""),
-        experience_years=analysis.get("experience_years", 0),
-        resume_filename=filename,
-        resume_text=resume_text[:5000],  # Store first 5000 chars
-        match_score=analysis.get("overall_match_score", 0),
-        star_rating=analysis.get("star_rating", 1.0),
-        recommendation=analysis.get("recommendation", "PENDING"),
-        overall_summary=analysis.get("overall_summary", ""),
-        strengths=json.dumps(analysis.get("strengths", [])),
-        gaps=json.dumps(analysis.get("gaps", [])),
-        matched_skills=json.dumps(analysis.get("matched_skills", [])),
-        missing_skills=json.dumps(analysis.get("missing_skills", [])),
-        experience_analysis=analysis.get("experience_analysis", ""),
-    )
-    db.add(candidate)
-    db.commit()
-    db.refresh(candidate)
+    analysis = await analyze_resume(resume_text, build_jd_text(jd))
 
-    # Log activity
-    log = ActivityLog(
-        action="resume_analyzed",
-        entity_type="candidate",
-        entity_id=candidate.id,
-        details=f"Analyzed {candidate.name} for {jd.title} — Score: {candidate.match_score}%",
-    )
-    db.add(log)
-    db.commit()
+    # Save candidate + activity log
+    candidate = save_analyzed_candidates(db, jd, [
+        {"filename": filename, "resume_text": resume_text, "analysis": analysis},
+    ])[0]
 
     return {
         "id": candidate.id,
@@ -127,83 +208,77 @@ async def analyze_single_resume(
 async def bulk_analyze_resumes(
     resumes: List[UploadFile] = File(...),
     jd_id: int = Form(...),
+    concurrency: Optional[int] = Form(None),
+    prescreen_threshold: Optional[float] = Form(None),
+    background: bool = Form(False),
     db: Session = Depends(get_db),
 ):
-    """Upload and analyze multiple resumes at once — POWER MOVE 💪"""
+    """Upload and analyze multiple resumes at once — POWER MOVE 💪
+    With background=true the files are queued and a job id comes back immediately."""
     jd = db.query(JobDescription).filter(JobDescription.id == jd_id).first()
     if not jd:
         raise HTTPException(status_code=404, detail="JD not found")
 
-    jd_text = f"{jd.title}\n\n{jd.description}\n\nRequirements:\n{jd.requirements}\n\nNice to have:\n{jd.nice_to_have}"
+    files = []
+    for resume_file in resumes:
+        files.append((resume_file.filename or "unknown.pdf", await resume_file.read()))
+
+    if background:
+        job = enqueue_job(db, jd_id, files, prescreen_threshold)
+        return {
+            "job_id": job.id,
+            "status": job.status,
+            "total_files": job.total_files,
+            "status_url": f"/api/candidates/jobs/{job.id}",
+        }
 
-    results = []
-    errors = []
+    return await bulk_analyze(db, jd, files, concurrency, prescreen_threshold)
+
+
+@router.post("/bulk-analyze/stream")
+async def bulk_analyze_resumes_stream(
+    resumes: List[UploadFile] = File(...),
+    jd_id: int = Form(...),
+    concurrency: Optional[int] = Form(None),
+    prescreen_threshold: Optional[float] = Form(None),
+    format: str = Form("ndjson"),  # ndjson | sse
+    db: Session = Depends(get_db),
+):
+    """Bulk analysis that streams each candidate as soon as it's scored — no more blank screens"""
+    jd = db.query(JobDescription).filter(JobDescription.id == jd_id).first()
+    if not jd:
+        raise HTTPException(status_code=404, detail="JD not found")
 
+    files = []
     for resume_file in resumes:
-        try:
-            file_bytes = await resume_file.read()
-            filename = resume_file.filename or "unknown.pdf"
-            resume_text = extract_text(filename, file_bytes)
-
-            if not resume_text:
-                errors.append({"file": filename, "error": "Could not extract text"})
-                continue
-
-            analysis = analyze_resume(resume_text, jd_text)
-
-            candidate = Candidate(
-                jd_id=jd_id,
-                name=analysis.get("candidate_name", "Unknown"),
-                email=analysis.get("candidate_email", ""),
-                phone=analysis.get("candidate_phone", ""),
-                current_role=analysis.get("current_role", ""),
-                experience_years=analysis.get("experience_years", 0),
-                resume_filename=filename,
-                resume_text=resume_text[:5000],
-                match_score=analysis.get("overall_match_score", 0),
-                star_rating=analysis.get("star_rating", 1.0),
-                recommendation=analysis.get("recommendation", "PENDING"),
-                overall_summary=analysis.get("overall_summary", ""),
-                strengths=json.dumps(analysis.get("strengths", [])),
-                gaps=json.dumps(analysis.get("gaps", [])),
-                matched_skills=json.dumps(analysis.get("matched_skills", [])),
-                missing_skills=json.dumps(analysis.get("missing_skills", [])),
-                experience_analysis=analysis.get("experience_analysis", ""),
-            )
-            db.add(candidate)
-            db.commit()
-            db.refresh(candidate)
-
-            log = ActivityLog(
-                action="resume_analyzed",
-                entity_type="candidate",
-                entity_id=candidate.id,
-                details=f"Bulk analyzed {candidate.name} for {jd.title} — Score: {candidate.match_score}%",
-            )
-            db.add(log)
-            db.commit()
-
-            results.append({
-                "id": candidate.id,
-                "name": candidate.name,
-                "match_score": candidate.match_score,
-                "star_rating": candidate.star_rating,
-                "recommendation": candidate.recommendation,
-                "filename": filename,
-            })
-
-        except Exception as e:
-            errors.append({"file": resume_file.filename, "error": str(e)})
+        files.append((resume_file.filename or "unknown.pdf", await resume_file.read()))
 
-    return {
-        "processed": len(results),
-        "failed": len(errors),
-        "results": results,
-        "errors": errors,
-    }
+    sse = format == "sse"
 
+    async def events():
+        async for event in stream_bulk_analyze(jd_id, files, concurrency, prescreen_threshold):
+            if sse:
+                yield f"event: {event['type']}\ndata: {json.dumps(event)}\n\n"
+            else:
+                yield json.dumps(event) + "\n"
 
-@router.get("")
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream" if sse else "application/x-ndjson",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.get("/jobs/{job_id}")
+def get_analysis_job(job_id: int, db: Session = Depends(get_db)):
+    """Progress of a queued bulk analysis — per-file state and throughput"""
+    status = job_status(db, job_id)
+    if not status:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return status
+
+
+@router.get("", response_class=FastJSONResponse)
 def list_candidates(
     jd_id: Optional[int] = None,
     status: Optional[str] = None,
@@ -213,65 +288,44 @@ def list_candidates(
     sort_by: str = "analyzed_at",
     sort_order: str = "desc",
     search: Optional[str] = None,
+    skills: Optional[str] = None,
+    skill_match: str = "all",
+    skill_kind: str = "matched",
+    include_text: bool = False,
+    fields: Optional[str] = None,
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
     db: Session = Depends(get_db),
 ):
-    """List candidates with powerful filters — the HR command center"""
-    query = db.query(Candidate)
-
-    if jd_id:
-        query = query.filter(Candidate.jd_id == jd_id)
-    if status:
-        query = query.filter(Candidate.status == status)
-    if min_score is not None:
-        query = query.filter(Candidate.match_score >= min_score)
-    if max_score is not None:
-        query = query.filter(Candidate.match_score <= max_score)
-    if recommendation:
-        query = query.filter(Candidate.recommendation == recommendation)
-    if search:
-        query = query.filter(
-            Candidate.name.ilike(f"%{search}%")
-            | Candidate.email.ilike(f"%{search}%")
-            | Candidate.current_role.ilike(f"%{search}%")
-        )
+    """List candidates with powerful filters — the HR command center.
+    One joined query; the heavy experience_analysis / resume_text fields only with include_text=true.
+    skills=kubernetes,go filters on AI-matched skills (skill_match=all|any, skill_kind=matched|missing).
+    fields=name,match_score,... returns compact rows. With limit, pages are keyset-paginated:
+    pass the X-Next-Cursor response header back as cursor= to get the next page."""
+    selected = _resolve_fields(fields, include_text)
+    query, sort_expr, descending = candidate_list_query(
+        db, selected, jd_id=jd_id, status=status, min_score=min_score, max_score=max_score,
+        recommendation=recommendation, sort_by=sort_by, sort_order=sort_order, search=search,
+        skills=skills, skill_match=skill_match, skill_kind=skill_kind,
+    )
 
-    # Sorting
-    sort_column = getattr(Candidate, sort_by, Candidate.analyzed_at)
-    if sort_order == "desc":
-        query = query.order_by(sort_column.desc())
+    if cursor:
+        try:
+            after_value, after_id = decode_cursor(cursor)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        query = query.filter(keyset_filter(sort_expr, Candidate.id, descending, after_value, after_id))
+
+    headers = {}
+    if limit:
+        rows = query.add_columns(sort_expr.label("sort_key")).limit(limit + 1).all()
+        if len(rows) > limit:
+            rows = rows[:limit]
+            headers["X-Next-Cursor"] = encode_cursor(rows[-1].sort_key, rows[-1].id)
     else:
-        query = query.order_by(sort_column.asc())
-
-    candidates = query.all()
-
-    result = []
-    for c in candidates:
-        jd = db.query(JobDescription).filter(JobDescription.id == c.jd_id).first()
-        result.append({
-            "id": c.id,
-            "name": c.name,
-            "email": c.email,
-            "phone": c.phone,
-            "current_role": c.current_role,
-            "experience_years": c.experience_years,
-            "resume_filename": c.resume_filename,
-            "match_score": c.match_score,
-            "star_rating": c.star_rating,
-            "recommendation": c.recommendation,
-            "overall_summary": c.overall_summary,
-            "strengths": json.loads(c.strengths) if c.strengths else [],
-            "gaps": json.loads(c.gaps) if c.gaps else [],
-            "matched_skills": json.loads(c.matched_skills) if c.matched_skills else [],
-            "missing_skills": json.loads(c.missing_skills) if c.missing_skills else [],
-            "experience_analysis": c.experience_analysis,
-            "status": c.status,
-            "hr_notes": c.hr_notes,
-            "analyzed_at": c.analyzed_at.isoformat() if c.analyzed_at else None,
-            "jd_id": c.jd_id,
-            "jd_title": jd.title if jd else "Unknown",
-        })
+        rows = query.all()
 
-    return result
+    return FastJSONResponse(project(rows, selected, FIELD_SPECS), headers=headers)
 
 
 @router.get("/{candidate_id}")
@@ -318,6 +372,7 @@ def update_candidate_status(candidate_id: int, data: StatusUpdate, db: Session =
     old_status = c.status
     c.status = data.status
     c.updated_at = datetime.utcnow()
+    stats_service.on_status_changed(db, c, old_status)
     db.commit()
 
     log = ActivityLog(
@@ -354,6 +409,7 @@ def delete_candidate(candidate_id: int, db: Session = Depends(get_db)):
         raise HTTPException(status_code=404, detail="Candidate not found")
 
     name = c.name
+    stats_service.on_candidate_removed(db, c)
     db.delete(c)
     db.commit()
 
@@ -361,7 +417,7 @@ def delete_candidate(candidate_id: int, db: Session = Depends(get_db)):
 
 
 @router.post("/compare")
-def compare_candidates_route(data: CompareRequest, db: Session = Depends(get_db)):
+async def compare_candidates_route(data: CompareRequest, db: Session = Depends(get_db)):
     """Compare multiple candidates side-by-side — who gets the call?"""
     candidates = db.query(Candidate).filter(Candidate.id.in_(data.candidate_ids)).all()
     if len(candidates) < 2:
@@ -381,39 +437,51 @@ def compare_candidates_route(data: CompareRequest, db: Session = Depends(get_db)
             "experience_years": c.experience_years,
         })
 
-    result = compare_candidates(candidates_data, jd_text)
+    result = await compare_candidates(candidates_data, jd_text)
     return result
 
 
-@router.get("/export/csv")
-def export_candidates_csv(jd_id: Optional[int] = None, db: Session = Depends(get_db)):
-    """Export candidates to CSV — for those who love spreadsheets"""
-    query = db.query(Candidate)
-    if jd_id:
-        query = query.filter(Candidate.jd_id == jd_id)
+EXPORT_COLUMNS = [
+    ("Name", Candidate.name), ("Email", Candidate.email), ("Phone", Candidate.phone),
+    ("Current Role", Candidate.current_role), ("Experience (Years)", Candidate.experience_years),
+    ("Match Score", Candidate.match_score), ("Star Rating", Candidate.star_rating),
+    ("Recommendation", Candidate.recommendation), ("Status", Candidate.status),
+    ("Resume File", Candidate.resume_filename), ("Analyzed At", Candidate.analyzed_at),
+    ("HR Notes", Candidate.hr_notes),
+]
 
-    candidates = query.order_by(Candidate.match_score.desc()).all()
 
-    output = io.StringIO()
-    writer = csv.writer(output)
-    writer.writerow([
-        "Name", "Email", "Phone", "Current Role", "Experience (Years)",
-        "Match Score", "Star Rating", "Recommendation", "Status",
-        "Resume File", "Analyzed At", "HR Notes"
-    ])
+def _export_csv_chunks(jd_id: Optional[int]):
+    """CSV text, EXPORT_CHUNK_ROWS rows at a time, straight off a streaming cursor.
+    Owns its session — the body is still being written after the request-scoped one closes."""
+    db = SessionLocal()
+    try:
+        query = db.query(*[col for _, col in EXPORT_COLUMNS])
+        if jd_id:
+            query = query.filter(Candidate.jd_id == jd_id)
+        query = query.order_by(Candidate.match_score.desc()).execution_options(
+            stream_results=True, yield_per=EXPORT_CHUNK_ROWS
+        )
 
-    for c in candidates:
-        jd = db.query(JobDescription).filter(JobDescription.id == c.jd_id).first()
-        writer.writerow([
-            c.name, c.email, c.phone, c.current_role, c.experience_years,
-            c.match_score, c.star_rating, c.recommendation, c.status,
-            c.resume_filename, c.analyzed_at.isoformat() if c.analyzed_at else "",
-            c.hr_notes,
-        ])
-
-    output.seek(0)
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow([header for header, _ in EXPORT_COLUMNS])
+        for n, row in enumerate(query, 1):
+            writer.writerow([v.isoformat() if isinstance(v, datetime) else v for v in row])
+            if n % EXPORT_CHUNK_ROWS == 0:
+                yield buffer.getvalue()
+                buffer.seek(0)
+                buffer.truncate()
+        yield buffer.getvalue()
+    finally:
+        db.close()
+
+
+@router.get("/export/csv")
+def export_candidates_csv(jd_id: Optional[int] = None):
+    """Export candidates to CSV — for those who love spreadsheets. Streams, so any size starts downloading at once."""
     return StreamingResponse(
-        io.BytesIO(output.getvalue().encode()),
+        _export_csv_chunks(jd_id),
         media_type="text/csv",
         headers={"Content-Disposition": "attachment; filename=candidates_export.csv"},
     )
@@ -11,6 +11,7 @@ from datetime import datetime
 
 from database import get_db, JobDescription, Candidate, ActivityLog
 from services.ai_service import _call_groq
+from services.stats_service import pipeline_totals
 
 router = APIRouter(prefix="/api/chat", tags=["AI Chat"])
 
@@ -21,15 +22,16 @@ class ChatMessage(BaseModel):
 
 
 @router.post("")
-def chat_with_swathi(data: ChatMessage, db: Session = Depends(get_db)):
+async def chat_with_swathi(data: ChatMessage, db: Session = Depends(get_db)):
     """Chat with S.W.A.T.H.I. AI — context-aware HR assistant"""
 
     # Gather live context from the database
     total_jds = db.query(JobDescription).filter(JobDescription.status == "active").count()
-    total_candidates = db.query(Candidate).count()
+    totals = pipeline_totals(db)
+    total_candidates = totals["total"]
     recent_candidates = db.query(Candidate).order_by(Candidate.analyzed_at.desc()).limit(5).all()
-    shortlisted = db.query(Candidate).filter(Candidate.status == "shortlisted").count()
-    hired = db.query(Candidate).filter(Candidate.status == "hired").count()
+    shortlisted = totals["by_status"].get("shortlisted", 0)
+    hired = totals["by_status"].get("hired", 0)
 
     # Build context string
     context_parts = [
@@ -73,7 +75,7 @@ LIVE DATA FROM YOUR SYSTEM:
 Always respond as S.W.A.T.H.I. — never break character. If asked something outside HR, gently redirect while being helpful."""
 
     try:
-        response = _call_groq(system_prompt, data.message, temperature=0.7, max_tokens=1000)
+        response = await _call_groq(system_prompt, data.message, temperature=0.7, max_tokens=1000)
         
         # Log the chat interaction
         log = ActivityLog(
@@ -99,7 +101,7 @@ Always respond as S.W.A.T.H.I. — never break character. If asked something out
 @router.get("/suggestions")
 def get_suggestions(db: Session = Depends(get_db)):
     """Get contextual chat suggestions based on current data"""
-    total_candidates = db.query(Candidate).count()
+    total_candidates = pipeline_totals(db)["total"]
     total_jds = db.query(JobDescription).filter(JobDescription.status == "active").count()
 
     suggestions = [
@@ -0,0 +1,61 @@
+"""
+S.W.A.T.H.I. — Data Transfer Routes
+Bulk NDJSON export / import for moving data between environments
+"""
+
+from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Form
+from fastapi.responses import StreamingResponse
+from sqlalchemy.orm import Session
+from typing import Optional
+
+from database import get_db, ImportCheckpoint
+from services.data_transfer import ENTITY_ORDER, ImportConflict, export_lines, import_lines, checkpoint_status, content_import_id
+
+router = APIRouter(prefix="/api/data", tags=["Data Transfer"])
+
+
+@router.get("/export")
+def export_data(types: str = ",".join(ENTITY_ORDER), jd_id: Optional[int] = None):
+    """Stream JDs, candidates (every analysis field) and activity logs as NDJSON — one row per line"""
+    entities = [t.strip() for t in types.split(",") if t.strip()]
+    unknown = [t for t in entities if t not in ENTITY_ORDER]
+    if unknown or not entities:
+        raise HTTPException(status_code=400, detail=f"types must be a subset of: {', '.join(ENTITY_ORDER)}")
+
+    return StreamingResponse(
+        export_lines(entities, jd_id),
+        media_type="application/x-ndjson",
+        headers={"Content-Disposition": "attachment; filename=swathi_export.ndjson"},
+    )
+
+
+@router.post("/import")
+def import_data(
+    file: UploadFile = File(...),
+    import_id: Optional[str] = Form(None),
+    db: Session = Depends(get_db),
+):
+    """Load an NDJSON export. Rows already present unchanged are skipped, invalid lines reported.
+    An id that exists here with different data stops the import with 409 — nothing is overwritten or dropped.
+    If an import is interrupted, upload the same file again to resume where it stopped —
+    by default the import_id is a hash of the file's contents."""
+    if not import_id:
+        import_id = content_import_id(file.file)
+
+    try:
+        checkpoint = import_lines(db, file.file, import_id, file.filename or "")
+    except ImportConflict:
+        checkpoint = db.query(ImportCheckpoint).filter(ImportCheckpoint.import_id == import_id).first()
+        raise HTTPException(status_code=409, detail=checkpoint_status(checkpoint))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Import failed (resume with import_id={import_id}): {e}")
+    return checkpoint_status(checkpoint)
+
+
+@router.get("/import/{import_id}")
+def get_import_status(import_id: str, db: Session = Depends(get_db)):
+    """Progress of an import — safe to poll while it runs"""
+    checkpoint = db.query(ImportCheckpoint).filter(ImportCheckpoint.import_id == import_id).first()
+    if not checkpoint:
+        raise HTTPException(status_code=404, detail="Import not found")
+    return checkpoint_status(checkpoint)
@@ -11,6 +11,7 @@ from datetime import datetime
 
 from database import get_db, Candidate, JobDescription, EmailTemplate, ActivityLog
 from services.ai_service import generate_email
+from services.serializers import FastJSONResponse, select_fields, project
 
 router = APIRouter(prefix="/api/emails", tags=["Emails"])
 
@@ -30,7 +31,7 @@ class EmailTemplateSave(BaseModel):
 
 
 @router.post("/generate")
-def generate_email_route(data: EmailGenerateRequest, db: Session = Depends(get_db)):
+async def generate_email_route(data: EmailGenerateRequest, db: Session = Depends(get_db)):
     """Generate a personalized email using AI"""
     candidate_name = data.candidate_name
     job_title = data.job_title
@@ -43,7 +44,7 @@ def generate_email_route(data: EmailGenerateRequest, db: Session = Depends(get_d
             jd = db.query(JobDescription).filter(JobDescription.id == c.jd_id).first()
             job_title = jd.title if jd else job_title
 
-    result = generate_email(
+    result = await generate_email(
         template_type=data.template_type,
         candidate_name=candidate_name,
         job_title=job_title,
@@ -75,21 +76,17 @@ def save_email_template(data: EmailTemplateSave, db: Session = Depends(get_db)):
     return {"id": template.id, "message": f"Template '{data.name}' saved!"}
 
 
-@router.get("/templates")
+TEMPLATE_FIELDS = {
+    c: (getattr(EmailTemplate, c), None) for c in ["id", "name", "template_type", "subject", "body", "created_at"]
+}
+
+
+@router.get("/templates", response_class=FastJSONResponse)
 def list_templates(db: Session = Depends(get_db)):
     """List all saved email templates"""
-    templates = db.query(EmailTemplate).order_by(EmailTemplate.created_at.desc()).all()
-    return [
-        {
-            "id": t.id,
-            "name": t.name,
-            "template_type": t.template_type,
-            "subject": t.subject,
-            "body": t.body,
-            "created_at": t.created_at.isoformat() if t.created_at else None,
-        }
-        for t in templates
-    ]
+    fields = list(TEMPLATE_FIELDS)
+    rows = db.query(*select_fields(TEMPLATE_FIELDS, fields)).order_by(EmailTemplate.created_at.desc()).all()
+    return FastJSONResponse(project(rows, fields, TEMPLATE_FIELDS))
 
 
 @router.delete("/templates/{template_id}")
@@ -4,6 +4,7 @@ Create, Read, Update, Delete + AI Generation + File Upload
 """
 
 from fastapi import APIRouter, Depends, HTTPException, UploadFile, File
+from sqlalchemy import select, func, case
 from sqlalchemy.orm import Session
 from pydantic import BaseModel
 from typing import Optional
@@ -13,7 +14,9 @@ import tempfile
 
 from database import get_db, JobDescription, Candidate, ActivityLog
 from services.ai_service import generate_jd
-from services.file_service import extract_text
+from services.file_service import extract_text_async
+from services.stats_service import on_jd_deleted, scored
+from services.serializers import FastJSONResponse, select_fields, project, or_zero
 
 router = APIRouter(prefix="/api/jds", tags=["Job Descriptions"])
 
@@ -50,47 +53,50 @@ class JDGenerate(BaseModel):
     experience_level: str = "Mid-level"
 
 
+# ── Query helpers ────────────────────────────────────────────
+
+def candidate_stats_query():
+    """Per-JD candidate aggregates in one grouped pass over candidates"""
+    return (
+        select(
+            Candidate.jd_id.label("jd_id"),
+            func.count(Candidate.id).label("candidate_count"),
+            func.sum(case((Candidate.status == "shortlisted", 1), else_=0)).label("shortlisted_count"),
+            func.avg(case((scored(), Candidate.match_score))).label("avg_score"),  # AVG skips the NULLs
+        )
+        .group_by(Candidate.jd_id)
+    )
+
+
 # ── Routes ───────────────────────────────────────────────────
 
-@router.get("")
+JD_LIST_COLUMNS = [
+    "id", "title", "department", "location", "employment_type", "experience_level", "salary_range",
+    "description", "requirements", "nice_to_have", "status", "created_at",
+]
+
+
+def _avg_score(value) -> float:
+    return round(value or 0, 1)
+
+
+@router.get("", response_class=FastJSONResponse)
 def list_jds(status: Optional[str] = None, db: Session = Depends(get_db)):
     """List all JDs with candidate counts"""
-    query = db.query(JobDescription)
+    stats = candidate_stats_query().subquery()
+    specs = {
+        **{c: (getattr(JobDescription, c), None) for c in JD_LIST_COLUMNS},
+        "candidate_count": (stats.c.candidate_count, or_zero),
+        "shortlisted_count": (stats.c.shortlisted_count, or_zero),
+        "avg_score": (stats.c.avg_score, _avg_score),
+    }
+    fields = list(specs)
+    query = db.query(*select_fields(specs, fields)).outerjoin(stats, stats.c.jd_id == JobDescription.id)
     if status:
         query = query.filter(JobDescription.status == status)
-    jds = query.order_by(JobDescription.created_at.desc()).all()
-
-    result = []
-    for jd in jds:
-        candidate_count = db.query(Candidate).filter(Candidate.jd_id == jd.id).count()
-        shortlisted = db.query(Candidate).filter(Candidate.jd_id == jd.id, Candidate.status == "shortlisted").count()
-        avg_score = db.query(Candidate).filter(Candidate.jd_id == jd.id).with_entities(
-            db.query(Candidate).filter(Candidate.jd_id == jd.id).with_entities(Candidate.match_score)
-        )
-
-        # Calculate average score properly
-        candidates = db.query(Candidate).filter(Candidate.jd_id == jd.id).all()
-        avg = sum(c.match_score for c in candidates) / len(candidates) if candidates else 0
-
-        result.append({
-            "id": jd.id,
-            "title": jd.title,
-            "department": jd.department,
-            "location": jd.location,
-            "employment_type": jd.employment_type,
-            "experience_level": jd.experience_level,
-            "salary_range": jd.salary_range,
-            "description": jd.description,
-            "requirements": jd.requirements,
-            "nice_to_have": jd.nice_to_have,
-            "status": jd.status,
-            "created_at": jd.created_at.isoformat() if jd.created_at else None,
-            "candidate_count": candidate_count,
-            "shortlisted_count": shortlisted,
-            "avg_score": round(avg, 1),
-        })
+    rows = query.order_by(JobDescription.created_at.desc()).all()
 
-    return result
+    return FastJSONResponse(project(rows, fields, specs))
 
 
 @router.get("/{jd_id}")
@@ -100,8 +106,8 @@ def get_jd(jd_id: int, db: Session = Depends(get_db)):
     if not jd:
         raise HTTPException(status_code=404, detail="JD not found")
 
-    candidates = db.query(Candidate).filter(Candidate.jd_id == jd.id).all()
-    avg = sum(c.match_score for c in candidates) / len(candidates) if candidates else 0
+    stats = db.execute(candidate_stats_query().where(Candidate.jd_id == jd.id)).first()
+    candidate_count, avg = (stats.candidate_count, stats.avg_score) if stats else (0, 0)
 
     return {
         "id": jd.id,
@@ -116,8 +122,8 @@ def get_jd(jd_id: int, db: Session = Depends(get_db)):
         "nice_to_have": jd.nice_to_have,
         "status": jd.status,
         "created_at": jd.created_at.isoformat() if jd.created_at else None,
-        "candidate_count": len(candidates),
-        "avg_score": round(avg, 1),
+        "candidate_count": candidate_count,
+        "avg_score": round(avg or 0, 1),
     }
 
 
@@ -138,9 +144,9 @@ def create_jd(jd_data: JDCreate, db: Session = Depends(get_db)):
 
 
 @router.post("/generate")
-def generate_jd_with_ai(data: JDGenerate, db: Session = Depends(get_db)):
+async def generate_jd_with_ai(data: JDGenerate, db: Session = Depends(get_db)):
     """Generate a JD using AI and save it"""
-    result = generate_jd(data.title, data.department, data.brief, data.experience_level)
+    result = await generate_jd(data.title, data.department, data.brief, data.experience_level)
 
     jd = JobDescription(
         title=result.get("title", data.title),
@@ -208,7 +214,7 @@ async def upload_jd_file(file: UploadFile = File(...), db: Session = Depends(get
     if filename.endswith('.txt'):
         text = content.decode('utf-8', errors='ignore')
     else:
-        text = extract_text(file.filename, content)
+        text = await extract_text_async(file.filename, content)
 
     if not text or len(text.strip()) < 10:
         raise HTTPException(status_code=400, detail="Could not extract text from file")
@@ -239,6 +245,7 @@ def delete_jd(jd_id: int, db: Session = Depends(get_db)):
         raise HTTPException(status_code=404, detail="JD not found")
 
     title = jd.title
+    on_jd_deleted(db, jd.id)
     db.delete(jd)
     db.commit()
 
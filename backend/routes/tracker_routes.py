@@ -3,41 +3,68 @@ S.W.A.T.H.I. — Daily Activity Tracker Routes
 Track what SWATHI does daily for productivity insights
 """
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy import func
 from sqlalchemy.orm import Session
 from datetime import datetime, timedelta
+from typing import Optional
 
-from database import get_db, ActivityLog, Candidate, JobDescription
+from database import get_db, ActivityLog, JobDescription, ACTION_CATEGORIES
+from services.pagination import encode_cursor, decode_cursor, keyset_filter, keyset_order
+from services.stats_service import pipeline_totals
+from services.activity_service import activity_buckets, streak, GRANULARITIES
+
+STREAK_WINDOW_DAYS = 30
 
 router = APIRouter(prefix="/api/tracker", tags=["Daily Tracker"])
 
 
+def category_counts_query(db: Session, since: datetime):
+    """(category, count) since `since` — one grouped scan instead of classifying every row in Python"""
+    return (
+        db.query(ActivityLog.category, func.count(ActivityLog.id))
+        .filter(ActivityLog.created_at >= since)
+        .group_by(ActivityLog.category)
+    )
+
+
+def timeline_query(db: Session, since: datetime):
+    """Activity since `since`, newest first, ready for keyset paging"""
+    return (
+        db.query(ActivityLog.id, ActivityLog.action, ActivityLog.details, ActivityLog.created_at)
+        .filter(ActivityLog.created_at >= since)
+        .order_by(*keyset_order(ActivityLog.created_at, ActivityLog.id, True))
+    )
+
+
 @router.get("/today")
-def get_today_summary(db: Session = Depends(get_db)):
+def get_today_summary(
+    limit: int = Query(50, ge=1, le=500),
+    cursor: Optional[str] = None,
+    db: Session = Depends(get_db),
+):
     """What S.W.A.T.H.I. did today"""
     today_start = datetime.utcnow().replace(hour=0, minute=0, second=0, microsecond=0)
-
-    today_activities = db.query(ActivityLog).filter(
-        ActivityLog.created_at >= today_start
-    ).order_by(ActivityLog.created_at.desc()).all()
-
-    # Count by type
-    resumes_analyzed = sum(1 for a in today_activities if 'analyzed' in a.action.lower() or 'resume' in a.action.lower())
-    jds_created = sum(1 for a in today_activities if 'jd_created' in a.action.lower() or 'jd_generated' in a.action.lower() or 'jd_uploaded' in a.action.lower())
-    emails_sent = sum(1 for a in today_activities if 'email' in a.action.lower())
-    status_updates = sum(1 for a in today_activities if 'status' in a.action.lower())
-    chats = sum(1 for a in today_activities if 'chat' in a.action.lower())
+    counts = dict(category_counts_query(db, today_start).all())
+
+    query = timeline_query(db, today_start)
+    if cursor:
+        try:
+            after_value, after_id = decode_cursor(cursor)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        query = query.filter(keyset_filter(ActivityLog.created_at, ActivityLog.id, True, after_value, after_id))
+    page = query.limit(limit + 1).all()
+
+    next_cursor = None
+    if len(page) > limit:
+        page = page[:limit]
+        next_cursor = encode_cursor(page[-1].created_at, page[-1].id)
 
     return {
         "date": today_start.strftime("%Y-%m-%d"),
-        "total_actions": len(today_activities),
-        "breakdown": {
-            "resumes_analyzed": resumes_analyzed,
-            "jds_created": jds_created,
-            "emails_sent": emails_sent,
-            "status_updates": status_updates,
-            "chats": chats,
-        },
+        "total_actions": sum(counts.values()),
+        "breakdown": {category: counts.get(category, 0) for category, _ in ACTION_CATEGORIES},
         "timeline": [
             {
                 "id": a.id,
@@ -45,64 +72,62 @@ def get_today_summary(db: Session = Depends(get_db)):
                 "details": a.details,
                 "time": a.created_at.strftime("%I:%M %p") if a.created_at else "",
             }
-            for a in today_activities
-        ]
+            for a in page
+        ],
+        "next_cursor": next_cursor,
     }
 
 
 @router.get("/weekly")
 def get_weekly_summary(db: Session = Depends(get_db)):
     """Weekly productivity summary"""
-    today = datetime.utcnow().replace(hour=0, minute=0, second=0, microsecond=0)
-    week = []
-
-    for i in range(7):
-        day_start = today - timedelta(days=i)
-        day_end = day_start + timedelta(days=1)
+    # One grouped query covers both the 7-day chart and the (up to 30-day) streak
+    days = activity_buckets(db, "day", STREAK_WINDOW_DAYS)
+    today = days[-1]["start"]
 
-        count = db.query(ActivityLog).filter(
-            ActivityLog.created_at >= day_start,
-            ActivityLog.created_at < day_end
-        ).count()
-
-        day_names = ["Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun"]
-        day_label = day_names[day_start.weekday()]
-        if i == 0:
+    day_names = ["Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun"]
+    week = []
+    for d in days[-7:]:
+        day_label = day_names[d["start"].weekday()]
+        if d["start"] == today:
             day_label = "Today"
-        elif i == 1:
+        elif d["start"] == today - timedelta(days=1):
             day_label = "Yesterday"
 
         week.append({
             "day": day_label,
-            "date": day_start.strftime("%Y-%m-%d"),
-            "count": count,
+            "date": d["start"].strftime("%Y-%m-%d"),
+            "count": d["count"],
         })
 
-    week.reverse()
-
-    # Calculate streak
-    streak = 0
-    for i in range(30):
-        day_start = today - timedelta(days=i)
-        day_end = day_start + timedelta(days=1)
-        count = db.query(ActivityLog).filter(
-            ActivityLog.created_at >= day_start,
-            ActivityLog.created_at < day_end
-        ).count()
-        if count > 0:
-            streak += 1
-        else:
-            break
-
     # Total stats
     total_ever = db.query(ActivityLog).count()
-    total_candidates_ever = db.query(Candidate).count()
+    total_candidates_ever = pipeline_totals(db)["total"]
     total_jds_ever = db.query(JobDescription).count()
 
     return {
         "days": week,
-        "streak": streak,
+        "streak": streak(days),
         "total_actions": total_ever,
         "total_candidates": total_candidates_ever,
         "total_jds": total_jds_ever,
     }
+
+
+@router.get("/activity")
+def get_activity_history(
+    granularity: str = "day",
+    periods: int = Query(30, ge=1, le=366),
+    db: Session = Depends(get_db),
+):
+    """Activity counts per day / week / month for charting longer histories"""
+    if granularity not in GRANULARITIES:
+        raise HTTPException(status_code=400, detail=f"granularity must be one of: {', '.join(GRANULARITIES)}")
+
+    buckets = activity_buckets(db, granularity, periods)
+    return {
+        "granularity": granularity,
+        "buckets": [{"start": b["start"].isoformat(), "count": b["count"]} for b in buckets],
+        "total": sum(b["count"] for b in buckets),
+        "streak": streak(buckets),
+    }
@@ -0,0 +1,89 @@
+"""
+S.W.A.T.H.I. Activity Service — Productivity over time 📈
+Per-day / week / month activity counts in one GROUP BY, with streaks derived from the same result
+"""
+
+from datetime import date, datetime, timedelta
+from typing import List, Optional
+
+from sqlalchemy import func
+
+from database import engine, ActivityLog
+
+GRANULARITIES = ("day", "week", "month")
+
+
+def _bucket_start(day: date, granularity: str) -> date:
+    """Python twin of bucket_expr — weeks start on Monday"""
+    if granularity == "week":
+        return day - timedelta(days=day.weekday())
+    if granularity == "month":
+        return day.replace(day=1)
+    return day
+
+
+def _step(bucket: date, granularity: str, n: int) -> date:
+    """Move n buckets back (n > 0) from `bucket`"""
+    if granularity == "week":
+        return bucket - timedelta(weeks=n)
+    if granularity == "month":
+        months = bucket.year * 12 + bucket.month - 1 - n
+        return date(months // 12, months % 12 + 1, 1)
+    return bucket - timedelta(days=n)
+
+
+def bucket_expr(column, granularity: str):
+    """SQL expression mapping a timestamp to the first day of its bucket"""
+    if engine.dialect.name == "sqlite":
+        if granularity == "week":
+            # 'weekday 0' jumps forward to Sunday; six days back is that week's Monday
+            return func.date(column, "weekday 0", "-6 days")
+        if granularity == "month":
+            return func.date(column, "start of month")
+        return func.date(column)
+    return func.date(func.date_trunc(granularity, column))
+
+
+def _as_date(value) -> date:
+    if isinstance(value, str):
+        return date.fromisoformat(value[:10])
+    if isinstance(value, datetime):
+        return value.date()
+    return value
+
+
+def activity_buckets(db, granularity: str = "day", periods: int = 7, today: Optional[date] = None) -> List[dict]:
+    """
+    Activity counts for the last `periods` buckets (oldest first, current bucket last),
+    zero-filled, from a single grouped query.
+    """
+    if granularity not in GRANULARITIES:
+        raise ValueError(f"granularity must be one of: {', '.join(GRANULARITIES)}")
+
+    today = today or datetime.utcnow().date()
+    current = _bucket_start(today, granularity)
+    first = _step(current, granularity, periods - 1)
+
+    bucket = bucket_expr(ActivityLog.created_at, granularity)
+    rows = (
+        db.query(bucket, func.count(ActivityLog.id))
+        .filter(ActivityLog.created_at >= datetime.combine(first, datetime.min.time()))
+        .group_by(bucket)
+        .all()
+    )
+    counts = {_as_date(b): n for b, n in rows}
+
+    return [
+        {"start": start, "count": counts.get(start, 0)}
+        for start in (_step(current, granularity, i) for i in range(periods - 1, -1, -1))
+    ]
+
+
+def streak(buckets: List[dict]) -> int:
+    """Consecutive active buckets ending with the current one"""
+    run = 0
+    for b in reversed(buckets):
+        if b["count"] == 0:
+            break
+        run += 1
+    return run
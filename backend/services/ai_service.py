@@ -5,26 +5,56 @@ Powered by Groq (Llama 3.3 70B)
 
 import json
 import os
-from groq import Groq
+import httpx
+from groq import AsyncGroq
 from dotenv import load_dotenv
 
+from services import llm_cache, prompt_builder
+from services.llm_scheduler import scheduler, estimate_tokens, INTERACTIVE
+
 load_dotenv()
 
-groq_client = Groq(api_key=os.getenv("GROQ_API_KEY"))
+# One pooled keep-alive HTTP client shared by every request in this worker
+http_client = httpx.AsyncClient(
+    limits=httpx.Limits(
+        max_connections=int(os.getenv("GROQ_MAX_CONNECTIONS", "50")),
+        max_keepalive_connections=int(os.getenv("GROQ_MAX_KEEPALIVE", "20")),
+        keepalive_expiry=float(os.getenv("GROQ_KEEPALIVE_SECONDS", "30")),
+    ),
+    timeout=httpx.Timeout(float(os.getenv("GROQ_TIMEOUT_SECONDS", "120")), connect=10.0),
+)
+# Retries belong to the scheduler, which also paces them against the quota
+groq_client = AsyncGroq(api_key=os.getenv("GROQ_API_KEY"), http_client=http_client, max_retries=0)
 MODEL = "llama-3.3-70b-versatile"
 
-
-def _call_groq(system_prompt: str, user_prompt: str, temperature: float = 0.3, max_tokens: int = 4000) -> str:
-    """Core Groq API call with error handling"""
-    response = groq_client.chat.completions.create(
-        model=MODEL,
-        messages=[
-            {"role": "system", "content": system_prompt},
-            {"role": "user", "content": user_prompt},
-        ],
-        temperature=temperature,
-        max_tokens=max_tokens,
-    )
+# Bump whenever the analyze_resume prompt or defaults change — invalidates cached analyses
+PROMPT_VERSION = "resume-v3"
+ANALYSIS_TEMPERATURE = 0.2
+
+
+async def close_client():
+    """Release pooled connections — call on shutdown"""
+    await http_client.aclose()
+
+
+async def _call_groq(
+    system_prompt: str, user_prompt: str, temperature: float = 0.3, max_tokens: int = 4000, lane: str = INTERACTIVE,
+) -> str:
+    """Core Groq API call — paced and retried by the scheduler, awaits without blocking the event loop"""
+    async def call():
+        return await groq_client.chat.completions.create(
+            model=MODEL,
+            messages=[
+                {"role": "system", "content": system_prompt},
+                {"role": "user", "content": user_prompt},
+            ],
+            temperature=temperature,
+            max_tokens=max_tokens,
+        )
+
+    # Reserve prompt + the completion ceiling; the real usage is settled afterwards
+    tokens = estimate_tokens(system_prompt) + estimate_tokens(user_prompt) + max_tokens
+    response = await scheduler.run(call, tokens, lane)
     return response.choices[0].message.content
 
 
@@ -37,11 +67,16 @@ def _parse_json(text: str) -> dict:
     return json.loads(text)
 
 
-def analyze_resume(resume_text: str, jd_text: str) -> dict:
+async def analyze_resume(resume_text: str, jd_text: str, lane: str = INTERACTIVE) -> dict:
     """
     Deep resume analysis with scoring, star rating, and candidate info extraction.
-    Returns a comprehensive analysis dict.
+    Returns a comprehensive analysis dict. Bulk paths pass lane=BULK so they queue behind interactive calls.
+    Both documents are cleaned and trimmed to their token budgets first (see prompt_builder).
     """
+    # Cleaned / trimmed text is what the model sees, so it's also what the cache keys on
+    resume_text = prompt_builder.compact_resume(resume_text)["text"]
+    jd_text = prompt_builder.compact_jd(jd_text)["text"]
+
     system = """You are S.W.A.T.H.I., an elite AI HR analyst. You analyze resumes with surgical precision.
 Always respond with valid JSON only. No markdown, no explanations — just pure JSON."""
 
@@ -74,8 +109,16 @@ Return this EXACT JSON structure:
     "suggested_interview_questions": ["<question 1>", "<question 2>", "<question 3>"]
 }}"""
 
+    cache_key = llm_cache.make_key(
+        PROMPT_VERSION, MODEL, ANALYSIS_TEMPERATURE,
+        llm_cache.normalize_text(resume_text), llm_cache.normalize_text(jd_text),
+    )
     try:
-        result = _call_groq(system, prompt, temperature=0.2, max_tokens=3000)
+        cached = await llm_cache.aget(cache_key)
+        if cached is not None:
+            return cached
+
+        result = await _call_groq(system, prompt, temperature=ANALYSIS_TEMPERATURE, max_tokens=3000, lane=lane)
         analysis = _parse_json(result)
 
         # Ensure all fields exist with defaults
@@ -102,6 +145,7 @@ Return this EXACT JSON structure:
             if key not in analysis:
                 analysis[key] = default
 
+        await llm_cache.aput(cache_key, analysis, model=MODEL)
         return analysis
 
     except Exception as e:
@@ -127,7 +171,7 @@ Return this EXACT JSON structure:
         }
 
 
-def generate_jd(title: str, department: str, brief: str, experience_level: str = "Mid-level") -> dict:
+async def generate_jd(title: str, department: str, brief: str, experience_level: str = "Mid-level") -> dict:
     """Generate a professional job description from minimal inputs"""
     system = """You are S.W.A.T.H.I., an expert HR content writer. Create compelling, inclusive job descriptions.
 Always respond with valid JSON only."""
@@ -148,7 +192,7 @@ Return this EXACT JSON:
 }}"""
 
     try:
-        result = _call_groq(system, prompt, temperature=0.5, max_tokens=2000)
+        result = await _call_groq(system, prompt, temperature=0.5, max_tokens=2000)
         return _parse_json(result)
     except Exception as e:
         return {
@@ -160,7 +204,7 @@ Return this EXACT JSON:
         }
 
 
-def generate_email(
+async def generate_email(
     template_type: str,
     candidate_name: str,
     job_title: str,
@@ -195,7 +239,7 @@ Return this EXACT JSON:
 }}"""
 
     try:
-        result = _call_groq(system, prompt, temperature=0.6, max_tokens=1500)
+        result = await _call_groq(system, prompt, temperature=0.6, max_tokens=1500)
         return _parse_json(result)
     except Exception as e:
         return {
@@ -204,7 +248,7 @@ Return this EXACT JSON:
         }
 
 
-def compare_candidates(candidates_data: list, jd_text: str) -> dict:
+async def compare_candidates(candidates_data: list, jd_text: str) -> dict:
     """Compare multiple candidates side-by-side — who should you call first?"""
     system = """You are S.W.A.T.H.I., a strategic HR advisor. Compare candidates objectively.
 Always respond with valid JSON only."""
@@ -235,7 +279,7 @@ Return this EXACT JSON:
 }}"""
 
     try:
-        result = _call_groq(system, prompt, temperature=0.3, max_tokens=2000)
+        result = await _call_groq(system, prompt, temperature=0.3, max_tokens=2000)
         return _parse_json(result)
     except Exception as e:
         return {"ranking": [], "comparison_summary": f"Error: {str(e)}", "hiring_recommendation": ""}
@@ -0,0 +1,272 @@
+"""
+S.W.A.T.H.I. Analysis Service — The Pipeline 🏭
+Extraction → AI analysis → persistence, with bounded parallelism for bulk runs
+"""
+
+import asyncio
+import json
+import math
+import os
+from typing import AsyncIterator, List, Optional, Tuple
+
+from database import SessionLocal, Candidate, JobDescription, ActivityLog
+from services.ai_service import analyze_resume
+from services.llm_scheduler import BULK
+from services.file_service import extract_text_async
+from services import stats_service, skill_service
+from services.prescreen_service import Prescreener, prescreened_analysis, PRESCREENED_OUT
+
+# How many resumes are extracted + analyzed at the same time during a bulk run
+BULK_CONCURRENCY = int(os.getenv("BULK_CONCURRENCY", "5"))
+BULK_MAX_CONCURRENCY = int(os.getenv("BULK_MAX_CONCURRENCY", "20"))
+
+# How many analyzed candidates are written per transaction
+BULK_COMMIT_BATCH = int(os.getenv("BULK_COMMIT_BATCH", "20"))
+
+
+def build_jd_text(jd: JobDescription) -> str:
+    """Flatten a JD into the text block the AI analyzes against"""
+    return f"{jd.title}\n\n{jd.description}\n\nRequirements:\n{jd.requirements}\n\nNice to have:\n{jd.nice_to_have}"
+
+
+def _number(value, default: float = 0.0) -> float:
+    """The model sometimes answers "85" or "N/A" where a number belongs — store a real float either way"""
+    try:
+        number = float(value)
+    except (TypeError, ValueError):
+        return default
+    return number if math.isfinite(number) else default
+
+
+def candidate_from_analysis(jd_id: int, filename: str, resume_text: str, analysis: dict) -> Candidate:
+    """Map an AI analysis dict onto a new (unsaved) Candidate row"""
+    return Candidate(
+        jd_id=jd_id,
+        name=analysis.get("candidate_name", "Unknown"),
+        email=analysis.get("candidate_email", ""),
+        phone=analysis.get("candidate_phone", ""),
+        current_role=analysis.get("current_role", ""),
+        experience_years=_number(analysis.get("experience_years")),
+        resume_filename=filename,
+        resume_text=resume_text[:5000],  # Store first 5000 chars
+        match_score=_number(analysis.get("overall_match_score")),
+        star_rating=_number(analysis.get("star_rating"), 1.0),
+        recommendation=analysis.get("recommendation", "PENDING"),
+        overall_summary=analysis.get("overall_summary", ""),
+        strengths=json.dumps(analysis.get("strengths", [])),
+        gaps=json.dumps(analysis.get("gaps", [])),
+        matched_skills=json.dumps(analysis.get("matched_skills", [])),
+        missing_skills=json.dumps(analysis.get("missing_skills", [])),
+        experience_analysis=analysis.get("experience_analysis", ""),
+    )
+
+
+def resolve_concurrency(requested: Optional[int]) -> int:
+    """Clamp a caller-supplied concurrency to the configured bounds"""
+    if not requested:
+        requested = BULK_CONCURRENCY
+    return max(1, min(requested, BULK_MAX_CONCURRENCY))
+
+
+async def extract_and_analyze(
+    filename: str,
+    file_bytes: bytes,
+    jd_text: str,
+    prescreener: Optional[Prescreener] = None,
+) -> dict:
+    """Worker for a single resume — extraction in the process pool, AI call awaited on the loop in the bulk lane.
+    With a prescreener, resumes below its threshold get a local record instead of an AI call."""
+    resume_text = await extract_text_async(filename, file_bytes)
+    if not resume_text:
+        return {"filename": filename, "error": "Could not extract text"}
+
+    relevance = None
+    if prescreener is not None and prescreener.enabled:
+        relevance = prescreener.score(resume_text)
+        if not prescreener.passes(relevance):
+            analysis = prescreened_analysis(filename, resume_text, relevance, prescreener.threshold)
+            return {"filename": filename, "resume_text": resume_text, "analysis": analysis, "prescreened": True}
+
+    analysis = await analyze_resume(resume_text, jd_text, lane=BULK)
+    if relevance is not None:
+        analysis["relevance_score"] = relevance
+    return {"filename": filename, "resume_text": resume_text, "analysis": analysis}
+
+
+async def analyze_files(
+    files: List[Tuple[str, bytes]],
+    jd_text: str,
+    concurrency: int,
+    prescreener: Optional[Prescreener] = None,
+) -> AsyncIterator[dict]:
+    """
+    Extract + analyze resumes with at most `concurrency` in flight.
+    Yields one outcome per file as soon as it finishes (completion order, not input order).
+    Every outcome carries its input `index`; failures carry `error` instead of `analysis`.
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def run_one(index: int, filename: str, file_bytes: bytes) -> dict:
+        async with semaphore:
+            try:
+                outcome = await extract_and_analyze(filename, file_bytes, jd_text, prescreener)
+            except Exception as e:
+                outcome = {"filename": filename, "error": str(e)}
+        outcome["index"] = index
+        return outcome
+
+    tasks = [asyncio.create_task(run_one(i, name, data)) for i, (name, data) in enumerate(files)]
+    try:
+        for finished in asyncio.as_completed(tasks):
+            yield await finished
+    finally:
+        for task in tasks:
+            task.cancel()
+
+
+def _analysis_log(c: Candidate, analysis: dict, jd: JobDescription, log_prefix: str) -> ActivityLog:
+    if analysis.get("recommendation") == PRESCREENED_OUT:
+        return ActivityLog(
+            action="candidate_screened_out",  # not an analysis — the tracker files it under "other"
+            entity_type="candidate",
+            entity_id=c.id,
+            details=f"Pre-screened out {c.name} for {jd.title} — Relevance: {analysis.get('relevance_score', 0)}/100",
+        )
+    return ActivityLog(
+        action="resume_analyzed",
+        entity_type="candidate",
+        entity_id=c.id,
+        details=f"{log_prefix} {c.name} for {jd.title} — Score: {c.match_score}%",
+    )
+
+
+def save_analyzed_candidates(db, jd: JobDescription, outcomes: List[dict], log_prefix: str = "Analyzed") -> List[Candidate]:
+    """Persist a batch of successful outcomes (candidates + activity logs) in one transaction"""
+    candidates = [
+        candidate_from_analysis(jd.id, o["filename"], o["resume_text"], o["analysis"])
+        for o in outcomes
+    ]
+    db.add_all(candidates)
+    db.flush()  # assigns ids without ending the transaction
+    for c in candidates:
+        stats_service.on_candidate_added(db, c)
+    skill_service.index_candidates(db, candidates)
+
+    db.add_all([_analysis_log(c, o["analysis"], jd, log_prefix) for c, o in zip(candidates, outcomes)])
+    db.commit()
+    return candidates
+
+
+def _result_row(c: Candidate, outcome: dict) -> dict:
+    row = {
+        "index": outcome["index"],
+        "id": c.id,
+        "name": c.name,
+        "match_score": c.match_score,
+        "star_rating": c.star_rating,
+        "recommendation": c.recommendation,
+        "filename": outcome["filename"],
+    }
+    if "relevance_score" in outcome["analysis"]:
+        row["relevance_score"] = outcome["analysis"]["relevance_score"]
+    return row
+
+
+async def bulk_analyze(
+    db,
+    jd: JobDescription,
+    files: List[Tuple[str, bytes]],
+    concurrency: Optional[int] = None,
+    prescreen_threshold: Optional[float] = None,
+) -> dict:
+    """Run a whole bulk upload: concurrent analysis, batched writes, per-file error isolation"""
+    jd_text = build_jd_text(jd)
+    prescreener = Prescreener(jd, prescreen_threshold)
+    results = []
+    errors = []
+    pending = []
+
+    def save(batch: List[dict]):
+        try:
+            saved = save_analyzed_candidates(db, jd, batch, log_prefix="Bulk analyzed")
+        except Exception as e:
+            db.rollback()
+            if len(batch) > 1:
+                # One bad row must not cost the rest of the batch their (already paid for) analyses
+                for outcome in batch:
+                    save([outcome])
+                return
+            errors.append({"index": batch[0]["index"], "file": batch[0]["filename"], "error": f"Save failed: {e}"})
+        else:
+            results.extend(_result_row(c, o) for o, c in zip(batch, saved))
+
+    def flush():
+        save(pending)
+        pending.clear()
+
+    async for outcome in analyze_files(files, jd_text, resolve_concurrency(concurrency), prescreener):
+        if "error" in outcome:
+            errors.append({"index": outcome["index"], "file": outcome["filename"], "error": outcome["error"]})
+            continue
+        pending.append(outcome)
+        if len(pending) >= BULK_COMMIT_BATCH:
+            flush()
+    if pending:
+        flush()
+
+    # Report in upload order, like the sequential version did
+    results.sort(key=lambda r: r.pop("index"))
+    errors.sort(key=lambda e: e.pop("index"))
+
+    return {
+        "processed": len(results),
+        "failed": len(errors),
+        "prescreened_out": sum(r["recommendation"] == PRESCREENED_OUT for r in results),
+        "results": results,
+        "errors": errors,
+    }
+
+
+async def stream_bulk_analyze(
+    jd_id: int,
+    files: List[Tuple[str, bytes]],
+    concurrency: Optional[int] = None,
+    prescreen_threshold: Optional[float] = None,
+) -> AsyncIterator[dict]:
+    """
+    Like bulk_analyze, but yields each candidate (or error) the moment its analysis lands.
+    Every result is committed before it is yielded, so the ids it carries are real.
+    Owns its session — streaming outlives the request-scoped one.
+    """
+    db = SessionLocal()
+    try:
+        jd = db.query(JobDescription).filter(JobDescription.id == jd_id).first()
+        processed = failed = prescreened_out = 0
+        prescreener = Prescreener(jd, prescreen_threshold)
+
+        async for outcome in analyze_files(files, build_jd_text(jd), resolve_concurrency(concurrency), prescreener):
+            if "error" not in outcome:
+                try:
+                    c = save_analyzed_candidates(db, jd, [outcome], log_prefix="Bulk analyzed")[0]
+                except Exception as e:
+                    db.rollback()
+                    outcome["error"] = f"Save failed: {e}"
+
+            if "error" in outcome:
+                failed += 1
+                yield {"type": "error", "index": outcome["index"], "file": outcome["filename"], "error": outcome["error"]}
+                continue
+
+            processed += 1
+            prescreened_out += bool(outcome.get("prescreened"))
+            yield {"type": "result", **_result_row(c, outcome)}
+
+        yield {
+            "type": "summary",
+            "processed": processed,
+            "failed": failed,
+            "prescreened_out": prescreened_out,
+            "total": len(files),
+        }
+    finally:
+        db.close()
@@ -0,0 +1,120 @@
+"""
+S.W.A.T.H.I. Compression — Fewer bytes on the wire 🗜️
+ASGI middleware: brotli (when installed) or gzip for JSON / CSV / NDJSON responses above a size threshold
+"""
+
+import os
+import zlib
+
+from starlette.datastructures import Headers, MutableHeaders
+
+try:
+    import brotli
+except ImportError:  # optional: pip install brotli
+    brotli = None
+
+COMPRESSION_MIN_BYTES = int(os.getenv("COMPRESSION_MIN_BYTES", "1024"))
+GZIP_LEVEL = int(os.getenv("GZIP_LEVEL", "6"))
+BROTLI_QUALITY = int(os.getenv("BROTLI_QUALITY", "4"))
+
+COMPRESSIBLE_TYPES = ("application/json", "application/x-ndjson", "text/")
+# Live event streams must reach the browser event by event, unbuffered
+UNCOMPRESSED_TYPES = ("text/event-stream",)
+
+
+def _choose_encoding(accept_encoding: str):
+    offered = {token.split(";")[0].strip().lower() for token in accept_encoding.split(",")}
+    if brotli is not None and "br" in offered:
+        return "br"
+    if "gzip" in offered:
+        return "gzip"
+    return None
+
+
+class _Compressor:
+    """Same interface over brotli and gzip; every chunk is flushed so streamed responses keep streaming"""
+
+    def __init__(self, encoding: str):
+        if encoding == "br":
+            self._c = brotli.Compressor(quality=BROTLI_QUALITY)
+            self._chunk = lambda data: self._c.process(data) + self._c.flush()
+            self._last = lambda data: self._c.process(data) + self._c.finish()
+        else:
+            self._c = zlib.compressobj(GZIP_LEVEL, zlib.DEFLATED, 31)  # wbits 31 = gzip container
+            self._chunk = lambda data: self._c.compress(data) + self._c.flush(zlib.Z_SYNC_FLUSH)
+            self._last = lambda data: self._c.compress(data) + self._c.flush()
+
+    def chunk(self, data: bytes) -> bytes:
+        return self._chunk(data)
+
+    def last(self, data: bytes) -> bytes:
+        return self._last(data)
+
+
+class CompressionMiddleware:
+    def __init__(self, app, minimum_size: int = COMPRESSION_MIN_BYTES):
+        self.app = app
+        self.minimum_size = minimum_size
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        encoding = _choose_encoding(Headers(scope=scope).get("accept-encoding", ""))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        start = None
+        compressor = None
+        passthrough = False
+
+        async def compressing_send(message):
+            nonlocal start, compressor, passthrough
+            if message["type"] == "http.response.start":
+                start = message
+                return
+            if message["type"] != "http.response.body" or passthrough:
+                await send(message)
+                return
+
+            body = message.get("body", b"")
+            more = message.get("more_body", False)
+
+            if compressor is None:
+                # First body message decides — copy the headers, they may belong to a cached entry
+                headers = MutableHeaders(raw=list(start["headers"]))
+                content_type = headers.get("content-type", "")
+                eligible = (
+                    start["status"] not in (204, 304)
+                    and "content-encoding" not in headers
+                    and content_type.startswith(COMPRESSIBLE_TYPES)
+                    and not content_type.startswith(UNCOMPRESSED_TYPES)
+                    and (more or len(body) >= self.minimum_size)
+                )
+                if not eligible:
+                    passthrough = True
+                    await send(start)
+                    await send(message)
+                    return
+
+                compressor = _Compressor(encoding)
+                data = compressor.chunk(body) if more else compressor.last(body)
+                headers["Content-Encoding"] = encoding
+                if "accept-encoding" not in headers.get("vary", "").lower():
+                    headers.add_vary_header("Accept-Encoding")
+                etag = headers.get("etag")
+                if etag and not etag.startswith("W/"):
+                    headers["ETag"] = "W/" + etag  # a strong validator would promise these exact bytes
+                if more:
+                    del headers["Content-Length"]
+                else:
+                    headers["Content-Length"] = str(len(data))
+                await send({**start, "headers": headers.raw})
+                await send({"type": "http.response.body", "body": data, "more_body": more})
+                return
+
+            data = compressor.chunk(body) if more else compressor.last(body)
+            await send({"type": "http.response.body", "body": data, "more_body": more})
+
+        await self.app(scope, receive, compressing_send)
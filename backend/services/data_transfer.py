@@ -0,0 +1,279 @@
+"""
+S.W.A.T.H.I. Data Transfer — Staging ⇄ production in minutes 🚚
+Lossless NDJSON export / import of JDs, candidates and activity logs: streamed out, bulk-inserted back in with checkpoints
+"""
+
+import hashlib
+import json
+import os
+from datetime import datetime
+from typing import Iterable, Iterator, List, Optional
+
+from sqlalchemy import select, and_, or_, text
+from sqlalchemy.dialects import postgresql, sqlite
+
+from database import engine, SessionLocal, JobDescription, Candidate, ActivityLog, ImportCheckpoint
+from services import stats_service, skill_service, response_cache
+
+# One line per row: {"type": <entity>, <column>: <value>, ...}
+ENTITY_MODELS = {"jd": JobDescription, "candidate": Candidate, "activity": ActivityLog}
+ENTITY_ORDER = ["jd", "candidate", "activity"]  # parents first, on the way out and on the way in
+
+TRANSFER_BATCH_ROWS = int(os.getenv("TRANSFER_BATCH_ROWS", "5000"))
+MAX_REPORTED_ERRORS = 50
+
+
+# ── Export ───────────────────────────────────────────────────
+
+def _encode(value):
+    return value.isoformat() if isinstance(value, datetime) else value
+
+
+def _export_query(entity: str, jd_id: Optional[int]):
+    model = ENTITY_MODELS[entity]
+    query = select(model.__table__).order_by(model.id)
+    if jd_id:
+        if entity == "jd":
+            query = query.where(JobDescription.id == jd_id)
+        elif entity == "candidate":
+            query = query.where(Candidate.jd_id == jd_id)
+        else:
+            in_jd = select(Candidate.id).where(Candidate.jd_id == jd_id)
+            query = query.where(or_(
+                and_(ActivityLog.entity_type == "jd", ActivityLog.entity_id == jd_id),
+                and_(ActivityLog.entity_type == "candidate", ActivityLog.entity_id.in_(in_jd)),
+            ))
+    return query.execution_options(stream_results=True, yield_per=TRANSFER_BATCH_ROWS)
+
+
+def export_lines(entities: List[str], jd_id: Optional[int] = None) -> Iterator[str]:
+    """NDJSON in TRANSFER_BATCH_ROWS-line chunks off streaming cursors; owns its session"""
+    db = SessionLocal()
+    try:
+        chunk = []
+        for entity in ENTITY_ORDER:
+            if entity not in entities:
+                continue
+            for row in db.execute(_export_query(entity, jd_id)).mappings():
+                chunk.append(json.dumps({"type": entity, **{k: _encode(v) for k, v in row.items()}}))
+                if len(chunk) >= TRANSFER_BATCH_ROWS:
+                    yield "\n".join(chunk) + "\n"
+                    chunk.clear()
+        if chunk:
+            yield "\n".join(chunk) + "\n"
+    finally:
+        db.close()
+
+
+# ── Import ───────────────────────────────────────────────────
+
+class _RowContext:
+    """Stands in for SQLAlchemy's execution context, so defaults reading sibling columns (ActivityLog.category) work"""
+
+    def __init__(self, params: dict):
+        self._params = params
+
+    def get_current_parameters(self) -> dict:
+        return self._params
+
+
+def _coerce(column, value):
+    if value is None:
+        return None
+    python_type = column.type.python_type
+    if python_type is datetime:
+        return datetime.fromisoformat(value)
+    if python_type is str:
+        if not isinstance(value, str):
+            raise TypeError
+        return value
+    if python_type in (int, float, bool) and isinstance(value, (str, list, dict)):
+        raise TypeError
+    return python_type(value)
+
+
+def validate_row(table, record: dict) -> dict:
+    """A complete, typed row for `table` — every column present so a batch shares one INSERT shape"""
+    row = {}
+    for column in table.columns:
+        if column.name in record:
+            try:
+                value = _coerce(column, record[column.name])
+            except (TypeError, ValueError):
+                raise ValueError(f"{column.name}: expected {column.type.python_type.__name__}")
+        elif column.primary_key:
+            raise ValueError(f"{column.name} is required")
+        elif column.default is not None:
+            value = column.default.arg(_RowContext(row)) if column.default.is_callable else column.default.arg
+        else:
+            value = None
+
+        if value is None and not column.nullable:
+            raise ValueError(f"{column.name} is required")
+        length = getattr(column.type, "length", None)
+        if length and isinstance(value, str) and len(value) > length:
+            raise ValueError(f"{column.name}: longer than {length} characters")
+        row[column.name] = value
+    return row
+
+
+def _insert_new(table):
+    """INSERT that leaves rows whose primary key already exists untouched — what makes re-imports safe"""
+    if engine.dialect.name == "sqlite":
+        return sqlite.insert(table).on_conflict_do_nothing()
+    if engine.dialect.name == "postgresql":
+        return postgresql.insert(table).on_conflict_do_nothing()
+    return table.insert()
+
+
+class ImportConflict(Exception):
+    """Ids in the file already exist here holding different data — importing would silently lose those rows"""
+
+    def __init__(self, conflicts: List[dict]):
+        super().__init__(f"{len(conflicts)} row(s) collide with existing ids holding different data")
+        self.conflicts = conflicts
+
+
+def _split_existing(db, table, rows: List[tuple], conflicts: list) -> List[dict]:
+    """
+    (line, row) pairs → rows to insert. A row identical to the one already stored under its id is a
+    re-import and skipped; a different row under a taken id is a conflict.
+    """
+    stored = {
+        r["id"]: dict(r)
+        for r in db.execute(select(table).where(table.c.id.in_([row["id"] for _, row in rows]))).mappings()
+    }
+    fresh = {}
+    for line_no, row in rows:
+        existing = stored.get(row["id"], fresh.get(row["id"]))
+        if existing is None:
+            fresh[row["id"]] = row
+        elif existing != row:
+            conflicts.append({"line": line_no, "error": f"{table.name} id {row['id']} already exists with different data"})
+    return list(fresh.values())
+
+
+def _flush(db, pending: dict, checkpoint: ImportCheckpoint, line_no: int, errors: list):
+    """Write one batch and advance the checkpoint in the same transaction"""
+    conflicts = []
+    for entity in ENTITY_ORDER:
+        rows = pending[entity]
+        if not rows:
+            continue
+        table = ENTITY_MODELS[entity].__table__
+        new_rows = _split_existing(db, table, rows, conflicts)
+        inserted = db.execute(_insert_new(table), new_rows).rowcount if new_rows else 0
+        checkpoint.rows_inserted += inserted
+        checkpoint.rows_skipped += len(rows) - len(new_rows)
+        rows.clear()
+    if conflicts:
+        raise ImportConflict(conflicts)  # before the commit — the whole batch rolls back
+    checkpoint.lines_done = line_no
+    checkpoint.errors = json.dumps(errors)
+    db.commit()
+    response_cache.invalidate()  # Core inserts bypass the session's write tracking
+
+
+def _sync_sequences(db):
+    """Explicit ids don't advance PostgreSQL sequences — move them past the imported rows"""
+    if engine.dialect.name != "postgresql":
+        return
+    for model in ENTITY_MODELS.values():
+        table = model.__tablename__
+        db.execute(text(
+            f"SELECT setval(pg_get_serial_sequence('{table}', 'id'), COALESCE((SELECT MAX(id) FROM {table}), 0) + 1, false)"
+        ))
+
+
+def content_import_id(fileobj, chunk_size: int = 1 << 20) -> str:
+    """Default import_id: a digest of the whole upload, so only the very same file resumes a checkpoint"""
+    digest = hashlib.sha256()
+    fileobj.seek(0)
+    for chunk in iter(lambda: fileobj.read(chunk_size), b""):
+        digest.update(chunk)
+    fileobj.seek(0)
+    return f"sha256-{digest.hexdigest()}"
+
+
+def import_lines(db, lines: Iterable[bytes], import_id: str, filename: str = "") -> ImportCheckpoint:
+    """
+    Validate and bulk-insert NDJSON lines, TRANSFER_BATCH_ROWS per transaction.
+    Ids are kept; rows already present unchanged are skipped, and an id taken by different data stops the
+    import with ImportConflict (its batch rolled back). Resumes after the last committed line of `import_id`.
+    """
+    checkpoint = db.query(ImportCheckpoint).filter(ImportCheckpoint.import_id == import_id).first()
+    if not checkpoint:
+        checkpoint = ImportCheckpoint(import_id=import_id, filename=filename, lines_done=0,
+                                      rows_inserted=0, rows_skipped=0, rows_invalid=0, errors="[]")
+        db.add(checkpoint)
+        db.commit()
+    if checkpoint.status == "completed":
+        return checkpoint
+
+    checkpoint.status = "running"
+    errors = json.loads(checkpoint.errors or "[]")
+    known_jds = set(db.scalars(select(JobDescription.id)))
+    pending = {entity: [] for entity in ENTITY_ORDER}
+    resume_after = checkpoint.lines_done
+    line_no = resume_after
+    batch_start = resume_after
+
+    try:
+        for line_no, raw in enumerate(lines, 1):
+            if line_no <= resume_after or not raw.strip():
+                continue
+            try:
+                record = json.loads(raw)
+                if not isinstance(record, dict):
+                    raise ValueError("expected a JSON object")
+                entity = record.get("type")
+                if not isinstance(entity, str) or entity not in ENTITY_MODELS:
+                    raise ValueError(f"unknown type {entity!r}")
+                row = validate_row(ENTITY_MODELS[entity].__table__, record)
+                if entity == "candidate" and row["jd_id"] not in known_jds:
+                    raise ValueError(f"jd_id {row['jd_id']} does not exist")
+                if entity == "jd":
+                    known_jds.add(row["id"])
+                pending[entity].append((line_no, row))
+            except ValueError as e:
+                checkpoint.rows_invalid += 1
+                if len(errors) < MAX_REPORTED_ERRORS:
+                    errors.append({"line": line_no, "error": str(e)})
+
+            if line_no - batch_start >= TRANSFER_BATCH_ROWS:
+                _flush(db, pending, checkpoint, line_no, errors)
+                batch_start = line_no
+        _flush(db, pending, checkpoint, line_no, errors)
+
+        # Derived data is rebuilt once at the end rather than per row
+        _sync_sequences(db)
+        skill_service.backfill(db.connection())
+        stats_service.rebuild_counters(db)  # commits
+    except Exception as e:
+        db.rollback()
+        checkpoint.status = "failed"
+        errors = [err for err in errors if err["line"] <= checkpoint.lines_done]  # drop the rolled-back batch's
+        errors.append({"line": checkpoint.lines_done + 1, "error": f"Import stopped: {e}"})
+        if isinstance(e, ImportConflict):
+            errors += e.conflicts[:MAX_REPORTED_ERRORS]
+        checkpoint.errors = json.dumps(errors)
+        db.commit()
+        raise
+
+    checkpoint.status = "completed"
+    db.commit()
+    return checkpoint
+
+
+def checkpoint_status(checkpoint: ImportCheckpoint) -> dict:
+    return {
+        "import_id": checkpoint.import_id,
+        "filename": checkpoint.filename,
+        "status": checkpoint.status,
+        "lines_done": checkpoint.lines_done,
+        "rows_inserted": checkpoint.rows_inserted,
+        "rows_skipped": checkpoint.rows_skipped,
+        "rows_invalid": checkpoint.rows_invalid,
+        "errors": json.loads(checkpoint.errors or "[]"),
+        "updated_at": checkpoint.updated_at.isoformat() if checkpoint.updated_at else None,
+    }
@@ -1,45 +1,216 @@
 """
 S.W.A.T.H.I. File Service — Resume Text Extraction
-Handles PDF and DOCX files
+Handles PDF and DOCX files through pluggable backends, off the event loop in a process pool
 """
 
+import asyncio
+import importlib.util
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from functools import lru_cache
+from typing import Callable, Optional, Tuple
+
 import PyPDF2
 import docx
 from io import BytesIO
 
+# 0 workers = extract in a thread instead of a separate process
+EXTRACT_WORKERS = int(os.getenv("EXTRACT_WORKERS", str(min(4, os.cpu_count() or 1))))
+EXTRACT_TIMEOUT_SECONDS = float(os.getenv("EXTRACT_TIMEOUT_SECONDS", "30"))
+EXTRACT_MAX_PAGES = int(os.getenv("EXTRACT_MAX_PAGES", "30"))
+
+SUPPORTED_EXTENSIONS = (".pdf", ".docx")
+
+_executor: Optional[ProcessPoolExecutor] = None
+_generation = 0  # bumped whenever the pool is replaced
+
+
+# ── Extraction backends ─────────────────────────────────────
+# Each backend takes (file_bytes, max_pages) and returns raw text, raising on failure.
+# Optional ones are only offered when their package is importable.
+
+PDF_BACKEND = os.getenv("PDF_BACKEND", "pypdf2")  # pypdf2 | pypdf | pymupdf | pdfminer | auto
+DOCX_BACKEND = os.getenv("DOCX_BACKEND", "python-docx")  # python-docx | docx2txt | auto
+
+_BACKENDS = {"pdf": {}, "docx": {}}
+_BACKEND_MODULES = {}
+
+# Fastest first — what "auto" picks from
+_AUTO_ORDER = {"pdf": ["pymupdf", "pypdf", "pypdf2", "pdfminer"], "docx": ["python-docx", "docx2txt"]}
+
+
+def _register(kind: str, name: str, module: str):
+    def wrap(fn):
+        _BACKENDS[kind][name] = fn
+        _BACKEND_MODULES[(kind, name)] = module
+        return fn
+    return wrap
+
+
+@_register("pdf", "pypdf2", "PyPDF2")
+def _pdf_pypdf2(file_bytes: bytes, max_pages: int) -> str:
+    reader = PyPDF2.PdfReader(BytesIO(file_bytes))
+    return "\n".join(filter(None, (page.extract_text() for page in reader.pages[:max_pages])))
+
+
+@_register("pdf", "pypdf", "pypdf")
+def _pdf_pypdf(file_bytes: bytes, max_pages: int) -> str:
+    import pypdf
+    reader = pypdf.PdfReader(BytesIO(file_bytes))
+    return "\n".join(filter(None, (page.extract_text() for page in reader.pages[:max_pages])))
+
+
+@_register("pdf", "pymupdf", "fitz")
+def _pdf_pymupdf(file_bytes: bytes, max_pages: int) -> str:
+    import fitz
+    with fitz.open(stream=file_bytes, filetype="pdf") as doc:
+        return "\n".join(doc[i].get_text() for i in range(min(max_pages, doc.page_count)))
+
+
+@_register("pdf", "pdfminer", "pdfminer.high_level")
+def _pdf_pdfminer(file_bytes: bytes, max_pages: int) -> str:
+    from pdfminer.high_level import extract_text as pdfminer_extract
+    return pdfminer_extract(BytesIO(file_bytes), maxpages=max_pages)
+
+
+@_register("docx", "python-docx", "docx")
+def _docx_python_docx(file_bytes: bytes, max_pages: int) -> str:
+    doc = docx.Document(BytesIO(file_bytes))
+    return "\n".join([para.text for para in doc.paragraphs if para.text.strip()])
+
+
+@_register("docx", "docx2txt", "docx2txt")
+def _docx_docx2txt(file_bytes: bytes, max_pages: int) -> str:
+    import docx2txt
+    text = docx2txt.process(BytesIO(file_bytes))
+    return "\n".join(line for line in text.splitlines() if line.strip())
 
-def extract_text_from_pdf(file_bytes: bytes) -> str:
-    """Extract text from PDF file bytes"""
+
+@lru_cache(maxsize=None)
+def available_backends(kind: str) -> Tuple[str, ...]:
+    """Backends for `kind` ("pdf" / "docx") whose package is installed"""
+    available = []
+    for name in _BACKENDS[kind]:
+        try:
+            found = importlib.util.find_spec(_BACKEND_MODULES[(kind, name)]) is not None
+        except ModuleNotFoundError:  # parent package missing
+            found = False
+        if found:
+            available.append(name)
+    return tuple(available)
+
+
+def resolve_backend(kind: str, name: Optional[str] = None) -> Callable[[bytes, int], str]:
+    """Look up a backend by name, falling back to the best installed one for "auto" """
+    name = (name or (PDF_BACKEND if kind == "pdf" else DOCX_BACKEND)).lower()
+    installed = available_backends(kind)
+    if name == "auto":
+        name = next((b for b in _AUTO_ORDER[kind] if b in installed), None)
+        if name is None:
+            raise ValueError(f"No {kind} backend is installed (any of: {', '.join(_AUTO_ORDER[kind])})")
+    if name not in _BACKENDS[kind]:
+        raise ValueError(f"Unknown {kind} backend '{name}'. Choose from: {', '.join(_BACKENDS[kind])}, auto")
+    if name not in installed:
+        raise ValueError(f"{kind} backend '{name}' is not installed (needs '{_BACKEND_MODULES[(kind, name)]}')")
+    return _BACKENDS[kind][name]
+
+
+def validate_backends():
+    """Fail at startup, not on every upload, when PDF_BACKEND / DOCX_BACKEND can't be used"""
+    resolve_backend("pdf")
+    resolve_backend("docx")
+
+
+def extract_text_from_pdf(file_bytes: bytes, max_pages: int = EXTRACT_MAX_PAGES, backend: Optional[str] = None) -> str:
+    """Extract text from PDF file bytes (first `max_pages` pages only); configuration errors propagate"""
+    parse = resolve_backend("pdf", backend)
     try:
-        reader = PyPDF2.PdfReader(BytesIO(file_bytes))
-        text = ""
-        for page in reader.pages:
-            page_text = page.extract_text()
-            if page_text:
-                text += page_text + "\n"
-        return text.strip()
+        return parse(file_bytes, max_pages).strip()
     except Exception as e:
         print(f"PDF extraction error: {e}")
         return ""
 
 
-def extract_text_from_docx(file_bytes: bytes) -> str:
-    """Extract text from DOCX file bytes"""
+def extract_text_from_docx(file_bytes: bytes, backend: Optional[str] = None) -> str:
+    """Extract text from DOCX file bytes; configuration errors propagate"""
+    parse = resolve_backend("docx", backend)
     try:
-        doc = docx.Document(BytesIO(file_bytes))
-        text = "\n".join([para.text for para in doc.paragraphs if para.text.strip()])
-        return text.strip()
+        return parse(file_bytes, EXTRACT_MAX_PAGES).strip()
     except Exception as e:
         print(f"DOCX extraction error: {e}")
         return ""
 
 
+def _check_supported(filename: str):
+    if not filename.lower().endswith(SUPPORTED_EXTENSIONS):
+        raise ValueError(f"Unsupported file type: {filename}. Use PDF or DOCX.")
+
+
 def extract_text(filename: str, file_bytes: bytes) -> str:
     """Auto-detect file type and extract text"""
-    lower = filename.lower()
-    if lower.endswith(".pdf"):
+    _check_supported(filename)
+    if filename.lower().endswith(".pdf"):
         return extract_text_from_pdf(file_bytes)
-    elif lower.endswith(".docx"):
-        return extract_text_from_docx(file_bytes)
-    else:
-        raise ValueError(f"Unsupported file type: {filename}. Use PDF or DOCX.")
+    return extract_text_from_docx(file_bytes)
+
+
+def _get_executor() -> Tuple[ProcessPoolExecutor, int]:
+    global _executor
+    if _executor is None:
+        # spawn: never fork a process that already runs an event loop and threads
+        _executor = ProcessPoolExecutor(max_workers=EXTRACT_WORKERS, mp_context=multiprocessing.get_context("spawn"))
+    return _executor, _generation
+
+
+def _recycle_pool(generation: int):
+    """
+    Kill the pool's workers and start a fresh pool next time. A timed-out future can't be cancelled once
+    running, so this is the only way to get a hung parser's worker back. Other files in flight on the
+    killed pool see BrokenProcessPool and are retried once on the new one.
+    """
+    global _executor, _generation
+    if _executor is None or generation != _generation:
+        return  # already recycled by another caller
+    for process in list((_executor._processes or {}).values()):
+        process.kill()
+    _executor.shutdown(wait=False, cancel_futures=True)
+    _executor = None
+    _generation += 1
+
+
+async def run_in_pool(fn: Callable, *args, label: str = "file"):
+    """
+    fn(*args) in the extraction pool, bounded by EXTRACT_TIMEOUT_SECONDS.
+    With EXTRACT_WORKERS=0 it runs in a thread, which a timeout abandons but cannot stop.
+    """
+    loop = asyncio.get_running_loop()
+    for attempt in range(2):
+        executor, generation = _get_executor() if EXTRACT_WORKERS > 0 else (None, None)
+        try:
+            return await asyncio.wait_for(loop.run_in_executor(executor, fn, *args), timeout=EXTRACT_TIMEOUT_SECONDS)
+        except asyncio.TimeoutError:
+            if executor is not None:
+                _recycle_pool(generation)
+            raise ValueError(f"Timed out extracting text from {label} after {EXTRACT_TIMEOUT_SECONDS:g}s")
+        except BrokenProcessPool:
+            if attempt == 0 and generation != _generation:
+                continue  # killed because another file hung — ours was fine, try again
+            _recycle_pool(generation)  # a worker died (e.g. on a malformed file) — start fresh next time
+            raise ValueError(f"Extraction crashed on {label}")
+
+
+async def extract_text_async(filename: str, file_bytes: bytes) -> str:
+    """extract_text without blocking the event loop — CPU-heavy parsing runs in the pool"""
+    _check_supported(filename)  # fail fast, no round-trip to a worker
+    return await run_in_pool(extract_text, filename, file_bytes, label=filename)
+
+
+def shutdown_extractor():
+    """Stop the process pool — call on shutdown"""
+    global _executor, _generation
+    if _executor is not None:
+        _executor.shutdown(wait=False, cancel_futures=True)
+        _executor = None
+        _generation += 1
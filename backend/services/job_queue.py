@@ -0,0 +1,311 @@
+"""
+S.W.A.T.H.I. Job Queue — Fire and forget bulk analysis 📬
+DB-backed queue of resumes drained by a pool of background workers
+"""
+
+import asyncio
+import os
+import socket
+import time
+import uuid
+from datetime import datetime, timedelta
+from typing import List, Optional, Tuple
+
+from sqlalchemy import func, or_
+
+from database import SessionLocal, AnalysisJob, AnalysisJobItem, JobDescription
+from services.analysis_service import build_jd_text, save_analyzed_candidates, extract_and_analyze
+from services.prescreen_service import Prescreener
+
+JOB_WORKERS = int(os.getenv("JOB_WORKERS", "4"))
+JOB_POLL_SECONDS = float(os.getenv("JOB_POLL_SECONDS", "2"))
+# A claimed item whose worker hasn't heartbeat for this long is presumed dead and re-queued
+JOB_LEASE_SECONDS = float(os.getenv("JOB_LEASE_SECONDS", "120"))
+
+# Identifies this process's claims — unique across hosts, workers and restarts
+WORKER_ID = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+
+_workers: List[asyncio.Task] = []
+_wakeup: Optional[asyncio.Event] = None
+_last_recovery = 0.0  # monotonic time of the last expired-lease sweep
+
+
+def enqueue_job(
+    db,
+    jd_id: int,
+    files: List[Tuple[str, bytes]],
+    prescreen_threshold: Optional[float] = None,
+) -> AnalysisJob:
+    """Persist a bulk upload as a job and wake the workers"""
+    job = AnalysisJob(jd_id=jd_id, total_files=len(files), prescreen_threshold=prescreen_threshold)
+    job.items = [
+        AnalysisJobItem(position=i, filename=name, file_data=data)
+        for i, (name, data) in enumerate(files)
+    ]
+    db.add(job)
+    db.commit()
+    db.refresh(job)
+
+    if _wakeup is not None:
+        _wakeup.set()
+    return job
+
+
+def job_status(db, job_id: int) -> Optional[dict]:
+    """Progress snapshot: overall counts, per-file state and throughput"""
+    job = db.query(AnalysisJob).filter(AnalysisJob.id == job_id).first()
+    if not job:
+        return None
+
+    items = (
+        db.query(
+            AnalysisJobItem.position, AnalysisJobItem.filename, AnalysisJobItem.status,
+            AnalysisJobItem.candidate_id, AnalysisJobItem.error,
+        )
+        .filter(AnalysisJobItem.job_id == job_id)
+        .order_by(AnalysisJobItem.position)
+        .all()
+    )
+    counts = {"pending": 0, "running": 0, "done": 0, "failed": 0}
+    for item in items:
+        counts[item.status] = counts.get(item.status, 0) + 1
+
+    finished = counts["done"] + counts["failed"]
+    end = job.finished_at or datetime.utcnow()
+    elapsed = (end - job.started_at).total_seconds() if job.started_at else 0.0
+
+    return {
+        "job_id": job.id,
+        "jd_id": job.jd_id,
+        "status": job.status,
+        "total_files": job.total_files,
+        "counts": counts,
+        "progress": round(finished / job.total_files * 100, 1) if job.total_files else 100.0,
+        "elapsed_seconds": round(elapsed, 1),
+        "files_per_minute": round(finished / elapsed * 60, 2) if elapsed > 0 else 0.0,
+        "created_at": job.created_at.isoformat() if job.created_at else None,
+        "started_at": job.started_at.isoformat() if job.started_at else None,
+        "finished_at": job.finished_at.isoformat() if job.finished_at else None,
+        "files": [
+            {
+                "filename": item.filename,
+                "status": item.status,
+                "candidate_id": item.candidate_id,
+                "error": item.error or None,
+            }
+            for item in items
+        ],
+    }
+
+
+def _lease_expiry() -> datetime:
+    return datetime.utcnow() + timedelta(seconds=JOB_LEASE_SECONDS)
+
+
+def next_pending_query(db):
+    """The oldest pending item, in submission order"""
+    return (
+        db.query(AnalysisJobItem.id)
+        .filter(AnalysisJobItem.status == "pending")
+        .order_by(AnalysisJobItem.job_id, AnalysisJobItem.position)
+        .limit(1)
+    )
+
+
+def _claim_next(db) -> Optional[int]:
+    """Atomically flip the oldest pending item to running under this worker's lease; safe across workers and processes"""
+    while True:
+        item_id = next_pending_query(db).scalar()
+        if item_id is None:
+            return None
+        claimed = (
+            db.query(AnalysisJobItem)
+            .filter(AnalysisJobItem.id == item_id, AnalysisJobItem.status == "pending")
+            .update({
+                "status": "running", "started_at": datetime.utcnow(),
+                "claimed_by": WORKER_ID, "lease_expires_at": _lease_expiry(),
+            }, synchronize_session=False)
+        )
+        db.commit()
+        if claimed:
+            return item_id
+
+
+def _owned(db, item_id: int):
+    """Filter for `item_id` while this worker still holds its lease"""
+    return db.query(AnalysisJobItem).filter(
+        AnalysisJobItem.id == item_id,
+        AnalysisJobItem.status == "running",
+        AnalysisJobItem.claimed_by == WORKER_ID,
+    )
+
+
+def _renew_lease(item_id: int) -> bool:
+    db = SessionLocal()
+    try:
+        renewed = _owned(db, item_id).update({"lease_expires_at": _lease_expiry()}, synchronize_session=False)
+        db.commit()
+        return bool(renewed)
+    finally:
+        db.close()
+
+
+async def _heartbeat(item_id: int):
+    """Keep the lease alive for as long as the item is being worked on"""
+    while True:
+        await asyncio.sleep(JOB_LEASE_SECONDS / 3)
+        if not await asyncio.to_thread(_renew_lease, item_id):
+            return  # lost it — _process_item checks before saving
+
+
+def _finish_job_if_done(db, job: AnalysisJob):
+    remaining = (
+        db.query(func.count(AnalysisJobItem.id))
+        .filter(AnalysisJobItem.job_id == job.id, AnalysisJobItem.status.in_(["pending", "running"]))
+        .scalar()
+    )
+    if remaining == 0 and job.status != "completed":
+        job.status = "completed"
+        job.finished_at = datetime.utcnow()
+        db.commit()
+
+
+async def _process_item(item_id: int):
+    db = SessionLocal()
+    heartbeat = asyncio.create_task(_heartbeat(item_id))
+    try:
+        item = db.query(AnalysisJobItem).filter(AnalysisJobItem.id == item_id).first()
+        job = item.job
+        if job.status == "queued":
+            job.status = "running"
+            job.started_at = job.started_at or datetime.utcnow()
+            db.commit()
+
+        jd = db.query(JobDescription).filter(JobDescription.id == job.jd_id).first()
+        try:
+            if not jd:
+                raise ValueError("JD no longer exists")
+            outcome = await extract_and_analyze(item.filename, item.file_data or b"", build_jd_text(jd), Prescreener(jd, job.prescreen_threshold))
+            if "error" in outcome:
+                raise ValueError(outcome["error"])
+            if not _owned(db, item_id).count():
+                return  # lease expired mid-analysis and the item was re-queued — its new owner saves it
+            candidate = save_analyzed_candidates(db, jd, [outcome], log_prefix="Queued analysis of")[0]
+            item.status = "done"
+            item.candidate_id = candidate.id
+        except Exception as e:
+            db.rollback()
+            if not _owned(db, item_id).count():
+                return
+            item.status = "failed"
+            item.error = str(e)
+
+        item.file_data = None
+        item.finished_at = datetime.utcnow()
+        item.claimed_by = None
+        item.lease_expires_at = None
+        db.commit()
+        _finish_job_if_done(db, job)
+    finally:
+        heartbeat.cancel()
+        db.close()
+
+
+def _fail_item(item_id: int, error: Exception):
+    """Record an error that escaped _process_item (e.g. the database went away) on the item itself"""
+    db = SessionLocal()
+    try:
+        _owned(db, item_id).update({
+            "status": "failed", "error": f"Worker error: {error}", "finished_at": datetime.utcnow(),
+            "file_data": None, "claimed_by": None, "lease_expires_at": None,
+        }, synchronize_session=False)
+        db.commit()
+    except Exception:
+        db.rollback()  # still unreachable — the lease lapses and the item is re-queued
+    finally:
+        db.close()
+
+
+async def _worker_loop():
+    while True:
+        db = SessionLocal()
+        try:
+            item_id = _claim_next(db)
+        finally:
+            db.close()
+
+        if item_id is None:
+            _sweep_expired_leases()
+            _wakeup.clear()
+            try:
+                await asyncio.wait_for(_wakeup.wait(), timeout=JOB_POLL_SECONDS)
+            except asyncio.TimeoutError:
+                pass
+            continue
+
+        try:
+            await _process_item(item_id)
+        except Exception as e:
+            _fail_item(item_id, e)
+
+
+def recover_interrupted() -> int:
+    """Items whose worker stopped heartbeating (crash, kill, lost host) go back in the queue"""
+    db = SessionLocal()
+    try:
+        requeued = (
+            db.query(AnalysisJobItem)
+            .filter(
+                AnalysisJobItem.status == "running",
+                # NULL: claimed before leases existed
+                or_(AnalysisJobItem.lease_expires_at.is_(None), AnalysisJobItem.lease_expires_at < datetime.utcnow()),
+            )
+            .update({"status": "pending", "started_at": None, "claimed_by": None, "lease_expires_at": None},
+                    synchronize_session=False)
+        )
+        db.commit()
+        return requeued
+    finally:
+        db.close()
+
+
+def _sweep_expired_leases():
+    """recover_interrupted, at most a few times per lease period however many workers sit idle"""
+    global _last_recovery
+    now = time.monotonic()
+    if now - _last_recovery >= JOB_LEASE_SECONDS / 3:
+        _last_recovery = now
+        recover_interrupted()
+
+
+def release_claims() -> int:
+    """Hand this worker's in-flight items straight back on a clean shutdown, without waiting out the lease"""
+    db = SessionLocal()
+    try:
+        released = (
+            db.query(AnalysisJobItem)
+            .filter(AnalysisJobItem.status == "running", AnalysisJobItem.claimed_by == WORKER_ID)
+            .update({"status": "pending", "started_at": None, "claimed_by": None, "lease_expires_at": None},
+                    synchronize_session=False)
+        )
+        db.commit()
+        return released
+    finally:
+        db.close()
+
+
+def start_workers(count: int = JOB_WORKERS):
+    """Spin up the worker pool — call once from the app lifespan"""
+    global _wakeup
+    _wakeup = asyncio.Event()
+    recover_interrupted()
+    for _ in range(count):
+        _workers.append(asyncio.create_task(_worker_loop()))
+
+
+async def stop_workers():
+    for task in _workers:
+        task.cancel()
+    await asyncio.gather(*_workers, return_exceptions=True)
+    _workers.clear()
+    release_claims()
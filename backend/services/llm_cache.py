@@ -0,0 +1,177 @@
+"""
+S.W.A.T.H.I. LLM Cache — Never pay for the same answer twice 💸
+Persistent, content-addressed cache for AI responses with size-based LRU eviction
+"""
+
+import asyncio
+import hashlib
+import json
+import os
+import threading
+import time
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import func, case
+from sqlalchemy.exc import IntegrityError, SQLAlchemyError
+
+from database import SessionLocal, LLMCacheEntry
+
+LLM_CACHE_ENABLED = os.getenv("LLM_CACHE_ENABLED", "1") not in ("0", "false", "False")
+LLM_CACHE_MAX_BYTES = int(float(os.getenv("LLM_CACHE_MAX_MB", "100")) * 1024 * 1024)
+# Hits are read-only; their hit count / LRU timestamp is written back in batches of this many keys (or this often)
+LLM_CACHE_TOUCH_BATCH = int(os.getenv("LLM_CACHE_TOUCH_BATCH", "50"))
+LLM_CACHE_TOUCH_SECONDS = float(os.getenv("LLM_CACHE_TOUCH_SECONDS", "30"))
+
+# In-process counters since startup
+_stats = {"hits": 0, "misses": 0, "evictions": 0, "errors": 0}
+
+_lock = threading.Lock()
+_touches = {}  # key → [hits since last flush, last used]
+_last_flush = time.monotonic()
+
+
+def normalize_text(text: str) -> str:
+    """Collapse whitespace so re-extracted copies of the same document hash identically"""
+    return " ".join((text or "").split())
+
+
+def make_key(*parts) -> str:
+    """Stable sha256 over all inputs that influence the AI response"""
+    h = hashlib.sha256()
+    for part in parts:
+        h.update(str(part).encode("utf-8"))
+        h.update(b"\x1f")  # unit separator keeps ("ab", "c") != ("a", "bc")
+    return h.hexdigest()
+
+
+def get(key: str) -> Optional[dict]:
+    """Return the cached response for `key`, or None on a miss — a plain read, the hit is recorded in memory"""
+    if not LLM_CACHE_ENABLED:
+        return None
+
+    db = SessionLocal()
+    try:
+        response = db.query(LLMCacheEntry.response).filter(LLMCacheEntry.cache_key == key).scalar()
+    finally:
+        db.close()
+    if response is None:
+        _stats["misses"] += 1
+        return None
+
+    _stats["hits"] += 1
+    with _lock:
+        touch = _touches.setdefault(key, [0, None])
+        touch[0] += 1
+        touch[1] = datetime.utcnow()
+        due = len(_touches) >= LLM_CACHE_TOUCH_BATCH or time.monotonic() - _last_flush >= LLM_CACHE_TOUCH_SECONDS
+    if due:
+        flush_touches()
+    return json.loads(response)
+
+
+def flush_touches():
+    """Write the buffered hit counts / last-used times back in one transaction"""
+    global _last_flush
+    with _lock:
+        pending = dict(_touches)
+        _touches.clear()
+        _last_flush = time.monotonic()
+    if not pending:
+        return
+
+    db = SessionLocal()
+    try:
+        keys = list(pending)
+        db.query(LLMCacheEntry).filter(LLMCacheEntry.cache_key.in_(keys)).update({
+            "hits": LLMCacheEntry.hits + case({k: n for k, (n, _) in pending.items()}, value=LLMCacheEntry.cache_key),
+            "last_used_at": case({k: t for k, (_, t) in pending.items()}, value=LLMCacheEntry.cache_key),
+        }, synchronize_session=False)
+        db.commit()
+    except SQLAlchemyError:
+        db.rollback()  # best effort: LRU order is slightly staler, nothing else depends on it
+        _stats["errors"] += 1
+    finally:
+        db.close()
+
+
+def put(key: str, value: dict, model: str = ""):
+    """Store a response, then evict least-recently-used entries past the size budget"""
+    if not LLM_CACHE_ENABLED:
+        return
+
+    payload = json.dumps(value)
+    db = SessionLocal()
+    try:
+        db.add(LLMCacheEntry(cache_key=key, model=model, response=payload, size_bytes=len(payload.encode("utf-8"))))
+        try:
+            db.commit()
+        except IntegrityError:
+            db.rollback()  # a concurrent request cached the same key first
+            return
+        _evict(db)
+    finally:
+        db.close()
+
+
+async def aget(key: str) -> Optional[dict]:
+    """get() off the event loop; a database error (locked, busy, gone) counts as a miss"""
+    try:
+        return await asyncio.to_thread(get, key)
+    except SQLAlchemyError as e:
+        _stats["errors"] += 1
+        print(f"LLM cache read failed: {e}")
+        return None
+
+
+async def aput(key: str, value: dict, model: str = ""):
+    """put() off the event loop; failing to cache never fails the analysis"""
+    try:
+        await asyncio.to_thread(put, key, value, model)
+    except SQLAlchemyError as e:
+        _stats["errors"] += 1
+        print(f"LLM cache write failed: {e}")
+
+
+def _evict(db):
+    total = db.query(func.coalesce(func.sum(LLMCacheEntry.size_bytes), 0)).scalar()
+    if total <= LLM_CACHE_MAX_BYTES:
+        return
+
+    flush_touches()  # recent hits must count before picking the least recently used
+    oldest = db.query(LLMCacheEntry.id, LLMCacheEntry.size_bytes).order_by(LLMCacheEntry.last_used_at.asc())
+    doomed = []
+    for entry_id, size in oldest.yield_per(500):
+        if total <= LLM_CACHE_MAX_BYTES:
+            break
+        doomed.append(entry_id)
+        total -= size
+
+    db.query(LLMCacheEntry).filter(LLMCacheEntry.id.in_(doomed)).delete(synchronize_session=False)
+    db.commit()
+    _stats["evictions"] += len(doomed)
+
+
+def stats() -> dict:
+    """Hit/miss counters plus current cache footprint"""
+    flush_touches()
+    db = SessionLocal()
+    try:
+        entries, size = db.query(
+            func.count(LLMCacheEntry.id), func.coalesce(func.sum(LLMCacheEntry.size_bytes), 0)
+        ).one()
+    finally:
+        db.close()
+
+    lookups = _stats["hits"] + _stats["misses"]
+    return {
+        "enabled": LLM_CACHE_ENABLED,
+        "hits": _stats["hits"],
+        "misses": _stats["misses"],
+        "hit_rate": round(_stats["hits"] / lookups, 3) if lookups else 0.0,
+        "evictions": _stats["evictions"],
+        "errors": _stats["errors"],
+        "entries": entries,
+        "size_bytes": size,
+        "max_bytes": LLM_CACHE_MAX_BYTES,
+    }
@@ -0,0 +1,205 @@
+"""
+S.W.A.T.H.I. LLM Scheduler — Full throttle, never over the limit 🚦
+Token-bucket pacing of Groq requests/min and tokens/min, interactive-over-bulk priority lanes,
+and jittered exponential backoff on 429 / 5xx
+"""
+
+import asyncio
+import heapq
+import itertools
+import os
+import random
+import time
+from typing import Awaitable, Callable, Optional
+
+import groq
+
+GROQ_RPM = int(os.getenv("GROQ_RPM", "30"))  # 0 = unlimited
+GROQ_TPM = int(os.getenv("GROQ_TPM", "12000"))  # 0 = unlimited
+# Share of each bucket bulk work may never dip into, so a chat or email finds capacity waiting
+LLM_INTERACTIVE_RESERVE = float(os.getenv("LLM_INTERACTIVE_RESERVE", "0.2"))
+LLM_MAX_RETRIES = int(os.getenv("LLM_MAX_RETRIES", "5"))
+LLM_BACKOFF_BASE_SECONDS = float(os.getenv("LLM_BACKOFF_BASE_SECONDS", "1"))
+LLM_BACKOFF_MAX_SECONDS = float(os.getenv("LLM_BACKOFF_MAX_SECONDS", "60"))
+
+# Lanes, highest priority first
+INTERACTIVE = "interactive"  # chat, emails, JD generation, single analyses, comparisons
+BULK = "bulk"  # bulk uploads, streamed uploads, background jobs
+LANES = (INTERACTIVE, BULK)
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough prompt size (~4 characters per token) — corrected from the API's usage afterwards"""
+    return len(text) // 4 + 1
+
+
+class _Bucket:
+    """Refills continuously at per_minute / 60 per second, up to per_minute"""
+
+    def __init__(self, per_minute: int):
+        self.capacity = float(per_minute)
+        self.level = float(per_minute)
+        self.rate = per_minute / 60.0
+        self.updated = time.monotonic()
+
+    def refill(self, now: float):
+        self.level = min(self.capacity, self.level + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def seconds_until(self, amount: float, floor: float) -> float:
+        """Time until `amount` can be taken while leaving at least `floor` behind"""
+        missing = amount + floor - self.level
+        return 0.0 if missing <= 0 else missing / self.rate
+
+
+def _retry_after(error: Exception) -> Optional[float]:
+    response = getattr(error, "response", None)
+    try:
+        return float(response.headers.get("retry-after")) if response is not None else None
+    except (TypeError, ValueError):
+        return None
+
+
+def _retryable(error: Exception) -> bool:
+    if isinstance(error, (groq.RateLimitError, groq.APIConnectionError)):  # includes timeouts
+        return True
+    return isinstance(error, groq.APIStatusError) and error.status_code >= 500
+
+
+class LLMScheduler:
+    """
+    Every LLM call asks the scheduler for one request + its estimated tokens.
+    Waiters are served strictly by lane, then arrival; bulk also leaves the interactive reserve untouched.
+    Single event loop; each worker process paces itself, so split quotas across processes.
+    """
+
+    def __init__(self, rpm: int = GROQ_RPM, tpm: int = GROQ_TPM, reserve: float = LLM_INTERACTIVE_RESERVE):
+        self.requests = _Bucket(rpm) if rpm > 0 else None
+        self.tokens = _Bucket(tpm) if tpm > 0 else None
+        self.reserve = reserve
+        self._waiters = []  # heap of (lane priority, seq, future, tokens, lane)
+        self._seq = itertools.count()
+        self._timer = None
+        self._paused_until = 0.0
+        self._stats = {lane: {
+            "queued": 0, "max_queued": 0, "granted": 0, "wait_seconds": 0.0,
+            "retries": 0, "rate_limited": 0, "failed": 0,
+        } for lane in LANES}
+
+    # ── Admission ────────────────────────────────────────────
+
+    def _wait_time(self, tokens: int, lane: str, now: float) -> float:
+        wait = max(0.0, self._paused_until - now)
+        reserve = self.reserve if lane == BULK else 0.0
+        if self.requests:
+            wait = max(wait, self.requests.seconds_until(1, reserve * self.requests.capacity))
+        if self.tokens:
+            amount = min(tokens, self.tokens.capacity * (1 - reserve))  # oversized prompts must still fit
+            wait = max(wait, self.tokens.seconds_until(amount, reserve * self.tokens.capacity))
+        return wait
+
+    def _pump(self):
+        """Grant every waiter that fits now, in priority order; re-arm a timer for the first that doesn't"""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        now = time.monotonic()
+        for bucket in (self.requests, self.tokens):
+            if bucket:
+                bucket.refill(now)
+
+        while self._waiters:
+            _, _, future, tokens, lane = self._waiters[0]
+            if future.done():  # caller went away
+                heapq.heappop(self._waiters)
+                self._stats[lane]["queued"] -= 1
+                continue
+            wait = self._wait_time(tokens, lane, now)
+            if wait > 0:
+                self._timer = future.get_loop().call_later(wait, self._pump)
+                return
+            heapq.heappop(self._waiters)
+            self._stats[lane]["queued"] -= 1
+            if self.requests:
+                self.requests.level -= 1
+            if self.tokens:
+                self.tokens.level -= min(tokens, self.tokens.capacity)
+            future.set_result(None)
+
+    async def acquire(self, tokens: int, lane: str = INTERACTIVE):
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (LANES.index(lane), next(self._seq), future, tokens, lane))
+        stats = self._stats[lane]
+        stats["queued"] += 1
+        stats["max_queued"] = max(stats["max_queued"], stats["queued"])
+
+        started = time.monotonic()
+        self._pump()
+        await future
+        stats["granted"] += 1
+        stats["wait_seconds"] += time.monotonic() - started
+
+    def settle(self, reserved: int, used: int):
+        """Give back what the estimate over-reserved (or take what it under-reserved)"""
+        if self.tokens:
+            self.tokens.level = min(self.tokens.capacity, self.tokens.level + reserved - used)
+
+    def pause(self, seconds: float):
+        """Hold every lane — the provider said we're over quota"""
+        self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+
+    # ── Execution ────────────────────────────────────────────
+
+    async def run(self, call: Callable[[], Awaitable], tokens: int, lane: str = INTERACTIVE):
+        """
+        Await call() once admitted, retrying 429 / 5xx / connection errors with jittered exponential backoff.
+        Results with a .usage.total_tokens reconcile the token bucket.
+        """
+        stats = self._stats[lane]
+        for attempt in range(LLM_MAX_RETRIES + 1):
+            await self.acquire(tokens, lane)
+            try:
+                result = await call()
+            except Exception as e:
+                if not _retryable(e) or attempt == LLM_MAX_RETRIES:
+                    stats["failed"] += 1
+                    raise
+                delay = min(LLM_BACKOFF_MAX_SECONDS, LLM_BACKOFF_BASE_SECONDS * 2 ** attempt)
+                delay = delay / 2 + random.uniform(0, delay / 2)  # equal jitter — retries don't stampede
+                if isinstance(e, groq.RateLimitError):
+                    stats["rate_limited"] += 1
+                    delay = max(delay, _retry_after(e) or 0)
+                    self.pause(delay)
+                stats["retries"] += 1
+                await asyncio.sleep(delay)
+                continue
+
+            usage = getattr(result, "usage", None)
+            if usage is not None and getattr(usage, "total_tokens", None):
+                self.settle(tokens, usage.total_tokens)
+            return result
+
+    # ── Metrics ──────────────────────────────────────────────
+
+    def stats(self) -> dict:
+        now = time.monotonic()
+        for bucket in (self.requests, self.tokens):
+            if bucket:
+                bucket.refill(now)
+        return {
+            "rpm_limit": int(self.requests.capacity) if self.requests else None,
+            "tpm_limit": int(self.tokens.capacity) if self.tokens else None,
+            "requests_available": round(self.requests.level, 2) if self.requests else None,
+            "tokens_available": round(self.tokens.level) if self.tokens else None,
+            "paused_seconds": round(max(0.0, self._paused_until - now), 2),
+            "lanes": {
+                lane: {
+                    **{k: v for k, v in s.items() if k != "wait_seconds"},
+                    "avg_wait_ms": round(1000 * s["wait_seconds"] / s["granted"], 1) if s["granted"] else 0.0,
+                }
+                for lane, s in self._stats.items()
+            },
+        }
+
+
+scheduler = LLMScheduler()
@@ -0,0 +1,65 @@
+"""
+S.W.A.T.H.I. Pagination — Page 1000 costs the same as page 1 📄
+Opaque keyset cursors over (sort value, id), NULL-aware
+"""
+
+import base64
+import json
+from datetime import datetime
+from typing import Any, Optional, Tuple
+
+from sqlalchemy import and_, or_
+
+
+def encode_cursor(sort_value: Any, row_id: int) -> str:
+    """Position just after a row, as an opaque URL-safe token"""
+    if isinstance(sort_value, datetime):
+        payload = {"v": sort_value.isoformat(), "t": "dt", "id": row_id}
+    else:
+        payload = {"v": sort_value, "id": row_id}
+    raw = json.dumps(payload, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[Any, int]:
+    """Inverse of encode_cursor — raises ValueError on anything malformed"""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        payload = json.loads(raw)
+        value = payload["v"]
+        if payload.get("t") == "dt" and value is not None:
+            value = datetime.fromisoformat(value)
+        return value, int(payload["id"])
+    except Exception:
+        raise ValueError("Invalid cursor")
+
+
+def keyset_order(sort_expr, id_col, descending: bool) -> Tuple:
+    """
+    ORDER BY clauses keyset_filter pages through. NULL placement is spelled out — first ascending,
+    last descending — because databases disagree on the default (SQLite: lowest, PostgreSQL: highest).
+    """
+    if descending:
+        return sort_expr.desc().nulls_last(), id_col.desc()
+    return sort_expr.asc().nulls_first(), id_col.asc()
+
+
+def keyset_filter(sort_expr, id_col, descending: bool, after_value: Optional[Any], after_id: int):
+    """
+    WHERE clause selecting rows strictly after (after_value, after_id) in keyset_order(),
+    i.e. with NULLs treated as the lowest value whatever the database's own default is.
+    """
+    if descending:
+        if after_value is None:
+            # Already inside the trailing NULL block
+            return and_(sort_expr.is_(None), id_col < after_id)
+        return or_(
+            sort_expr < after_value,
+            and_(sort_expr == after_value, id_col < after_id),
+            sort_expr.is_(None),
+        )
+
+    if after_value is None:
+        # Leading NULL block: finish it, then every non-NULL row follows
+        return or_(and_(sort_expr.is_(None), id_col > after_id), sort_expr.isnot(None))
+    return or_(sort_expr > after_value, and_(sort_expr == after_value, id_col > after_id))
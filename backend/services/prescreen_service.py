@@ -0,0 +1,108 @@
+"""
+S.W.A.T.H.I. Pre-Screen Service — The Bouncer 🚪
+Cheap local relevance scoring so obviously unrelated resumes never reach the 70B model
+"""
+
+import math
+import os
+import re
+from collections import Counter
+from typing import Optional
+
+from database import JobDescription
+
+# Resumes scoring below this (0-100) skip AI analysis in bulk runs. 0 = pre-screening off.
+PRESCREEN_THRESHOLD = float(os.getenv("PRESCREEN_THRESHOLD", "0"))
+
+PRESCREENED_OUT = "PRE-SCREENED OUT"
+
+# BM25 term-frequency saturation / length normalization
+K1 = 1.2
+B = 0.75
+AVG_RESUME_TOKENS = 600
+
+# Requirements say what actually matters; the description is mostly prose
+REQUIREMENTS_WEIGHT = 2.0
+DESCRIPTION_WEIGHT = 1.0
+
+_TOKEN_RE = re.compile(r"[a-z0-9][a-z0-9+#.]*")
+_EMAIL_RE = re.compile(r"[\w.+-]+@[\w-]+\.[\w.-]+")
+
+_STOPWORDS = frozenset("""
+a about above after all also an and any are as at be been being both but by can could did do does
+for from had has have having he her his how i if in into is it its just may more most must no not
+of on or our out over own per role same she should so some such than that the their them then there
+these they this those through to too under up us very was we were what when where which while who
+will with within would you your years year experience work working team strong ability skills
+including etc using use used well new across plus preferred required requirements responsibilities
+""".split())
+
+
+def tokenize(text: str) -> list:
+    """Lowercase word tokens that keep tech spellings intact (c++, c#, node.js)"""
+    tokens = (t.rstrip(".") for t in _TOKEN_RE.findall((text or "").lower()))
+    return [t for t in tokens if len(t) > 1 and t not in _STOPWORDS]
+
+
+class Prescreener:
+    """BM25-style scorer of resumes against one JD's requirements + description"""
+
+    def __init__(self, jd: JobDescription, threshold: Optional[float] = None):
+        self.threshold = PRESCREEN_THRESHOLD if threshold is None else threshold
+
+        weights = Counter()
+        for token in tokenize(jd.requirements):
+            weights[token] += REQUIREMENTS_WEIGHT
+        for token in tokenize(jd.description):
+            weights[token] += DESCRIPTION_WEIGHT
+        # Repeated JD terms count more, but sub-linearly so one buzzword can't dominate
+        self.weights = {t: 1 + math.log(w) for t, w in weights.items()}
+        # Every JD term present once in an average-length resume = 100
+        self.max_score = sum(self.weights.values())
+
+    @property
+    def enabled(self) -> bool:
+        return self.threshold > 0 and bool(self.weights)
+
+    def score(self, resume_text: str) -> float:
+        """Relevance 0-100: weighted, saturated coverage of JD terms in the resume"""
+        if not self.weights:
+            return 0.0
+        tokens = tokenize(resume_text)
+        tf = Counter(tokens)
+        norm = K1 * (1 - B + B * len(tokens) / AVG_RESUME_TOKENS)
+
+        total = 0.0
+        for term, weight in self.weights.items():
+            f = tf.get(term)
+            if f:
+                total += weight * f * (K1 + 1) / (f + norm)
+        return round(min(100.0, total / self.max_score * 100), 1)
+
+    def passes(self, relevance: float) -> bool:
+        return not self.enabled or relevance >= self.threshold
+
+
+def prescreened_analysis(filename: str, resume_text: str, relevance: float, threshold: float) -> dict:
+    """Analysis-shaped record for a resume that was screened out without an AI call"""
+    email = _EMAIL_RE.search(resume_text or "")
+    return {
+        "candidate_name": os.path.splitext(filename)[0].replace("_", " ").replace("-", " ").strip() or "Unknown Candidate",
+        "candidate_email": email.group(0) if email else "",
+        "candidate_phone": "",
+        "current_role": "",
+        "experience_years": 0,
+        "overall_match_score": 0,
+        "star_rating": 1.0,
+        "overall_summary": (
+            f"Pre-screened out: keyword relevance {relevance}/100 is below the {threshold:g} threshold. "
+            "Not sent for AI analysis."
+        ),
+        "strengths": [],
+        "gaps": [],
+        "matched_skills": [],
+        "missing_skills": [],
+        "experience_analysis": "",
+        "recommendation": PRESCREENED_OUT,
+        "relevance_score": relevance,
+    }
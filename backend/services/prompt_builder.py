@@ -0,0 +1,263 @@
+"""
+S.W.A.T.H.I. Prompt Builder — Every token earns its place ✂️
+Token counting, boilerplate / whitespace stripping and section-aware trimming of resumes and JDs to a token budget
+"""
+
+import os
+import re
+import threading
+from typing import List, Optional, Tuple
+
+from services.llm_scheduler import estimate_tokens
+
+try:
+    import tiktoken
+    _encoding = tiktoken.get_encoding("cl100k_base")  # close enough to Llama 3's tokenizer for budgeting
+except Exception:  # optional: pip install tiktoken (also covers a missing offline encoding file)
+    _encoding = None
+
+PROMPT_RESUME_TOKEN_BUDGET = int(os.getenv("PROMPT_RESUME_TOKEN_BUDGET", "3000"))  # 0 = no limit
+PROMPT_JD_TOKEN_BUDGET = int(os.getenv("PROMPT_JD_TOKEN_BUDGET", "1500"))  # 0 = no limit
+# Sections this small are always kept whole; a bigger one squeezed below it is dropped rather than kept as a stub
+PROMPT_MIN_SECTION_TOKENS = int(os.getenv("PROMPT_MIN_SECTION_TOKENS", "40"))
+
+# Section → (priority, heading pattern). Lower priority survives longer; sections sharing one split what's left.
+# Text before the first recognised heading is the "header" (name, contact details / JD title and intro).
+RESUME_SECTIONS = {
+    "header": (0, None),
+    "experience": (0, r"(work |professional |relevant |employment |career )?(experience|history)|employment"),
+    "skills": (0, r"(technical |core |key |professional )?(skills|competencies)( and tools)?|technologies|tech stack|tools"),
+    "summary": (1, r"(professional |career )?(summary|profile|objective)|about me"),
+    "projects": (2, r"(key |personal |selected )?projects"),
+    "education": (2, r"education( and training)?|academic (background|qualifications)|qualifications"),
+    "certifications": (2, r"certifications?|licen[cs]es( and certifications)?|courses|training"),
+    "achievements": (3, r"achievements|awards( and honou?rs)?|honou?rs|accomplishments"),
+    "publications": (3, r"publications|patents"),
+    "languages": (3, r"languages"),
+    "volunteering": (4, r"volunteer(ing| work| experience)?"),
+    "interests": (5, r"(hobbies|interests)( and (hobbies|interests))?"),
+    "personal": (5, r"personal (details|information|data)|declaration"),
+    "references": (6, r"references|referees"),
+}
+JD_SECTIONS = {
+    "header": (0, None),
+    "requirements": (0, r"requirements|required skills|qualifications|must haves?|what you('| wi)ll need|what we('| a)re looking for"),
+    "responsibilities": (0, r"(key )?responsibilities|what you('| wi)ll do|the role|duties"),
+    "nice_to_have": (1, r"nice to have|good to have|preferred( qualifications| skills)?|bonus( points)?"),
+    "about": (3, r"about (us|the company|the team)|who we are|company overview"),
+    "benefits": (4, r"benefits|perks|what we offer|compensation( and benefits)?"),
+    "equal_opportunity": (5, r"equal (employment )?opportunity.*|diversity.*"),
+}
+
+# Whole lines that carry nothing for the model: page chrome, separators, stock phrases.
+# Page numbers need an explicit marker — bare "08/2019", "2019 / 2021" or "5" lines are dates and figures.
+BOILERPLATE_LINE = re.compile(
+    r"page\s*\d+(\s*(of|/)\s*\d+)?"  # Page 3, Page 3 of 5, Page 3/5
+    r"|\d+\s+of\s+\d+"  # 3 of 5
+    r"|[-–—]\s*\d+\s*[-–—]"  # - 3 -
+    r"|[^\w]+"
+    r"|(curriculum vitae|resume|résumé|cv)"
+    r"|references?( are)? available (up)?on request\.?"
+    r"|(private (and|&) )?confidential",
+    re.IGNORECASE,
+)
+# Running headers / footers: a long line repeated on every page
+REPEATED_LINE_MIN_CHARS = 25
+REPEATED_LINE_MIN_COUNT = 3
+HEADING_MAX_CHARS = 40
+
+_INLINE_SPACE = re.compile(r"[ \t\f\v\u00a0\u2000-\u200b\u3000]+")
+
+_lock = threading.Lock()
+_stats = {"documents": 0, "trimmed": 0, "tokens_before": 0, "tokens_after": 0, "sections_dropped": 0}
+
+
+def count_tokens(text: str) -> int:
+    """Prompt tokens for `text` — tiktoken when installed, the scheduler's ~4 chars/token estimate otherwise"""
+    if not text:
+        return 0
+    if _encoding is not None:
+        return len(_encoding.encode(text, disallowed_special=()))
+    return estimate_tokens(text)
+
+
+# ── Cleaning ─────────────────────────────────────────────────
+
+def clean_text(text: str) -> str:
+    """
+    Collapse runs of spaces, drop boilerplate lines, consecutive duplicates and repeated page headers / footers,
+    and keep at most one blank line between blocks. Line structure is preserved for section detection.
+    """
+    lines = [_INLINE_SPACE.sub(" ", line).strip() for line in (text or "").splitlines()]
+
+    counts = {}
+    for line in lines:
+        if len(line) >= REPEATED_LINE_MIN_CHARS:
+            counts[line] = counts.get(line, 0) + 1
+
+    out, seen_repeated = [], set()
+    for line in lines:
+        if not line:
+            if out and out[-1]:
+                out.append("")
+            continue
+        if BOILERPLATE_LINE.fullmatch(line) or (out and line == out[-1]):
+            continue
+        if counts.get(line, 0) >= REPEATED_LINE_MIN_COUNT:
+            if line in seen_repeated:
+                continue
+            seen_repeated.add(line)
+        out.append(line)
+    return "\n".join(out).strip()
+
+
+# ── Sections ─────────────────────────────────────────────────
+
+SECTIONS = {"resume": RESUME_SECTIONS, "jd": JD_SECTIONS}
+_HEADINGS = {
+    kind: [(name, re.compile(pattern, re.IGNORECASE)) for name, (_, pattern) in table.items() if pattern]
+    for kind, table in SECTIONS.items()
+}
+
+
+def _heading(line: str, patterns) -> Optional[str]:
+    """Section name if `line` is a bare heading like "WORK EXPERIENCE", "## Skills:" or "Nice to have:" """
+    if len(line) > HEADING_MAX_CHARS:
+        return None
+    label = line.strip("#*•-=_:|> ").replace("&", "and").lower()
+    label = " ".join(label.split())
+    for name, pattern in patterns:
+        if pattern.fullmatch(label):
+            return name
+    return None
+
+
+def split_sections(text: str, kind: str = "resume") -> List[dict]:
+    """Cleaned text → [{"name", "priority", "lines"}] in document order; a repeated heading starts a new block"""
+    sections, patterns = SECTIONS[kind], _HEADINGS[kind]
+    blocks = [{"name": "header", "priority": sections["header"][0], "lines": []}]
+    for line in text.split("\n"):
+        name = _heading(line, patterns)
+        if name:
+            blocks.append({"name": name, "priority": sections[name][0], "lines": [line]})
+        else:
+            blocks[-1]["lines"].append(line)
+    # Headings left empty by cleaning ("References" minus "available upon request") go too
+    return [b for b in blocks if any(b["lines"][b["name"] != "header":])]
+
+
+# ── Budgeting ────────────────────────────────────────────────
+
+def _share(sizes: List[int], budget: int) -> List[int]:
+    """Max-min fair split: small sections keep everything, the largest ones share the rest equally"""
+    allowance = [0] * len(sizes)
+    remaining = budget
+    order = sorted(range(len(sizes)), key=lambda i: sizes[i])
+    for k, i in enumerate(order):
+        allowance[i] = min(sizes[i], remaining // (len(sizes) - k))
+        remaining -= allowance[i]
+    return allowance
+
+
+def _truncate(lines: List[str], allowance: int) -> List[str]:
+    """Leading lines that fit in `allowance` tokens — the heading and most recent roles come first"""
+    kept, used = [], 0
+    for line in lines:
+        cost = count_tokens(line) + 1  # + the newline
+        if used + cost > allowance:
+            # Extractors often emit a whole section as one line — keep its head, cut at a word boundary
+            cut = line[:len(line) * (allowance - used) // cost].rsplit(" ", 1)[0]
+            if cut and cut != line:
+                kept.append(cut)
+            break
+        kept.append(line)
+        used += cost
+    return kept
+
+
+def fit_to_budget(blocks: List[dict], budget: int) -> Tuple[List[dict], List[str], List[str]]:
+    """
+    Keep blocks by priority level; when a level doesn't fit whole, its blocks share what's left.
+    Returns (kept blocks in document order, dropped names, truncated names).
+    """
+    sizes = [sum(count_tokens(line) + 1 for line in b["lines"]) for b in blocks]
+    allowance = [0] * len(blocks)
+    remaining = budget
+    # Short sections cost little and often say a lot (a degree, a language) — keep them whole, most valuable first
+    for i in sorted(range(len(blocks)), key=lambda i: blocks[i]["priority"]):
+        if sizes[i] <= min(PROMPT_MIN_SECTION_TOKENS, remaining):
+            allowance[i] = sizes[i]
+            remaining -= sizes[i]
+    for level in sorted({b["priority"] for b in blocks}):
+        members = [i for i, b in enumerate(blocks) if b["priority"] == level and not allowance[i]]
+        for i, share in zip(members, _share([sizes[i] for i in members], remaining)):
+            allowance[i] = share
+            remaining -= share
+
+    kept, dropped, truncated = [], [], []
+    for block, size, share in zip(blocks, sizes, allowance):
+        if share >= size:
+            kept.append(block)
+            continue
+        lines = _truncate(block["lines"], share) if share >= PROMPT_MIN_SECTION_TOKENS else []
+        if any(lines):
+            kept.append({**block, "lines": lines + ["[…]"]})
+            truncated.append(block["name"])
+        else:
+            dropped.append(block["name"])
+    return kept, dropped, truncated
+
+
+def compact(text: str, budget: int, kind: str = "resume") -> dict:
+    """
+    Clean `text` and, if it's still over `budget` tokens (0 = no limit), trim it section by section.
+    Returns {"text", "tokens_before", "tokens_after", "tokens_saved", "dropped", "truncated"}.
+    """
+    tokens_before = count_tokens(text)
+    cleaned = clean_text(text)
+    dropped, truncated = [], []
+
+    if budget and count_tokens(cleaned) > budget:
+        kept, dropped, truncated = fit_to_budget(split_sections(cleaned, kind), budget)
+        cleaned = "\n".join(line for block in kept for line in block["lines"])
+        if dropped:
+            cleaned += "\n[Omitted to fit the token budget: " + ", ".join(sorted(set(dropped))) + "]"
+
+    tokens_after = count_tokens(cleaned)
+    with _lock:
+        _stats["documents"] += 1
+        _stats["trimmed"] += bool(dropped or truncated)
+        _stats["tokens_before"] += tokens_before
+        _stats["tokens_after"] += tokens_after
+        _stats["sections_dropped"] += len(dropped)
+    return {
+        "text": cleaned,
+        "tokens_before": tokens_before,
+        "tokens_after": tokens_after,
+        "tokens_saved": max(0, tokens_before - tokens_after),
+        "dropped": dropped,
+        "truncated": truncated,
+    }
+
+
+def compact_resume(resume_text: str) -> dict:
+    return compact(resume_text, PROMPT_RESUME_TOKEN_BUDGET, "resume")
+
+
+def compact_jd(jd_text: str) -> dict:
+    return compact(jd_text, PROMPT_JD_TOKEN_BUDGET, "jd")
+
+
+# ── Metrics ──────────────────────────────────────────────────
+
+def stats() -> dict:
+    with _lock:
+        saved = _stats["tokens_before"] - _stats["tokens_after"]
+        return {
+            "tokenizer": "tiktoken/cl100k_base" if _encoding is not None else "estimate",
+            "resume_budget": PROMPT_RESUME_TOKEN_BUDGET,
+            "jd_budget": PROMPT_JD_TOKEN_BUDGET,
+            **_stats,
+            "tokens_saved": saved,
+            "saved_ratio": round(saved / _stats["tokens_before"], 3) if _stats["tokens_before"] else 0.0,
+        }
@@ -0,0 +1,86 @@
+"""
+S.W.A.T.H.I. Query Plan Check — No full scans on the hot paths 🧭
+Runs EXPLAIN QUERY PLAN on each route's main query and confirms its table is reached through an index
+
+Usage (from backend/, SQLite only; exits 1 if any query falls back to a table scan):
+    python -m services.query_plans
+"""
+
+import re
+import sys
+from datetime import datetime
+
+from database import engine, init_db, SessionLocal, Candidate
+from routes.candidate_routes import candidate_list_query
+from routes.dashboard_routes import recent_activity_query, top_candidates_query
+from routes.jd_routes import candidate_stats_query
+from routes.tracker_routes import category_counts_query, timeline_query
+from services.job_queue import next_pending_query
+
+# SQLite ≥ 3.36 prints "SCAN candidates", older versions "SCAN TABLE candidates"
+_FULL_SCAN_RE = re.compile(r"^SCAN (?:TABLE )?(\w+)$")
+
+_SINCE = datetime(2000, 1, 1)
+
+
+def _candidates(**filters):
+    return lambda db: candidate_list_query(db, ["id", "name", "match_score"], **filters)[0].limit(50)
+
+
+# name → (table that must be index-driven, query builder); every builder is the one the route itself calls
+HOT_QUERIES = {
+    "GET /api/candidates?jd_id&status&sort_by=match_score": ("candidates", _candidates(
+        jd_id=1, status="shortlisted", sort_by="match_score",
+    )),
+    "GET /api/candidates?jd_id&sort_by=match_score": ("candidates", _candidates(jd_id=1, sort_by="match_score")),
+    "GET /api/candidates (newest first)": ("candidates", _candidates()),
+    "GET /api/candidates?recommendation&sort_by=match_score": ("candidates", _candidates(
+        recommendation="RECOMMENDED", sort_by="match_score",
+    )),
+    "GET /api/candidates?min_score&sort_by=match_score": ("candidates", _candidates(
+        min_score=80, sort_by="match_score",
+    )),
+    "GET /api/candidates?skills": ("candidate_skills", _candidates(jd_id=1, skills="kubernetes,python")),
+    "GET /api/dashboard/top-candidates": ("candidates", lambda db: top_candidates_query(db)),
+    "GET /api/dashboard/recent-activity": ("activity_logs", lambda db: recent_activity_query(db)),
+    "GET /api/jds/{id}": ("candidates", lambda db: candidate_stats_query().where(Candidate.jd_id == 1)),
+    "GET /api/tracker/today (counts)": ("activity_logs", lambda db: category_counts_query(db, _SINCE)),
+    "GET /api/tracker/today (timeline)": ("activity_logs", lambda db: timeline_query(db, _SINCE).limit(50)),
+    "job queue claim": ("analysis_job_items", next_pending_query),
+}
+
+
+def explain(db, query) -> list:
+    """EXPLAIN QUERY PLAN detail lines for an ORM query or a select()"""
+    statement = getattr(query, "statement", query)
+    sql = str(statement.compile(engine, compile_kwargs={"literal_binds": True}))
+    return [row[-1] for row in db.connection().exec_driver_sql(f"EXPLAIN QUERY PLAN {sql}")]
+
+
+def check_plans(db) -> list:
+    """(name, ok, plan lines) per hot query — ok means its table is never fully scanned"""
+    results = []
+    for name, (table, build) in HOT_QUERIES.items():
+        plan = explain(db, build(db))
+        scans = {m.group(1) for m in (_FULL_SCAN_RE.match(line) for line in plan) if m}
+        results.append((name, table not in scans, plan))
+    return results
+
+
+if __name__ == "__main__":
+    if engine.dialect.name != "sqlite":
+        print("EXPLAIN QUERY PLAN check only supports SQLite")
+        sys.exit(1)
+
+    init_db()
+    session = SessionLocal()
+    try:
+        results = check_plans(session)
+    finally:
+        session.close()
+
+    for name, ok, plan in results:
+        print(f"{'✅' if ok else '❌'} {name}")
+        for line in plan:
+            print(f"      {line}")
+    sys.exit(0 if all(ok for _, ok, _ in results) else 1)
@@ -0,0 +1,196 @@
+"""
+S.W.A.T.H.I. Response Cache — Polls that cost nothing 🪞
+In-process cache for the read-heavy GET routes, invalidated by a write generation, with ETag / 304 support
+"""
+
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import event
+
+from database import SessionLocal
+
+RESPONSE_CACHE_ENABLED = os.getenv("RESPONSE_CACHE_ENABLED", "1") not in ("0", "false", "False")
+RESPONSE_CACHE_MAX_ENTRIES = int(os.getenv("RESPONSE_CACHE_MAX_ENTRIES", "256"))
+
+# Exact paths whose GET responses are cached, keyed by path + query string
+CACHED_PATHS = {
+    "/api/dashboard/stats",
+    "/api/dashboard/top-candidates",
+    "/api/dashboard/recent-activity",
+    "/api/jds",
+    "/api/candidates",
+    "/api/tracker/today",
+    "/api/tracker/weekly",
+}
+
+# Writes to these tables never change a cached response
+IGNORED_TABLES = {"llm_cache", "analysis_jobs", "analysis_job_items", "import_checkpoints"}
+
+_lock = threading.Lock()
+_entries: "OrderedDict[tuple, dict]" = OrderedDict()
+_generation = 0
+_stats = {"hits": 0, "misses": 0, "not_modified": 0, "invalidations": 0}
+
+
+# ── Generation ───────────────────────────────────────────────
+
+def invalidate():
+    """Bump the write generation — every cached response becomes stale"""
+    global _generation
+    with _lock:
+        _generation += 1
+        _entries.clear()
+        _stats["invalidations"] += 1
+
+
+@event.listens_for(SessionLocal, "after_flush")
+def _note_writes(session, _flush_context):
+    for obj in (*session.new, *session.dirty, *session.deleted):
+        if getattr(obj, "__tablename__", None) not in IGNORED_TABLES:
+            session.info["response_cache_dirty"] = True
+            return
+
+
+@event.listens_for(SessionLocal, "after_bulk_update")
+@event.listens_for(SessionLocal, "after_bulk_delete")
+def _note_bulk_writes(context):
+    """query.update() / query.delete() bypass the flush — counters and stats change through these"""
+    if context.mapper.local_table.name not in IGNORED_TABLES:
+        context.session.info["response_cache_dirty"] = True
+
+
+@event.listens_for(SessionLocal, "after_commit")
+def _invalidate_on_commit(session):
+    if session.info.pop("response_cache_dirty", False):
+        invalidate()
+
+
+@event.listens_for(SessionLocal, "after_rollback")
+def _discard_on_rollback(session):
+    session.info.pop("response_cache_dirty", None)
+
+
+# ── Entries ──────────────────────────────────────────────────
+
+def _lookup(key: tuple) -> Optional[dict]:
+    with _lock:
+        entry = _entries.get(key)
+        if entry is None or entry["generation"] != _generation:
+            return None
+        _entries.move_to_end(key)
+        return entry
+
+
+def _store(key: tuple, entry: dict):
+    with _lock:
+        # A write committed while we were computing — the result may already be stale
+        if entry["generation"] != _generation:
+            return
+        _entries[key] = entry
+        _entries.move_to_end(key)
+        while len(_entries) > RESPONSE_CACHE_MAX_ENTRIES:
+            _entries.popitem(last=False)
+
+
+def make_etag(body: bytes) -> str:
+    """Weak validator: the same content goes out as identity, gzip or br bytes, which strong ETags must tell apart"""
+    return 'W/"' + hashlib.blake2b(body, digest_size=12).hexdigest() + '"'
+
+
+def etag_matches(if_none_match: str, etag: str) -> bool:
+    """If-None-Match uses weak comparison — W/ prefixes are ignored on both sides"""
+    if if_none_match.strip() == "*":
+        return True
+    opaque = etag.removeprefix("W/")
+    return any(tag.strip().removeprefix("W/") == opaque for tag in if_none_match.split(","))
+
+
+def stats() -> dict:
+    with _lock:
+        return {
+            "enabled": RESPONSE_CACHE_ENABLED,
+            "entries": len(_entries),
+            "max_entries": RESPONSE_CACHE_MAX_ENTRIES,
+            "generation": _generation,
+            **_stats,
+        }
+
+
+# ── Middleware ───────────────────────────────────────────────
+
+class ResponseCacheMiddleware:
+    """
+    ASGI middleware: serves CACHED_PATHS from memory while the write generation is unchanged,
+    and answers a matching If-None-Match with 304 either way.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if not RESPONSE_CACHE_ENABLED or scope["type"] != "http" or scope["method"] != "GET" \
+                or scope["path"] not in CACHED_PATHS:
+            await self.app(scope, receive, send)
+            return
+
+        # Today's date is part of the key: "today" / streak figures roll over without any write
+        query = "&".join(sorted(scope.get("query_string", b"").decode("latin-1").split("&")))
+        key = (scope["path"], query, datetime.utcnow().date())
+
+        entry = _lookup(key)
+        if entry is None:
+            entry = await self._render(scope, receive, send, key)
+            if entry is None:
+                return  # not cacheable; already sent
+        else:
+            _stats["hits"] += 1
+
+        if_none_match = dict(scope["headers"]).get(b"if-none-match", b"").decode("latin-1")
+        if etag_matches(if_none_match, entry["etag"]):
+            _stats["not_modified"] += 1
+            await send({"type": "http.response.start", "status": 304, "headers": [
+                (b"etag", entry["etag"].encode()), (b"cache-control", b"no-cache"), (b"vary", b"Accept-Encoding"),
+            ]})
+            await send({"type": "http.response.body", "body": b""})
+            return
+
+        await send({"type": "http.response.start", "status": 200, "headers": entry["headers"]})
+        await send({"type": "http.response.body", "body": entry["body"]})
+
+    async def _render(self, scope, receive, send, key: tuple) -> Optional[dict]:
+        """Run the route, capturing its response; cache and return it if it's a plain 200"""
+        started_generation = _generation
+        start, chunks = {}, []
+
+        async def capture(message):
+            if message["type"] == "http.response.start":
+                start.update(message)
+            elif message["type"] == "http.response.body":
+                chunks.append(message.get("body", b""))
+
+        await self.app(scope, receive, capture)
+        _stats["misses"] += 1
+        body = b"".join(chunks)
+
+        if start.get("status") != 200:
+            await send(start)
+            await send({"type": "http.response.body", "body": body})
+            return None
+
+        etag = make_etag(body)
+        headers = [(k, v) for k, v in start.get("headers", []) if k.lower() not in (b"content-length", b"etag")]
+        headers += [
+            (b"content-length", str(len(body)).encode()),
+            (b"etag", etag.encode()),
+            (b"cache-control", b"no-cache"),  # always revalidate; 304s keep it cheap
+        ]
+        if not any(k.lower() == b"vary" for k, _ in headers):
+            headers.append((b"vary", b"Accept-Encoding"))  # the compression layer may encode this body
+        entry = {"generation": started_generation, "body": body, "headers": headers, "etag": etag}
+        _store(key, entry)
+        return entry
@@ -0,0 +1,56 @@
+"""
+S.W.A.T.H.I. Search Service — Find anyone, instantly 🔎
+Ranked full-text candidate search over the FTS5 index, with a LIKE fallback
+"""
+
+import re
+
+from sqlalchemy import or_, select, literal_column, table, text
+
+from database import Candidate, FTS_TABLE, fts_enabled
+
+# bm25() column weights, in FTS_COLUMNS order: name, email, current_role, resume_text, overall_summary
+FTS_WEIGHTS = (10.0, 8.0, 5.0, 1.0, 2.0)
+
+_TERM_RE = re.compile(r"\w+", re.UNICODE)
+
+
+def to_match_query(search: str) -> str:
+    """User input → safe FTS5 query: every word must match, as a prefix ("jav" finds "java")"""
+    terms = _TERM_RE.findall(search or "")
+    return " ".join(f'"{t}"*' for t in terms)
+
+
+def apply_search(query, search: str):
+    """
+    Filter a Candidate query by `search`.
+    Returns (query, rank_column) — rank_column orders best matches first, or is None on the fallback path.
+    """
+    match = to_match_query(search)
+    if not match:
+        return query, None
+
+    if not fts_enabled():
+        like = f"%{search}%"
+        return query.filter(or_(
+            Candidate.name.ilike(like),
+            Candidate.email.ilike(like),
+            Candidate.current_role.ilike(like),
+            Candidate.resume_text.ilike(like),
+            Candidate.overall_summary.ilike(like),
+        )), None
+
+    fts = table(FTS_TABLE)
+    weights = ", ".join(str(w) for w in FTS_WEIGHTS)
+    hits = (
+        select(
+            literal_column("rowid").label("candidate_id"),
+            literal_column(f"bm25({FTS_TABLE}, {weights})").label("rank"),
+        )
+        .select_from(fts)
+        .where(text(f"{FTS_TABLE} MATCH :fts_query").bindparams(fts_query=match))
+        .subquery("fts_hits")
+    )
+    query = query.join(hits, hits.c.candidate_id == Candidate.id)
+    # bm25() is lower-is-better
+    return query, hits.c.rank
@@ -0,0 +1,111 @@
+"""
+S.W.A.T.H.I. Skill Service — Who knows Kubernetes? 🧩
+Normalized candidate skills: written at analysis time, searched with index lookups instead of JSON decodes
+
+Rebuild the skills table from the candidates' JSON columns (from backend/):
+    python -m services.skill_service rebuild
+"""
+
+import json
+import sys
+from typing import Iterable, List, Optional
+
+from sqlalchemy import select, func, distinct
+
+from database import SessionLocal, Candidate, CandidateSkill
+
+SKILL_KINDS = ("matched", "missing")
+SKILL_MATCH_MODES = ("all", "any")
+BACKFILL_BATCH = 500
+
+
+def skill_key(skill: str) -> str:
+    """Lookup key: case-folded with whitespace collapsed — "  Node.JS " and "node.js" are one skill"""
+    return " ".join(str(skill).split()).casefold()[:100]
+
+
+def parse_skills(raw: str) -> List[str]:
+    try:
+        skills = json.loads(raw) if raw else []
+    except (TypeError, ValueError):
+        return []
+    return [str(s) for s in skills if str(s).strip()] if isinstance(skills, list) else []
+
+
+def skill_rows(candidate_id: int, jd_id: int, matched_skills: str, missing_skills: str) -> List[dict]:
+    """CandidateSkill rows for one candidate's JSON skill columns, de-duplicated per kind"""
+    rows = []
+    for kind, raw in (("matched", matched_skills), ("missing", missing_skills)):
+        seen = set()
+        for skill in parse_skills(raw):
+            key = skill_key(skill)
+            if key in seen:
+                continue
+            seen.add(key)
+            rows.append({
+                "candidate_id": candidate_id, "jd_id": jd_id, "kind": kind,
+                "skill_key": key, "skill": skill.strip()[:100],
+            })
+    return rows
+
+
+def index_candidates(db, candidates: Iterable[Candidate]):
+    """Add skill rows for freshly flushed candidates (ids assigned); caller commits"""
+    db.add_all([
+        CandidateSkill(**row)
+        for c in candidates
+        for row in skill_rows(c.id, c.jd_id, c.matched_skills, c.missing_skills)
+    ])
+
+
+def backfill(conn) -> int:
+    """Index every candidate that has no skill rows yet, in id-ordered batches"""
+    table = CandidateSkill.__table__
+    indexed = select(CandidateSkill.candidate_id)
+    after_id, written = 0, 0
+    while True:
+        batch = conn.execute(
+            select(Candidate.id, Candidate.jd_id, Candidate.matched_skills, Candidate.missing_skills)
+            .where(Candidate.id > after_id, Candidate.id.not_in(indexed))
+            .order_by(Candidate.id)
+            .limit(BACKFILL_BATCH)
+        ).all()
+        if not batch:
+            return written
+        rows = [r for c in batch for r in skill_rows(c.id, c.jd_id, c.matched_skills, c.missing_skills)]
+        if rows:
+            conn.execute(table.insert(), rows)
+        written += len(rows)
+        after_id = batch[-1].id
+
+
+def skill_filter(skills: List[str], match: str = "all", kind: str = "matched", jd_id: Optional[int] = None):
+    """
+    WHERE clause on Candidate: has all (or any) of `skills` as `kind` skills, optionally within one JD.
+    Resolved on the (kind, skill_key, jd_id, candidate_id) index — no JSON is decoded.
+    """
+    keys = sorted({skill_key(s) for s in skills})
+    hits = select(CandidateSkill.candidate_id).where(
+        CandidateSkill.kind == kind, CandidateSkill.skill_key.in_(keys)
+    )
+    if jd_id:
+        hits = hits.where(CandidateSkill.jd_id == jd_id)
+    if match == "all":
+        hits = hits.group_by(CandidateSkill.candidate_id).having(
+            func.count(distinct(CandidateSkill.skill_key)) == len(keys)
+        )
+    return Candidate.id.in_(hits)
+
+
+if __name__ == "__main__":
+    if sys.argv[1:] != ["rebuild"]:
+        print("Usage: python -m services.skill_service rebuild")
+        sys.exit(1)
+    session = SessionLocal()
+    try:
+        session.query(CandidateSkill).delete(synchronize_session=False)
+        written = backfill(session.connection())
+        session.commit()
+        print(f"✅ Candidate skills rebuilt: {written} rows")
+    finally:
+        session.close()
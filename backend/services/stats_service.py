@@ -0,0 +1,350 @@
+"""
+S.W.A.T.H.I. Stats Service — All the numbers in one pass 📊
+Pipeline statistics from materialized counters, with a one-scan conditional-aggregation fallback
+
+Rebuild the counters from scratch (from backend/):
+    python -m services.stats_service rebuild
+"""
+
+import math
+import sys
+from datetime import datetime, date
+from typing import Optional
+
+from sqlalchemy import select, func, case, and_, or_, cast, Integer, Date
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.exc import IntegrityError
+
+from database import (
+    engine, SessionLocal, Candidate, JobDescription,
+    PipelineCounter, ScoreHistogramCounter, DailyAnalyzedCounter,
+)
+from services.prescreen_service import PRESCREENED_OUT
+
+STATUSES = ["new", "shortlisted", "interviewing", "rejected", "hired", "on_hold"]
+RECOMMENDATIONS = ["HIGHLY RECOMMENDED", "RECOMMENDED", "MAYBE", "NOT RECOMMENDED"]
+TOP_SCORE = 70
+MAX_SCORE = 100
+MAX_BINS = 100  # the scan selects one column per bin
+
+
+def scored():
+    """
+    Candidates that went through AI analysis. Pre-screened-out ones count in candidate and status totals
+    like any other candidate, but have no real score, so score stats and "analyzed" counts skip them.
+    """
+    return or_(Candidate.recommendation.is_(None), Candidate.recommendation != PRESCREENED_OUT)
+
+
+def _count_if(condition):
+    return func.coalesce(func.sum(case((condition, 1), else_=0)), 0)
+
+
+def score_bins(bin_width: float) -> list:
+    """[(label, lo, hi)] covering 0-100; every bin is [lo, hi) except the last, which includes 100"""
+    count = max(1, math.ceil(MAX_SCORE / bin_width))
+    if count > MAX_BINS:
+        raise ValueError(f"bin_width {bin_width:g} gives {count} bins; at most {MAX_BINS} are allowed")
+    bins = []
+    for i in range(count):
+        lo = i * bin_width
+        hi = min(MAX_SCORE, (i + 1) * bin_width)
+        bins.append((f"{lo:g}-{hi:g}", lo, hi))
+    return bins
+
+
+def compute_pipeline_stats(
+    db,
+    jd_id: Optional[int] = None,
+    date_from: Optional[datetime] = None,
+    date_to: Optional[datetime] = None,
+    bin_width: float = 20,
+) -> dict:
+    """Dashboard numbers — from the counters when they can answer, else one scan over candidates"""
+    if date_from is None and date_to is None and float(bin_width).is_integer():
+        return counter_pipeline_stats(db, jd_id=jd_id, bin_width=int(bin_width))
+    return scan_pipeline_stats(db, jd_id=jd_id, date_from=date_from, date_to=date_to, bin_width=bin_width)
+
+
+def scan_pipeline_stats(
+    db,
+    jd_id: Optional[int] = None,
+    date_from: Optional[datetime] = None,
+    date_to: Optional[datetime] = None,
+    bin_width: float = 20,
+) -> dict:
+    """Every dashboard number from a single SELECT over candidates (JD counts ride along as scalar subqueries)"""
+    today = datetime.utcnow().replace(hour=0, minute=0, second=0, microsecond=0)
+    # Score stats see only scored candidates: CASE yields NULL for the rest, which the aggregates skip
+    score = case((scored(), Candidate.match_score))
+    bins = score_bins(bin_width)
+
+    columns = [
+        func.count(Candidate.id).label("total"),
+        func.avg(score).label("avg"),
+        func.max(score).label("max"),
+        func.min(score).label("min"),
+        _count_if(score >= TOP_SCORE).label("top"),
+        _count_if(and_(scored(), Candidate.analyzed_at >= today)).label("today"),
+    ]
+    columns += [_count_if(Candidate.status == s).label(f"status_{i}") for i, s in enumerate(STATUSES)]
+    columns += [_count_if(Candidate.recommendation == r).label(f"rec_{i}") for i, r in enumerate(RECOMMENDATIONS)]
+    for i, (_, lo, hi) in enumerate(bins):
+        upper = score <= hi if i == len(bins) - 1 else score < hi
+        columns.append(_count_if(and_(score >= lo, upper)).label(f"bin_{i}"))
+
+    jd_scope = [JobDescription.id == jd_id] if jd_id else []
+    columns.append(select(func.count(JobDescription.id)).where(*jd_scope).scalar_subquery().label("total_jds"))
+    columns.append(
+        select(func.count(JobDescription.id))
+        .where(JobDescription.status == "active", *jd_scope)
+        .scalar_subquery()
+        .label("active_jds")
+    )
+
+    query = select(*columns).select_from(Candidate)
+    if jd_id:
+        query = query.where(Candidate.jd_id == jd_id)
+    if date_from:
+        query = query.where(Candidate.analyzed_at >= date_from)
+    if date_to:
+        query = query.where(Candidate.analyzed_at < date_to)
+
+    row = db.execute(query).one()
+
+    return {
+        "total_jds": row.total_jds,
+        "active_jds": row.active_jds,
+        "total_candidates": row.total,
+        "status_counts": {s: getattr(row, f"status_{i}") for i, s in enumerate(STATUSES)},
+        "avg_score": round(row.avg or 0, 1),
+        "max_score": round(row.max or 0, 1),
+        "min_score": round(row.min or 0, 1),
+        "recommendation_counts": {r: getattr(row, f"rec_{i}") for i, r in enumerate(RECOMMENDATIONS)},
+        "top_candidates_count": row.top,
+        "today_analyzed": row.today,
+        "score_distribution": [
+            {"range": label, "count": getattr(row, f"bin_{i}")} for i, (label, _, _) in enumerate(bins)
+        ],
+    }
+
+
+# ── Materialized counters ────────────────────────────────────
+# Every write path calls these inside its own transaction, so counters commit (or roll back) with the data.
+
+def day_expr(column):
+    """DATE(column), portable — SQLite has no real DATE type to CAST to"""
+    if engine.dialect.name == "sqlite":
+        return func.date(column)
+    return cast(column, Date)
+
+
+def _as_date(value) -> date:
+    return date.fromisoformat(value) if isinstance(value, str) else value
+
+
+_UPSERT_INSERTS = {"sqlite": sqlite.insert, "postgresql": postgresql.insert}
+
+
+def _bump(db, model, keys: dict, **deltas):
+    """
+    counter += delta, inserting the row the first time a key is seen. One INSERT … ON CONFLICT DO UPDATE,
+    so two writers meeting a new key at once can't both insert it; other databases retry on the
+    unique-constraint violation instead.
+    """
+    increments = {k: getattr(model, k) + v for k, v in deltas.items()}
+    insert = _UPSERT_INSERTS.get(engine.dialect.name)
+    if insert is not None:
+        db.execute(
+            insert(model).values(**keys, **deltas).on_conflict_do_update(index_elements=list(keys), set_=increments)
+        )
+        return
+
+    for attempt in range(2):
+        try:
+            with db.begin_nested():
+                if not db.query(model).filter_by(**keys).update(increments, synchronize_session=False):
+                    db.add(model(**keys, **deltas))
+            return
+        except IntegrityError:
+            if attempt:
+                raise
+            # A concurrent writer inserted the key first — the retry's UPDATE finds its row
+
+
+def _count(db, jd_id, status, recommendation, score, analyzed_at, sign: int):
+    screened_out = recommendation == PRESCREENED_OUT
+    score = 0.0 if screened_out else score or 0.0
+    _bump(
+        db, PipelineCounter,
+        {"jd_id": jd_id, "status": status or "new", "recommendation": recommendation or "PENDING"},
+        candidate_count=sign, score_sum=sign * score,
+    )
+    if screened_out:
+        return
+    _bump(db, ScoreHistogramCounter, {"jd_id": jd_id, "score_floor": int(math.floor(score))}, candidate_count=sign)
+    if analyzed_at:
+        _bump(db, DailyAnalyzedCounter, {"day": analyzed_at.date(), "jd_id": jd_id}, candidate_count=sign)
+
+
+def on_candidate_added(db, c: Candidate):
+    """Call after flushing a new candidate"""
+    _count(db, c.jd_id, c.status, c.recommendation, c.match_score, c.analyzed_at, +1)
+
+
+def on_candidate_removed(db, c: Candidate):
+    """Call before deleting a candidate"""
+    _count(db, c.jd_id, c.status, c.recommendation, c.match_score, c.analyzed_at, -1)
+
+
+def on_status_changed(db, c: Candidate, old_status: str):
+    """Call after changing c.status — only the JD × status × recommendation cell moves"""
+    if old_status == c.status:
+        return
+    score = 0.0 if c.recommendation == PRESCREENED_OUT else c.match_score or 0.0
+    rec = c.recommendation or "PENDING"
+    _bump(db, PipelineCounter, {"jd_id": c.jd_id, "status": old_status or "new", "recommendation": rec},
+          candidate_count=-1, score_sum=-score)
+    _bump(db, PipelineCounter, {"jd_id": c.jd_id, "status": c.status or "new", "recommendation": rec},
+          candidate_count=1, score_sum=score)
+
+
+def on_jd_deleted(db, jd_id: int):
+    """Call when a JD (and with it all its candidates) is deleted"""
+    for model in (PipelineCounter, ScoreHistogramCounter, DailyAnalyzedCounter):
+        db.query(model).filter(model.jd_id == jd_id).delete(synchronize_session=False)
+
+
+def rebuild_counters(db) -> dict:
+    """Recompute every counter from the candidates table in one transaction"""
+    for model in (PipelineCounter, ScoreHistogramCounter, DailyAnalyzedCounter):
+        db.query(model).delete(synchronize_session=False)
+
+    status = func.coalesce(Candidate.status, "new")
+    rec = func.coalesce(Candidate.recommendation, "PENDING")
+    score = func.coalesce(Candidate.match_score, 0.0)
+    pipeline = db.query(
+        Candidate.jd_id, status, rec, func.count(Candidate.id), func.coalesce(func.sum(case((scored(), score))), 0.0)
+    ).group_by(Candidate.jd_id, status, rec).all()
+    db.bulk_insert_mappings(PipelineCounter, [
+        {"jd_id": j, "status": st, "recommendation": r, "candidate_count": n, "score_sum": total}
+        for j, st, r, n, total in pipeline
+    ])
+
+    # CAST truncates, which is floor for the non-negative 0-100 scores
+    floor = cast(score, Integer)
+    histogram = (
+        db.query(Candidate.jd_id, floor, func.count(Candidate.id))
+        .filter(scored())
+        .group_by(Candidate.jd_id, floor)
+        .all()
+    )
+    db.bulk_insert_mappings(ScoreHistogramCounter, [
+        {"jd_id": j, "score_floor": f, "candidate_count": n} for j, f, n in histogram
+    ])
+
+    day = day_expr(Candidate.analyzed_at)
+    daily = (
+        db.query(day, Candidate.jd_id, func.count(Candidate.id))
+        .filter(Candidate.analyzed_at.isnot(None), scored())
+        .group_by(day, Candidate.jd_id)
+        .all()
+    )
+    db.bulk_insert_mappings(DailyAnalyzedCounter, [
+        {"day": _as_date(d), "jd_id": j, "candidate_count": n} for d, j, n in daily
+    ])
+
+    db.commit()
+    return {"pipeline_rows": len(pipeline), "histogram_rows": len(histogram), "daily_rows": len(daily)}
+
+
+def ensure_counters(db):
+    """Backfill counters for a database that has candidates but has never been counted"""
+    has_counters = db.query(PipelineCounter.id).limit(1).first() is not None
+    has_candidates = db.query(Candidate.id).limit(1).first() is not None
+    if has_candidates and not has_counters:
+        rebuild_counters(db)
+
+
+def pipeline_totals(db, jd_id: Optional[int] = None) -> dict:
+    """Candidate totals by status from the counters — O(#JDs) rows"""
+    query = db.query(PipelineCounter.status, func.sum(PipelineCounter.candidate_count))
+    if jd_id:
+        query = query.filter(PipelineCounter.jd_id == jd_id)
+    by_status = {s: n or 0 for s, n in query.group_by(PipelineCounter.status).all()}
+    return {"total": sum(by_status.values()), "by_status": by_status}
+
+
+def counter_pipeline_stats(db, jd_id: Optional[int] = None, bin_width: int = 20) -> dict:
+    """The scan_pipeline_stats payload, read from counters (plus index-backed MIN/MAX)"""
+    today = datetime.utcnow().date()
+
+    cells = db.query(
+        PipelineCounter.status, PipelineCounter.recommendation,
+        PipelineCounter.candidate_count, PipelineCounter.score_sum,
+    )
+    histogram = db.query(ScoreHistogramCounter.score_floor, func.sum(ScoreHistogramCounter.candidate_count))
+    today_q = db.query(func.coalesce(func.sum(DailyAnalyzedCounter.candidate_count), 0)).filter(
+        DailyAnalyzedCounter.day == today
+    )
+    extremes = db.query(func.min(Candidate.match_score), func.max(Candidate.match_score)).filter(scored())
+    jd_counts = db.query(
+        func.count(JobDescription.id),
+        func.coalesce(func.sum(case((JobDescription.status == "active", 1), else_=0)), 0),
+    )
+    if jd_id:
+        cells = cells.filter(PipelineCounter.jd_id == jd_id)
+        histogram = histogram.filter(ScoreHistogramCounter.jd_id == jd_id)
+        today_q = today_q.filter(DailyAnalyzedCounter.jd_id == jd_id)
+        extremes = extremes.filter(Candidate.jd_id == jd_id)
+        jd_counts = jd_counts.filter(JobDescription.id == jd_id)
+
+    total = scored_total = 0
+    score_sum = 0.0
+    status_counts = {s: 0 for s in STATUSES}
+    rec_counts = {r: 0 for r in RECOMMENDATIONS}
+    for status, rec, n, ssum in cells.all():
+        total += n
+        if rec != PRESCREENED_OUT:
+            scored_total += n
+            score_sum += ssum
+        if status in status_counts:
+            status_counts[status] += n
+        if rec in rec_counts:
+            rec_counts[rec] += n
+
+    floors = dict(histogram.group_by(ScoreHistogramCounter.score_floor).all())
+    bins = score_bins(bin_width)
+    distribution = []
+    for i, (label, lo, hi) in enumerate(bins):
+        last = i == len(bins) - 1
+        count = sum(n for f, n in floors.items() if lo <= f and (f <= hi if last else f < hi))
+        distribution.append({"range": label, "count": count})
+
+    min_score, max_score = extremes.one()
+    total_jds, active_jds = jd_counts.one()
+
+    return {
+        "total_jds": total_jds,
+        "active_jds": active_jds,
+        "total_candidates": total,
+        "status_counts": status_counts,
+        "avg_score": round(score_sum / scored_total, 1) if scored_total else 0,
+        "max_score": round(max_score or 0, 1),
+        "min_score": round(min_score or 0, 1),
+        "recommendation_counts": rec_counts,
+        "top_candidates_count": sum(n for f, n in floors.items() if f >= TOP_SCORE),
+        "today_analyzed": today_q.scalar(),
+        "score_distribution": distribution,
+    }
+
+
+if __name__ == "__main__":
+    if sys.argv[1:] != ["rebuild"]:
+        print("Usage: python -m services.stats_service rebuild")
+        sys.exit(1)
+    session = SessionLocal()
+    try:
+        print(f"✅ Pipeline counters rebuilt: {rebuild_counters(session)}")
+    finally:
+        session.close()
@@ -0,0 +1,37 @@
+"""
+Shared fixtures — every test run gets its own throwaway SQLite database
+"""
+
+import os
+import sys
+import tempfile
+
+# Must happen before anything imports `database`
+_tmp = tempfile.mkdtemp(prefix="swathi-tests-")
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(_tmp, 'test.db')}"
+os.environ.setdefault("GROQ_API_KEY", "test")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+
+from database import Base, SessionLocal, engine, init_db
+
+
+@pytest.fixture(scope="session", autouse=True)
+def _schema():
+    init_db()
+    yield
+
+
+@pytest.fixture
+def db():
+    """A session over empty tables; everything written is wiped afterwards"""
+    session = SessionLocal()
+    try:
+        yield session
+    finally:
+        session.rollback()
+        session.close()
+        with engine.begin() as conn:
+            for table in reversed(Base.metadata.sorted_tables):
+                conn.execute(table.delete())
@@ -0,0 +1,23 @@
+"""
+Small builders for test rows — only the fields a test cares about need passing
+"""
+
+from database import JobDescription
+from services.analysis_service import candidate_from_analysis
+
+
+def make_jd(db, **fields) -> JobDescription:
+    jd = JobDescription(**{"title": "Backend Engineer", "description": "Build APIs", **fields})
+    db.add(jd)
+    db.commit()
+    return jd
+
+
+def make_candidate(db, jd, name="Jane Doe", score=80, recommendation="RECOMMENDED", **fields):
+    analysis = {"candidate_name": name, "overall_match_score": score, "recommendation": recommendation}
+    candidate = candidate_from_analysis(jd.id, f"{name}.pdf", "resume text", analysis)
+    for key, value in fields.items():
+        setattr(candidate, key, value)
+    db.add(candidate)
+    db.commit()
+    return candidate
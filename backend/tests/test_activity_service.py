@@ -0,0 +1,49 @@
+from datetime import date, datetime
+
+import pytest
+
+from database import ActivityLog
+from services.activity_service import activity_buckets, streak
+
+TODAY = date(2024, 3, 13)  # a Wednesday
+
+
+def _log(db, *stamps):
+    db.add_all(ActivityLog(action="resume_analyzed", entity_type="candidate", entity_id=1, created_at=s) for s in stamps)
+    db.commit()
+
+
+def _counts(buckets):
+    return [(b["start"], b["count"]) for b in buckets]
+
+
+def test_daily_buckets_are_zero_filled_oldest_first(db):
+    _log(db, datetime(2024, 3, 13, 9), datetime(2024, 3, 13, 23, 59), datetime(2024, 3, 11, 0, 0), datetime(2024, 3, 1))
+    assert _counts(activity_buckets(db, "day", 4, today=TODAY)) == [
+        (date(2024, 3, 10), 0), (date(2024, 3, 11), 1), (date(2024, 3, 12), 0), (date(2024, 3, 13), 2),
+    ]
+
+
+def test_weeks_start_on_monday(db):
+    _log(db, datetime(2024, 3, 11), datetime(2024, 3, 10, 22), datetime(2024, 3, 4, 1), datetime(2024, 3, 17))
+    assert _counts(activity_buckets(db, "week", 2, today=TODAY)) == [
+        (date(2024, 3, 4), 2), (date(2024, 3, 11), 2),
+    ]
+
+
+def test_months_cross_the_year_boundary(db):
+    _log(db, datetime(2023, 12, 31, 12), datetime(2024, 2, 29), datetime(2024, 3, 1))
+    assert _counts(activity_buckets(db, "month", 4, today=TODAY)) == [
+        (date(2023, 12, 1), 1), (date(2024, 1, 1), 0), (date(2024, 2, 1), 1), (date(2024, 3, 1), 1),
+    ]
+
+
+def test_unknown_granularity(db):
+    with pytest.raises(ValueError, match="granularity must be one of"):
+        activity_buckets(db, "year")
+
+
+def test_streak_counts_back_from_the_current_bucket():
+    assert streak([{"count": 3}, {"count": 0}, {"count": 1}, {"count": 2}]) == 2
+    assert streak([{"count": 3}, {"count": 0}]) == 0
+    assert streak([]) == 0
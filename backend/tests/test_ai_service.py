@@ -0,0 +1,64 @@
+import asyncio
+import json
+import time
+
+import httpx
+import pytest
+from groq import AsyncGroq
+
+from services import ai_service
+from services.llm_scheduler import LLMScheduler
+
+
+def _completion(content: str) -> dict:
+    return {
+        "id": "chatcmpl-1", "object": "chat.completion", "created": 0, "model": ai_service.MODEL,
+        "choices": [{"index": 0, "finish_reason": "stop", "message": {"role": "assistant", "content": content}}],
+        "usage": {"prompt_tokens": 10, "completion_tokens": 5, "total_tokens": 15},
+    }
+
+
+@pytest.fixture
+def groq_api(monkeypatch):
+    """A Groq client over an in-process transport that answers every call after 100 ms"""
+    requests = []
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(json.loads(request.content))
+        await asyncio.sleep(0.1)
+        return httpx.Response(200, json=_completion('```json\n{"title": "Backend Engineer"}\n```'))
+
+    client = AsyncGroq(api_key="test", http_client=httpx.AsyncClient(transport=httpx.MockTransport(handler)), max_retries=0)
+    monkeypatch.setattr(ai_service, "groq_client", client)
+    monkeypatch.setattr(ai_service, "scheduler", LLMScheduler(rpm=0, tpm=0))
+    return requests
+
+
+def test_parse_json_strips_code_fences():
+    assert ai_service._parse_json('```json\n{"a": 1}\n```') == {"a": 1}
+    assert ai_service._parse_json('Sure!\n```\n{"a": 2}\n```') == {"a": 2}
+    assert ai_service._parse_json('{"a": 3}') == {"a": 3}
+
+
+def test_calls_run_concurrently_without_blocking_the_loop(groq_api):
+    async def scenario():
+        started = time.perf_counter()
+        results = await asyncio.gather(*(ai_service.generate_jd("Backend", "Eng", "APIs") for _ in range(5)))
+        return results, time.perf_counter() - started
+
+    results, elapsed = asyncio.run(scenario())
+    assert results == [{"title": "Backend Engineer"}] * 5
+    assert elapsed < 0.4  # five 100 ms calls overlapped, not queued one after another
+    assert len(groq_api) == 5 and groq_api[0]["model"] == ai_service.MODEL
+
+
+def test_api_failure_returns_the_fallback_shape(monkeypatch):
+    async def handler(request):
+        return httpx.Response(400, json={"error": {"message": "bad request"}})
+
+    client = AsyncGroq(api_key="test", http_client=httpx.AsyncClient(transport=httpx.MockTransport(handler)), max_retries=0)
+    monkeypatch.setattr(ai_service, "groq_client", client)
+    monkeypatch.setattr(ai_service, "scheduler", LLMScheduler(rpm=0, tpm=0))
+
+    result = asyncio.run(ai_service.compare_candidates([], "JD"))
+    assert result["ranking"] == [] and result["comparison_summary"].startswith("Error:")
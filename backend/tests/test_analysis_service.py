@@ -0,0 +1,107 @@
+import asyncio
+
+import pytest
+
+from database import ActivityLog, Candidate
+from services import analysis_service
+from services.prescreen_service import PRESCREENED_OUT
+from tests.factories import make_jd
+
+RESUMES = {
+    "ana.pdf": "Python FastAPI PostgreSQL Kubernetes backend engineer",
+    "ben.pdf": "Python SQL APIs",
+    "broken.pdf": "",
+    "cai.pdf": "Watercolour painting and pottery classes",
+}
+
+
+@pytest.fixture
+def pipeline(monkeypatch):
+    """Fake extraction + AI: text comes from RESUMES, every AI call is recorded with its lane"""
+    calls, in_flight, peak = [], [0], [0]
+
+    async def extract(filename, file_bytes):
+        return RESUMES[filename]
+
+    async def analyze(resume_text, jd_text, lane):
+        calls.append(lane)
+        in_flight[0] += 1
+        peak[0] = max(peak[0], in_flight[0])
+        await asyncio.sleep(0.01 * (len(calls) % 3))  # finish out of order
+        in_flight[0] -= 1
+        if "SQL" in resume_text and "FastAPI" not in resume_text:
+            raise RuntimeError("AI unavailable")
+        return {"candidate_name": resume_text.split()[0], "overall_match_score": 88, "recommendation": "RECOMMENDED"}
+
+    monkeypatch.setattr(analysis_service, "extract_text_async", extract)
+    monkeypatch.setattr(analysis_service, "analyze_resume", analyze)
+    return {"calls": calls, "peak": peak}
+
+
+def _files():
+    return [(name, b"") for name in RESUMES]
+
+
+def test_bulk_analyze_reports_in_upload_order_and_isolates_failures(db, pipeline):
+    jd = make_jd(db, requirements="Python FastAPI Kubernetes")
+    summary = asyncio.run(analysis_service.bulk_analyze(db, jd, _files(), concurrency=2))
+
+    assert [r["filename"] for r in summary["results"]] == ["ana.pdf", "cai.pdf"]
+    assert summary["errors"] == [
+        {"file": "ben.pdf", "error": "AI unavailable"},
+        {"file": "broken.pdf", "error": "Could not extract text"},
+    ]
+    assert (summary["processed"], summary["failed"], summary["prescreened_out"]) == (2, 2, 0)
+    assert pipeline["peak"][0] <= 2
+    assert set(pipeline["calls"]) == {analysis_service.BULK}
+    assert db.query(Candidate).count() == db.query(ActivityLog).count() == 2
+
+
+def test_one_unsaveable_row_does_not_sink_its_batch(db, pipeline, monkeypatch):
+    real_added = analysis_service.stats_service.on_candidate_added
+
+    def on_candidate_added(db, c):
+        if c.name == "Watercolour":
+            raise ValueError("bad row")
+        real_added(db, c)
+
+    monkeypatch.setattr(analysis_service.stats_service, "on_candidate_added", on_candidate_added)
+    jd = make_jd(db)
+    files = [("ana.pdf", b""), ("cai.pdf", b""), ("ana.pdf", b"")]
+    summary = asyncio.run(analysis_service.bulk_analyze(db, jd, files))
+
+    assert (summary["processed"], summary["failed"]) == (2, 1)
+    assert summary["errors"] == [{"file": "cai.pdf", "error": "Save failed: bad row"}]
+    assert db.query(Candidate).count() == db.query(ActivityLog).count() == 2
+    assert len(pipeline["calls"]) == 3  # nothing was re-analyzed
+
+
+def test_prescreened_resumes_skip_the_ai(db, pipeline):
+    jd = make_jd(db, requirements="Python FastAPI Kubernetes")
+    summary = asyncio.run(analysis_service.bulk_analyze(db, jd, _files(), prescreen_threshold=10))
+
+    screened = [r for r in summary["results"] if r["recommendation"] == PRESCREENED_OUT]
+    assert [r["filename"] for r in screened] == ["cai.pdf"]
+    assert screened[0]["relevance_score"] < 10
+    assert summary["prescreened_out"] == 1
+    assert len(pipeline["calls"]) == 2  # ana and ben only
+
+
+def test_stream_yields_committed_results_then_a_summary(db, pipeline):
+    jd = make_jd(db)
+
+    async def collect():
+        return [event async for event in analysis_service.stream_bulk_analyze(jd.id, _files(), concurrency=4)]
+
+    events = asyncio.run(collect())
+    assert [e["type"] for e in events][-1] == "summary"
+    assert events[-1] == {"type": "summary", "processed": 2, "failed": 2, "prescreened_out": 0, "total": 4}
+    for event in events[:-1]:
+        if event["type"] == "result":
+            assert db.get(Candidate, event["id"]) is not None
+
+
+def test_resolve_concurrency_is_clamped():
+    assert analysis_service.resolve_concurrency(None) == analysis_service.BULK_CONCURRENCY
+    assert analysis_service.resolve_concurrency(-3) == 1
+    assert analysis_service.resolve_concurrency(10_000) == analysis_service.BULK_MAX_CONCURRENCY
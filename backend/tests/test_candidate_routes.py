@@ -0,0 +1,90 @@
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from database import Candidate
+from routes import candidate_routes
+from tests.factories import make_jd, make_candidate
+
+
+@pytest.fixture
+def client():
+    app = FastAPI()
+    app.include_router(candidate_routes.router)
+    with TestClient(app) as c:
+        yield c
+
+
+@pytest.fixture
+def seeded(db):
+    jd = make_jd(db, title="Platform Engineer")
+    for name, score in [("ana", 91), ("ben", 75), ("cai", 75), ("dev", 40), ("eli", 62)]:
+        make_candidate(db, jd, name=name, score=score, matched_skills='["Go"]', resume_text=f"{name} resume")
+    return jd
+
+
+def test_default_rows_join_the_jd_title_and_skip_heavy_text(client, seeded):
+    rows = client.get("/api/candidates", params={"sort_by": "match_score"}).json()
+    assert [r["name"] for r in rows] == ["ana", "cai", "ben", "eli", "dev"]
+    assert rows[0]["jd_title"] == "Platform Engineer"
+    assert rows[0]["matched_skills"] == ["Go"]
+    assert "resume_text" not in rows[0] and "experience_analysis" not in rows[0]
+
+    full = client.get("/api/candidates", params={"include_text": True}).json()
+    assert {r["resume_text"] for r in full} == {f"{n} resume" for n in ("ana", "ben", "cai", "dev", "eli")}
+
+
+def test_field_selection(client, seeded):
+    rows = client.get("/api/candidates", params={"fields": "match_score,name", "min_score": 70}).json()
+    assert all(list(r) == ["id", "match_score", "name"] for r in rows)
+    assert len(rows) == 3
+
+    bad = client.get("/api/candidates", params={"fields": "name,salary"})
+    assert bad.status_code == 400 and "salary" in bad.json()["detail"]
+
+
+@pytest.mark.parametrize("order", ["asc", "desc"])
+def test_cursor_pages_match_the_unpaged_list(client, db, seeded, order):
+    db.query(Candidate).filter(Candidate.name.in_(["ben", "dev"])).update({"match_score": None})
+    db.commit()
+    params = {"sort_by": "match_score", "sort_order": order, "fields": "name"}
+    expected = [r["name"] for r in client.get("/api/candidates", params=params).json()]
+
+    names, cursor = [], None
+    while True:
+        response = client.get("/api/candidates", params={**params, "limit": 2, **({"cursor": cursor} if cursor else {})})
+        names += [r["name"] for r in response.json()]
+        cursor = response.headers.get("x-next-cursor")
+        if not cursor:
+            break
+    assert names == expected and len(names) == 5
+    assert (names[:2] if order == "asc" else names[-2:]) in (["ben", "dev"], ["dev", "ben"])
+
+
+def test_malformed_cursor_is_a_400(client, seeded):
+    assert client.get("/api/candidates", params={"limit": 2, "cursor": "%%%"}).status_code == 400
+
+
+@pytest.mark.parametrize("sort_by", ["resume_text", "experience_analysis", "overall_summary", "rejection_reason", "salary"])
+def test_only_scalar_columns_can_be_sorted_on(client, seeded, sort_by):
+    response = client.get("/api/candidates", params={"sort_by": sort_by, "limit": 2})
+    assert response.status_code == 400 and "sort_by" in response.json()["detail"]
+
+
+def test_csv_export_streams_every_row_in_bounded_chunks(db, seeded, monkeypatch):
+    monkeypatch.setattr(candidate_routes, "EXPORT_CHUNK_ROWS", 2)
+    other = make_jd(db, title="Elsewhere")
+    make_candidate(db, other, name="zed", score=99)
+
+    chunks = list(candidate_routes._export_csv_chunks(seeded.id))
+    lines = "".join(chunks).splitlines()
+    assert lines[0] == ",".join(h for h, _ in candidate_routes.EXPORT_COLUMNS)
+    assert len(lines) == 6 and not any(line.startswith("zed,") for line in lines)
+    assert len(chunks) == 3  # header + 2 rows, 2 rows, the last row
+
+
+def test_csv_export_endpoint(client, seeded):
+    response = client.get("/api/candidates/export/csv")
+    assert response.headers["content-type"].startswith("text/csv")
+    assert "attachment" in response.headers["content-disposition"]
+    assert len(response.text.splitlines()) == 6
@@ -0,0 +1,75 @@
+import gzip
+
+import pytest
+from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse, StreamingResponse
+from fastapi.testclient import TestClient
+
+from services import compression
+from services.compression import CompressionMiddleware
+
+BIG = "resume " * 500
+
+
+@pytest.fixture
+def client():
+    app = FastAPI()
+    app.add_middleware(CompressionMiddleware, minimum_size=100)
+
+    @app.get("/big")
+    def big():
+        return {"text": BIG}
+
+    @app.get("/small")
+    def small():
+        return {"ok": True}
+
+    @app.get("/stream")
+    def stream():
+        return StreamingResponse((f'{{"n":{i}}}\n' for i in range(50)), media_type="application/x-ndjson")
+
+    @app.get("/events")
+    def events():
+        return StreamingResponse(iter(["data: 1\n\n"] * 50), media_type="text/event-stream")
+
+    @app.get("/binary")
+    def binary():
+        return PlainTextResponse(BIG, media_type="application/pdf")
+
+    with TestClient(app) as c:
+        yield c
+
+
+def _raw(client, path, encoding):
+    with client.stream("GET", path, headers={"Accept-Encoding": encoding}) as response:
+        return response, b"".join(response.iter_raw())
+
+
+def test_gzip_round_trip(client):
+    response, body = _raw(client, "/big", "gzip")
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.headers["vary"] == "Accept-Encoding"
+    assert int(response.headers["content-length"]) == len(body) < len(BIG)
+    assert BIG in gzip.decompress(body).decode()
+
+
+@pytest.mark.skipif(compression.brotli is None, reason="brotli not installed")
+def test_brotli_preferred_when_offered(client):
+    response, body = _raw(client, "/big", "gzip, br")
+    assert response.headers["content-encoding"] == "br"
+    assert BIG in compression.brotli.decompress(body).decode()
+
+
+def test_streamed_ndjson_is_compressed_chunk_by_chunk(client):
+    response, body = _raw(client, "/stream", "gzip")
+    assert response.headers["content-encoding"] == "gzip"
+    assert "content-length" not in response.headers
+    assert gzip.decompress(body).decode().splitlines()[-1] == '{"n":49}'
+
+
+@pytest.mark.parametrize("path,encoding", [
+    ("/small", "gzip"), ("/events", "gzip"), ("/binary", "gzip"), ("/big", "identity"),
+])
+def test_left_uncompressed(client, path, encoding):
+    response, _ = _raw(client, path, encoding)
+    assert "content-encoding" not in response.headers
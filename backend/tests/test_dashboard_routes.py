@@ -0,0 +1,27 @@
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from routes import dashboard_routes
+from services import stats_service
+
+
+@pytest.fixture
+def client():
+    app = FastAPI()
+    app.include_router(dashboard_routes.router)
+    with TestClient(app) as c:
+        yield c
+
+
+@pytest.mark.parametrize("width,status", [(1, 200), (12.5, 200), (100, 200), (0.05, 422), (0, 422), (101, 422)])
+def test_bin_width_is_bounded(client, db, width, status):
+    response = client.get("/api/dashboard/stats", params={"bin_width": width})
+    assert response.status_code == status
+    if status == 200:
+        assert len(response.json()["score_distribution"]) == -(-100 // width)
+
+
+def test_score_bins_refuses_too_many_columns():
+    with pytest.raises(ValueError, match="at most 100"):
+        stats_service.score_bins(0.5)
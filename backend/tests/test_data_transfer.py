@@ -0,0 +1,105 @@
+import json
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from database import ActivityLog, Candidate, ImportCheckpoint, JobDescription
+from routes import data_routes
+from services import data_transfer
+from tests.factories import make_candidate, make_jd
+
+
+def _export(db) -> list:
+    jd = make_jd(db)
+    make_candidate(db, jd, name="Ada", score=91.5)
+    make_candidate(db, jd, name="Grace", score=77)
+    db.add(ActivityLog(action="jd_created", entity_type="jd", entity_id=jd.id, details="Created"))
+    db.commit()
+    return [line.encode() for chunk in data_transfer.export_lines(data_transfer.ENTITY_ORDER) for line in chunk.splitlines()]
+
+
+def _wipe(db):
+    for model in (ActivityLog, Candidate, JobDescription):
+        db.query(model).delete()
+    db.commit()
+
+
+def test_round_trip_and_idempotent_reimport(db):
+    lines = _export(db)
+    original = {c.name: c.match_score for c in db.query(Candidate)}
+    _wipe(db)
+
+    first = data_transfer.import_lines(db, lines, "first")
+    assert (first.status, first.rows_inserted, first.rows_skipped) == ("completed", 4, 0)
+    assert {c.name: c.match_score for c in db.query(Candidate)} == original
+
+    again = data_transfer.import_lines(db, lines, "again")
+    assert (again.status, again.rows_inserted, again.rows_skipped) == ("completed", 0, 4)
+
+
+def test_bad_lines_are_recorded_not_fatal(db):
+    jd = {"type": "jd", "id": 7, "title": "QA", "description": "Test things"}
+    lines = [
+        json.dumps({"type": ["jd"], "id": 1}),  # unhashable type
+        b"{not json",
+        json.dumps({"type": "candidate", "id": 1, "jd_id": 999, "name": "Orphan", "resume_filename": "o.pdf"}),
+        json.dumps(jd),
+    ]
+    checkpoint = data_transfer.import_lines(db, lines, "bad-lines")
+
+    assert (checkpoint.status, checkpoint.rows_inserted, checkpoint.rows_invalid) == ("completed", 1, 3)
+    assert [e["line"] for e in json.loads(checkpoint.errors)] == [1, 2, 3]
+    assert db.get(JobDescription, 7).title == "QA"
+
+
+def test_id_collisions_with_different_data_stop_the_import(db):
+    lines = _export(db)
+    jd = db.query(JobDescription).one()
+    jd.title = "Someone else's JD"
+    db.commit()
+
+    with pytest.raises(data_transfer.ImportConflict):
+        data_transfer.import_lines(db, lines, "collide")
+
+    db.expire_all()
+    checkpoint = db.query(ImportCheckpoint).filter(ImportCheckpoint.import_id == "collide").one()
+    assert checkpoint.status == "failed"
+    assert any("job_descriptions id" in e["error"] and e["line"] == 1 for e in json.loads(checkpoint.errors))
+    assert db.query(JobDescription).one().title == "Someone else's JD"  # not overwritten
+
+
+def test_interrupted_import_resumes_after_the_last_batch(db, monkeypatch):
+    monkeypatch.setattr(data_transfer, "TRANSFER_BATCH_ROWS", 2)
+    lines = _export(db)
+    _wipe(db)
+
+    def cut_off(after):
+        for i, line in enumerate(lines):
+            if i == after:
+                raise ConnectionError("upload dropped")
+            yield line
+
+    with pytest.raises(ConnectionError):
+        data_transfer.import_lines(db, cut_off(3), "resume-me")
+    db.expire_all()
+    assert db.query(ImportCheckpoint).filter(ImportCheckpoint.import_id == "resume-me").one().lines_done == 2
+
+    done = data_transfer.import_lines(db, lines, "resume-me")
+    assert (done.status, done.rows_inserted, done.rows_skipped) == ("completed", 4, 0)
+
+
+def test_default_import_id_follows_the_content_not_the_name_and_size(db):
+    app = FastAPI()
+    app.include_router(data_routes.router)
+    first = json.dumps({"type": "jd", "id": 1, "title": "QA", "description": "Test things"}).encode()
+    second = json.dumps({"type": "jd", "id": 2, "title": "QA", "description": "Test things"}).encode()
+    assert len(first) == len(second)
+
+    with TestClient(app) as client:
+        for body in (first, second):
+            response = client.post("/api/data/import", files={"file": ("export.ndjson", body)})
+            assert response.status_code == 200 and response.json()["rows_inserted"] == 1
+
+    assert {jd.id for jd in db.query(JobDescription)} == {1, 2}
+    assert db.query(ImportCheckpoint).count() == 2
@@ -0,0 +1,48 @@
+import threading
+
+import pytest
+from sqlalchemy import text
+
+import database
+from database import SessionLocal, create_db_engine, engine
+from tests.factories import make_jd
+
+
+def test_sqlite_connections_get_the_tuning_pragmas():
+    with engine.connect() as conn:
+        pragma = lambda name: conn.execute(text(f"PRAGMA {name}")).scalar()
+        assert pragma("journal_mode") == "wal"
+        assert pragma("busy_timeout") == database.SQLITE_BUSY_TIMEOUT_MS
+        assert pragma("cache_size") == -database.SQLITE_CACHE_SIZE_MB * 1024
+        assert pragma("synchronous") == 1  # NORMAL
+
+
+def test_server_urls_get_a_sized_pool():
+    pytest.importorskip("psycopg2")
+    server = create_db_engine("postgresql://swathi@localhost/swathi")  # no connection is opened
+    assert server.pool.size() == database.DB_POOL_SIZE
+    assert server.pool._max_overflow == database.DB_MAX_OVERFLOW
+    assert server.pool._pre_ping
+
+
+def test_readers_are_not_blocked_by_an_open_write(db):
+    make_jd(db)
+    writer = SessionLocal()
+    writer.execute(text("UPDATE job_descriptions SET title = 'Locked'"))  # holds the write lock, uncommitted
+    try:
+        seen = []
+
+        def read():
+            session = SessionLocal()
+            try:
+                seen.append(session.execute(text("SELECT title FROM job_descriptions")).scalar())
+            finally:
+                session.close()
+
+        reader = threading.Thread(target=read)
+        reader.start()
+        reader.join(timeout=2)
+        assert seen == ["Backend Engineer"]  # WAL: the reader sees the last committed value at once
+    finally:
+        writer.rollback()
+        writer.close()
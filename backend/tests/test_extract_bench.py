@@ -0,0 +1,43 @@
+import tracemalloc
+from io import BytesIO
+
+import docx
+
+from services import extract_bench
+
+
+def _docx(text: str) -> bytes:
+    document = docx.Document()
+    document.add_paragraph(text)
+    buffer = BytesIO()
+    document.save(buffer)
+    return buffer.getvalue()
+
+
+def test_timing_runs_without_tracemalloc(monkeypatch):
+    tracing = []
+
+    def extract(data, max_pages):
+        tracing.append(tracemalloc.is_tracing())
+        return "x" * 10
+
+    monkeypatch.setattr(extract_bench, "resolve_backend", lambda kind, name: extract)
+    result = extract_bench.bench_backend("pdf", "fake", [("a.pdf", b""), ("b.pdf", b"")], repeat=3, max_pages=5)
+
+    assert tracing == [False] * 6 + [True] * 2  # three timed passes, then one traced pass
+    assert not tracemalloc.is_tracing()
+    assert (result["chars"], result["failures"]) == (20, 0)
+
+
+def test_bench_real_docx_backend():
+    files = [("one.docx", _docx("Python developer")), ("broken.docx", b"not a docx")]
+    result = extract_bench.bench_backend("docx", "python-docx", files, repeat=2, max_pages=5)
+    assert (result["chars"], result["failures"]) == (len("Python developer"), 1)
+    assert result["peak_mb"] > 0
+
+
+def test_main_reports_heap_caveat(tmp_path, capsys):
+    (tmp_path / "cv.docx").write_bytes(_docx("Go engineer"))
+    assert extract_bench.main([str(tmp_path), "--repeat", "1"]) == 0
+    out = capsys.readouterr().out
+    assert "python-docx" in out and "Python-heap" in out and "not included" in out
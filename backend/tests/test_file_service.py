@@ -0,0 +1,85 @@
+import asyncio
+import time
+
+import pytest
+
+from services import file_service
+
+
+def _pdf(page_texts) -> bytes:
+    """A minimal PDF with one line of Helvetica text per page"""
+    n = len(page_texts)
+    kids = " ".join(f"{3 + 2 * i} 0 R" for i in range(n))
+    objects = [b"<< /Type /Catalog /Pages 2 0 R >>", f"<< /Type /Pages /Kids [{kids}] /Count {n} >>".encode()]
+    for i, text in enumerate(page_texts):
+        stream = f"BT /F1 12 Tf 72 720 Td ({text}) Tj ET".encode()
+        objects.append(
+            f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] /Contents {4 + 2 * i} 0 R "
+            f"/Resources << /Font << /F1 {3 + 2 * n} 0 R >> >> >>".encode()
+        )
+        objects.append(b"<< /Length %d >>\nstream\n%s\nendstream" % (len(stream), stream))
+    objects.append(b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>")
+
+    out, offsets = bytearray(b"%PDF-1.4\n"), []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(out))
+        out += b"%d 0 obj\n%s\nendobj\n" % (number, body)
+    xref = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    out += b"".join(b"%010d 00000 n \n" % offset for offset in offsets)
+    out += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref)
+    return bytes(out)
+
+
+def test_unparseable_file_extracts_empty_text():
+    assert file_service.extract_text_from_pdf(b"not a pdf") == ""
+
+
+@pytest.mark.parametrize("backend", file_service.available_backends("pdf"))
+def test_max_pages_stops_before_the_next_page(backend):
+    pdf = _pdf(["Alpha page", "Bravo page", "Charlie page"])
+    assert "Charlie" in file_service.extract_text_from_pdf(pdf, max_pages=3, backend=backend)
+
+    text = file_service.extract_text_from_pdf(pdf, max_pages=2, backend=backend)
+    assert "Alpha" in text and "Bravo" in text
+    assert "Charlie" not in text
+
+
+def test_backend_configuration_errors_propagate(monkeypatch):
+    with pytest.raises(ValueError, match="Unknown pdf backend"):
+        file_service.extract_text_from_pdf(b"%PDF-1.4", backend="nope")
+
+    monkeypatch.setattr(file_service, "DOCX_BACKEND", "nope")
+    with pytest.raises(ValueError, match="Unknown docx backend"):
+        file_service.validate_backends()
+
+
+def test_unsupported_extension_fails_before_the_pool():
+    with pytest.raises(ValueError, match="Unsupported file type"):
+        asyncio.run(file_service.extract_text_async("resume.txt", b"hello"))
+
+
+@pytest.mark.skipif(file_service.EXTRACT_WORKERS < 1, reason="needs the process pool")
+def test_timeout_kills_the_hung_worker_and_recycles_the_pool(monkeypatch):
+    monkeypatch.setattr(file_service, "EXTRACT_TIMEOUT_SECONDS", 2)
+
+    async def scenario():
+        hung = asyncio.create_task(file_service.run_in_pool(time.sleep, 60, label="hung.pdf"))
+        await asyncio.sleep(1)
+        executor, generation = file_service._get_executor()
+        workers = list(executor._processes.values())
+        assert workers
+
+        with pytest.raises(ValueError, match="Timed out extracting text from hung.pdf"):
+            await hung
+        for process in workers:
+            process.join(timeout=5)
+            assert not process.is_alive()
+
+        assert file_service._generation == generation + 1
+        assert await file_service.run_in_pool(abs, -3) == 3  # a fresh pool serves the next file
+
+    try:
+        asyncio.run(scenario())
+    finally:
+        file_service.shutdown_extractor()
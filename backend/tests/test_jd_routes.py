@@ -0,0 +1,56 @@
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from routes import dashboard_routes, jd_routes
+from services.analysis_service import save_analyzed_candidates
+from services.prescreen_service import prescreened_analysis
+from services.stats_service import pipeline_totals
+from tests.factories import make_jd, make_candidate
+
+
+@pytest.fixture
+def client():
+    app = FastAPI()
+    app.include_router(jd_routes.router)
+    with TestClient(app) as c:
+        yield c
+
+
+def test_list_carries_per_jd_aggregates(client, db):
+    backend = make_jd(db)
+    make_jd(db, title="Empty", status="paused")
+    make_candidate(db, backend, name="ana", score=90)
+    make_candidate(db, backend, name="ben", score=71, status="shortlisted")
+    make_candidate(db, backend, name="cai", score=0, recommendation="PRE-SCREENED OUT")
+
+    rows = {r["title"]: r for r in client.get("/api/jds").json()}
+    assert (rows["Backend Engineer"]["candidate_count"], rows["Backend Engineer"]["shortlisted_count"]) == (3, 1)
+    assert rows["Backend Engineer"]["avg_score"] == 80.5  # the screened-out resume has no real score
+    assert (rows["Empty"]["candidate_count"], rows["Empty"]["shortlisted_count"], rows["Empty"]["avg_score"]) == (0, 0, 0)
+
+    paused = client.get("/api/jds", params={"status": "paused"}).json()
+    assert [r["title"] for r in paused] == ["Empty"]
+
+
+def test_detail_uses_the_same_aggregates(client, db):
+    jd = make_jd(db)
+    make_candidate(db, jd, name="ana", score=90)
+    make_candidate(db, jd, name="ben", score=70)
+
+    detail = client.get(f"/api/jds/{jd.id}").json()
+    assert (detail["candidate_count"], detail["avg_score"]) == (2, 80.0)
+    assert client.get("/api/jds/999").status_code == 404
+
+
+def test_jd_manager_and_dashboard_agree_on_totals(client, db):
+    jd = make_jd(db)
+    save_analyzed_candidates(db, jd, [
+        {"filename": "ana.pdf", "resume_text": "text", "analysis": {"candidate_name": "ana", "overall_match_score": 90}},
+        {"filename": "cai.pdf", "resume_text": "text", "analysis": prescreened_analysis("cai.pdf", "", 2.0, 20)},
+    ])
+
+    [row] = client.get("/api/jds").json()
+    dashboard = dashboard_routes.get_dashboard_stats(jd_id=jd.id, date_from=None, date_to=None, bin_width=20, db=db)
+    assert row["candidate_count"] == dashboard["total_candidates"] == pipeline_totals(db, jd.id)["total"] == 2
+    assert row["avg_score"] == dashboard["avg_score"] == 90.0
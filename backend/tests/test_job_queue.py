@@ -0,0 +1,96 @@
+import asyncio
+from datetime import datetime, timedelta
+
+from database import AnalysisJobItem, Candidate
+from services import job_queue
+from tests.factories import make_jd
+
+
+def _enqueue(db, files=2):
+    jd = make_jd(db)
+    return job_queue.enqueue_job(db, jd.id, [(f"r{i}.pdf", b"%PDF") for i in range(files)])
+
+
+def _item(db, item_id) -> AnalysisJobItem:
+    db.expire_all()
+    return db.get(AnalysisJobItem, item_id)
+
+
+def test_claim_takes_a_lease(db):
+    _enqueue(db)
+    item_id = job_queue._claim_next(db)
+    item = _item(db, item_id)
+    assert item.status == "running"
+    assert item.claimed_by == job_queue.WORKER_ID
+    assert item.lease_expires_at > datetime.utcnow()
+
+
+def test_recovery_leaves_live_leases_alone(db):
+    _enqueue(db)
+    item_id = job_queue._claim_next(db)
+    assert job_queue.recover_interrupted() == 0  # e.g. a second uvicorn worker starting up
+    assert _item(db, item_id).status == "running"
+
+
+def test_recovery_requeues_expired_and_legacy_claims(db):
+    job = _enqueue(db)
+    expired, legacy = (item.id for item in job.items)
+    db.query(AnalysisJobItem).filter(AnalysisJobItem.id == expired).update({
+        "status": "running", "claimed_by": "dead-host:1:x", "lease_expires_at": datetime.utcnow() - timedelta(seconds=1),
+    })
+    db.query(AnalysisJobItem).filter(AnalysisJobItem.id == legacy).update({"status": "running"})
+    db.commit()
+
+    assert job_queue.recover_interrupted() == 2
+    for item_id in (expired, legacy):
+        item = _item(db, item_id)
+        assert (item.status, item.claimed_by, item.lease_expires_at) == ("pending", None, None)
+
+
+def test_release_claims_only_returns_our_items(db):
+    job = _enqueue(db)
+    ours, theirs = (item.id for item in job.items)
+    job_queue._claim_next(db)
+    db.query(AnalysisJobItem).filter(AnalysisJobItem.id == theirs).update({
+        "status": "running", "claimed_by": "other:2:y", "lease_expires_at": datetime.utcnow() + timedelta(minutes=1),
+    })
+    db.commit()
+
+    assert job_queue.release_claims() == 1
+    assert _item(db, ours).status == "pending"
+    assert _item(db, theirs).status == "running"
+
+
+def _analyzed(name):
+    async def fake(filename, file_bytes, jd_text, prescreener=None):
+        return {"filename": filename, "resume_text": "text", "analysis": {"candidate_name": name, "overall_match_score": 70}}
+    return fake
+
+
+def test_process_item_saves_and_clears_the_lease(db, monkeypatch):
+    monkeypatch.setattr(job_queue, "extract_and_analyze", _analyzed("Ada"))
+    _enqueue(db, files=1)
+    item_id = job_queue._claim_next(db)
+
+    asyncio.run(job_queue._process_item(item_id))
+
+    item = _item(db, item_id)
+    assert (item.status, item.claimed_by, item.lease_expires_at) == ("done", None, None)
+    assert db.get(Candidate, item.candidate_id).name == "Ada"
+
+
+def test_process_item_does_not_save_after_losing_the_lease(db, monkeypatch):
+    async def stolen(filename, file_bytes, jd_text, prescreener=None):
+        # Meanwhile the lease lapsed and another worker re-claimed the item
+        db.query(AnalysisJobItem).filter(AnalysisJobItem.id == item_id).update({"claimed_by": "other:2:y"})
+        db.commit()
+        return await _analyzed("Ada")(filename, file_bytes, jd_text)
+
+    monkeypatch.setattr(job_queue, "extract_and_analyze", stolen)
+    _enqueue(db, files=1)
+    item_id = job_queue._claim_next(db)
+
+    asyncio.run(job_queue._process_item(item_id))
+
+    assert db.query(Candidate).count() == 0
+    assert _item(db, item_id).claimed_by == "other:2:y"
@@ -0,0 +1,79 @@
+import asyncio
+
+import pytest
+from sqlalchemy.exc import OperationalError
+
+from database import LLMCacheEntry
+from services import ai_service, llm_cache
+
+
+@pytest.fixture(autouse=True)
+def _fresh_touches():
+    llm_cache._touches.clear()
+    yield
+    llm_cache._touches.clear()
+
+
+def _entry(db, key) -> LLMCacheEntry:
+    db.expire_all()
+    return db.query(LLMCacheEntry).filter(LLMCacheEntry.cache_key == key).one()
+
+
+def test_make_key_separates_parts():
+    assert llm_cache.make_key("ab", "c") != llm_cache.make_key("a", "bc")
+    assert llm_cache.normalize_text(" a \n\t b ") == "a b"
+
+
+def test_round_trip_and_miss(db):
+    llm_cache.put("k", {"score": 1}, model="m")
+    assert llm_cache.get("k") == {"score": 1}
+    assert llm_cache.get("missing") is None
+
+
+def test_hits_are_buffered_then_flushed_in_one_write(db):
+    llm_cache.put("k", {"score": 1})
+    for _ in range(3):
+        llm_cache.get("k")
+    assert _entry(db, "k").hits == 0  # reads only so far
+
+    llm_cache.flush_touches()
+    assert _entry(db, "k").hits == 3
+
+
+def test_batch_size_triggers_a_flush(db, monkeypatch):
+    monkeypatch.setattr(llm_cache, "LLM_CACHE_TOUCH_BATCH", 2)
+    llm_cache.put("a", {})
+    llm_cache.put("b", {})
+    llm_cache.get("a")
+    llm_cache.get("b")
+    assert (_entry(db, "a").hits, _entry(db, "b").hits) == (1, 1)
+
+
+def test_database_errors_count_as_misses(monkeypatch):
+    def locked(key):
+        raise OperationalError("SELECT", {}, Exception("database is locked"))
+
+    monkeypatch.setattr(llm_cache, "get", locked)
+    assert asyncio.run(llm_cache.aget("k")) is None
+
+
+def test_analyze_resume_serves_hits_and_survives_cache_errors(db, monkeypatch):
+    calls = []
+
+    async def fake_groq(system, user, **kw):
+        calls.append(user)
+        return '{"candidate_name": "Ada", "overall_match_score": 88}'
+
+    monkeypatch.setattr(ai_service, "_call_groq", fake_groq)
+    first = asyncio.run(ai_service.analyze_resume("Ada Lovelace\nSkills\nPython", "Backend Engineer"))
+    second = asyncio.run(ai_service.analyze_resume("Ada Lovelace\nSkills\nPython", "Backend Engineer"))
+    assert first == second and first["candidate_name"] == "Ada"
+    assert len(calls) == 1
+
+    async def broken(*args, **kwargs):
+        raise OperationalError("SELECT", {}, Exception("database is locked"))
+
+    monkeypatch.setattr(llm_cache.asyncio, "to_thread", broken)
+    third = asyncio.run(ai_service.analyze_resume("Grace Hopper\nSkills\nCOBOL", "Backend Engineer"))
+    assert third["candidate_name"] == "Ada"  # analyzed anyway, just not cached
+    assert len(calls) == 2
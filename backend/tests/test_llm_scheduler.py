@@ -0,0 +1,122 @@
+import asyncio
+from types import SimpleNamespace
+
+import groq
+import httpx
+import pytest
+
+from services import llm_scheduler
+from services.llm_scheduler import BULK, INTERACTIVE, LLMScheduler, estimate_tokens
+
+
+def _error(cls, status, headers=None):
+    request = httpx.Request("POST", "https://api.groq.test/chat")
+    response = httpx.Response(status, headers=headers or {}, request=request)
+    return cls("boom", response=response, body=None)
+
+
+@pytest.fixture(autouse=True)
+def fast_backoff(monkeypatch):
+    monkeypatch.setattr(llm_scheduler, "LLM_BACKOFF_BASE_SECONDS", 0.01)
+    monkeypatch.setattr(llm_scheduler, "LLM_MAX_RETRIES", 3)
+
+
+def test_estimate_tokens():
+    assert estimate_tokens("") == 1
+    assert estimate_tokens("x" * 400) == 101
+
+
+def test_unlimited_scheduler_never_waits():
+    s = LLMScheduler(rpm=0, tpm=0)
+
+    async def scenario():
+        for _ in range(100):
+            await asyncio.wait_for(s.acquire(10_000, BULK), timeout=0.1)
+
+    asyncio.run(scenario())
+    assert s.stats()["lanes"][BULK]["granted"] == 100
+
+
+def test_interactive_lane_jumps_the_bulk_queue():
+    s = LLMScheduler(rpm=6000, tpm=0, reserve=0)  # refills 100 requests/s
+    order = []
+
+    async def call(name, lane):
+        await s.acquire(1, lane)
+        order.append(name)
+
+    async def scenario():
+        s.requests.level = 0
+        bulk = [asyncio.create_task(call(f"bulk{i}", BULK)) for i in range(3)]
+        await asyncio.sleep(0)
+        chat = asyncio.create_task(call("chat", INTERACTIVE))
+        await asyncio.gather(*bulk, chat)
+
+    asyncio.run(scenario())
+    assert order == ["chat", "bulk0", "bulk1", "bulk2"]
+
+
+def test_bulk_leaves_the_interactive_reserve():
+    s = LLMScheduler(rpm=10, tpm=0, reserve=0.5)
+
+    async def scenario():
+        for _ in range(5):
+            await asyncio.wait_for(s.acquire(1, BULK), timeout=0.1)
+        with pytest.raises(asyncio.TimeoutError):
+            await asyncio.wait_for(s.acquire(1, BULK), timeout=0.1)
+        await asyncio.wait_for(s.acquire(1, INTERACTIVE), timeout=0.1)
+
+    asyncio.run(scenario())
+
+
+def test_usage_settles_the_token_bucket():
+    s = LLMScheduler(rpm=0, tpm=1000)
+
+    async def call():
+        return SimpleNamespace(usage=SimpleNamespace(total_tokens=100))
+
+    asyncio.run(s.run(call, tokens=400))
+    assert s.stats()["tokens_available"] == pytest.approx(900, abs=1)
+
+
+def test_rate_limits_are_retried_and_pause_every_lane():
+    s = LLMScheduler(rpm=0, tpm=0)
+    attempts = []
+
+    async def call():
+        attempts.append(1)
+        if len(attempts) < 3:
+            raise _error(groq.RateLimitError, 429, {"retry-after": "0.05"})
+        return "ok"
+
+    assert asyncio.run(s.run(call, tokens=10)) == "ok"
+    lane = s.stats()["lanes"][INTERACTIVE]
+    assert (len(attempts), lane["retries"], lane["rate_limited"], lane["failed"]) == (3, 2, 2, 0)
+    assert s._paused_until > 0
+
+
+def test_client_errors_are_not_retried():
+    s = LLMScheduler(rpm=0, tpm=0)
+    attempts = []
+
+    async def call():
+        attempts.append(1)
+        raise _error(groq.BadRequestError, 400)
+
+    with pytest.raises(groq.BadRequestError):
+        asyncio.run(s.run(call, tokens=10, lane=BULK))
+    assert len(attempts) == 1
+    assert s.stats()["lanes"][BULK]["failed"] == 1
+
+
+def test_server_errors_give_up_after_max_retries():
+    s = LLMScheduler(rpm=0, tpm=0)
+    attempts = []
+
+    async def call():
+        attempts.append(1)
+        raise _error(groq.InternalServerError, 503)
+
+    with pytest.raises(groq.InternalServerError):
+        asyncio.run(s.run(call, tokens=10))
+    assert len(attempts) == llm_scheduler.LLM_MAX_RETRIES + 1
@@ -0,0 +1,64 @@
+import json
+
+import pytest
+from sqlalchemy import inspect, text
+
+import migrations
+from database import Base, create_db_engine, engine
+
+
+def test_test_database_is_at_the_latest_version():
+    with engine.begin() as conn:
+        assert migrations.current_version(conn) == max(v for v, _, _ in migrations.MIGRATIONS)
+    assert migrations.run_migrations() == []
+
+
+@pytest.fixture
+def legacy_engine(tmp_path, monkeypatch):
+    """A database shaped like one created before any migration existed"""
+    legacy = create_db_engine(f"sqlite:///{tmp_path / 'legacy.db'}")
+    Base.metadata.create_all(legacy)
+    with legacy.begin() as conn:
+        conn.execute(text("ALTER TABLE activity_logs DROP COLUMN category"))
+        conn.execute(text("ALTER TABLE analysis_job_items DROP COLUMN claimed_by"))
+        conn.execute(text("ALTER TABLE analysis_job_items DROP COLUMN lease_expires_at"))
+        conn.execute(text("INSERT INTO job_descriptions (id, title, description) VALUES (1, 'Backend', 'APIs')"))
+        conn.execute(
+            text("INSERT INTO candidates (id, jd_id, name, resume_filename, match_score, recommendation, status, "
+                 "matched_skills, missing_skills) VALUES (:id, 1, :name, 'cv.pdf', :score, :rec, 'new', :skills, '[]')"),
+            [
+                {"id": 1, "name": "ana", "score": 88, "rec": "RECOMMENDED", "skills": json.dumps(["Go", "SQL"])},
+                {"id": 2, "name": "ben", "score": 0, "rec": "PRE-SCREENED OUT", "skills": "[]"},
+            ],
+        )
+        conn.execute(
+            text("INSERT INTO activity_logs (action, entity_type, entity_id) VALUES (:a, 'candidate', 1)"),
+            [{"a": "resume_analyzed"}, {"a": "email_sent"}, {"a": "resume_prescreened"}, {"a": "viewed"}],
+        )
+    monkeypatch.setattr(migrations, "engine", legacy)
+    yield legacy
+    legacy.dispose()
+
+
+def test_upgrade_from_a_pre_migration_database(legacy_engine):
+    applied = migrations.run_migrations()
+    assert applied == [f"{v:03d}_{name}" for v, name, _ in sorted(migrations.MIGRATIONS, key=lambda m: m[0])]
+
+    with legacy_engine.connect() as conn:
+        logs = dict(conn.execute(text("SELECT action, category FROM activity_logs")).all())
+        assert logs == {
+            "resume_analyzed": "resumes_analyzed", "email_sent": "emails_sent",
+            "candidate_screened_out": "other", "viewed": "other",
+        }
+        skills = conn.execute(text("SELECT skill_key FROM candidate_skills ORDER BY skill_key")).scalars().all()
+        assert skills == ["go", "sql"]
+        counters = conn.execute(text(
+            "SELECT recommendation, candidate_count, score_sum FROM pipeline_counters ORDER BY recommendation"
+        )).all()
+        assert counters == [("PRE-SCREENED OUT", 1, 0.0), ("RECOMMENDED", 1, 88.0)]
+        job_columns = {c["name"] for c in inspect(conn).get_columns("analysis_job_items")}
+        assert {"claimed_by", "lease_expires_at"} <= job_columns
+        indexes = {i["name"] for i in inspect(conn).get_indexes("candidates")}
+        assert {name for name, table, _ in migrations.HOT_PATH_INDEXES if table == "candidates"} <= indexes
+
+    assert migrations.run_migrations() == []  # recorded, so never re-applied
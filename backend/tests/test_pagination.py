@@ -0,0 +1,61 @@
+from datetime import datetime
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from database import Candidate
+from services.pagination import encode_cursor, decode_cursor, keyset_filter, keyset_order
+from tests.factories import make_jd, make_candidate
+
+
+def test_cursor_round_trip():
+    when = datetime(2024, 5, 1, 9, 30, 15)
+    assert decode_cursor(encode_cursor(when, 7)) == (when, 7)
+    assert decode_cursor(encode_cursor(88.5, 3)) == (88.5, 3)
+    assert decode_cursor(encode_cursor(None, 12)) == (None, 12)
+
+
+@pytest.mark.parametrize("cursor", ["", "not-a-cursor", encode_cursor(1, 1)[:-3]])
+def test_malformed_cursor_raises(cursor):
+    with pytest.raises(ValueError, match="Invalid cursor"):
+        decode_cursor(cursor)
+
+
+def test_null_placement_is_explicit_in_sql():
+    asc = " ".join(str(c.compile(dialect=postgresql.dialect())) for c in keyset_order(Candidate.experience_years, Candidate.id, False))
+    desc = " ".join(str(c.compile(dialect=postgresql.dialect())) for c in keyset_order(Candidate.experience_years, Candidate.id, True))
+    assert "NULLS FIRST" in asc
+    assert "NULLS LAST" in desc
+
+
+def _walk(db, descending, page_size=2):
+    column = Candidate.experience_years
+    seen, cursor = [], None
+    while True:
+        query = db.query(Candidate.id, column.label("sort_key"))
+        if cursor:
+            query = query.filter(keyset_filter(column, Candidate.id, descending, *decode_cursor(cursor)))
+        rows = query.order_by(*keyset_order(column, Candidate.id, descending)).limit(page_size + 1).all()
+        seen += [r.id for r in rows[:page_size]]
+        if len(rows) <= page_size:
+            return seen
+        cursor = encode_cursor(rows[page_size - 1].sort_key, rows[page_size - 1].id)
+
+
+@pytest.mark.parametrize("descending", [False, True])
+def test_pages_cover_every_row_once_with_nulls(db, descending):
+    jd = make_jd(db)
+    for i, years in enumerate([3.0, None, 5.0, 3.0, None, 1.0, None]):
+        candidate = make_candidate(db, jd, name=f"c{i}")
+        # The column default would turn an explicit None into 0.0 on insert
+        db.query(Candidate).filter(Candidate.id == candidate.id).update({"experience_years": years})
+    db.commit()
+
+    full = [r.id for r in db.query(Candidate.id).order_by(*keyset_order(Candidate.experience_years, Candidate.id, descending))]
+    assert _walk(db, descending) == full
+    assert len(full) == 7
+
+    nulls = {c.id for c in db.query(Candidate).filter(Candidate.experience_years.is_(None))}
+    assert len(nulls) == 3
+    ends = full[-3:] if descending else full[:3]
+    assert set(ends) == nulls
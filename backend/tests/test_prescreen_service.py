@@ -0,0 +1,29 @@
+from database import JobDescription
+from services.prescreen_service import Prescreener, prescreened_analysis, tokenize, PRESCREENED_OUT
+
+JD = JobDescription(title="Backend", description="Build APIs in Python", requirements="Python, FastAPI, C++ and Node.js")
+
+
+def test_tokenize_keeps_tech_spellings_and_drops_stopwords():
+    assert tokenize("Strong C++, C# and Node.js skills with the team.") == ["c++", "c#", "node.js"]
+
+
+def test_relevant_resumes_outscore_unrelated_ones():
+    p = Prescreener(JD, threshold=20)
+    relevant = p.score("Senior Python developer: FastAPI services, Node.js tooling, some C++")
+    unrelated = p.score("Pastry chef with ten years in French bakeries")
+    assert 0 <= unrelated < 20 <= relevant <= 100
+    assert p.passes(relevant) and not p.passes(unrelated)
+
+
+def test_threshold_zero_disables_screening():
+    p = Prescreener(JD, threshold=0)
+    assert not p.enabled and p.passes(0.0)
+
+
+def test_prescreened_record_never_looks_like_an_analysis():
+    record = prescreened_analysis("jane_doe-cv.pdf", "mail: jane@example.com", relevance=3.5, threshold=20)
+    assert record["candidate_name"] == "jane doe cv"
+    assert record["candidate_email"] == "jane@example.com"
+    assert record["recommendation"] == PRESCREENED_OUT
+    assert "3.5/100" in record["overall_summary"]
@@ -0,0 +1,72 @@
+from services import prompt_builder as pb
+
+
+def test_clean_text_keeps_date_lines():
+    text = "Senior Engineer, Acme\n08/2019\n2019 / 2021\nLead Dev\n5\n12 of the team's services"
+    assert pb.clean_text(text) == text
+
+
+def test_clean_text_drops_marked_page_numbers():
+    text = "Jane Doe\nPage 3\nPython\nPage 3 of 5\nSQL\n3 of 5\nGo\n- 3 -\nRust\npage 2/4\n-----"
+    assert pb.clean_text(text) == "Jane Doe\nPython\nSQL\nGo\nRust"
+
+
+def test_clean_text_whitespace_duplicates_and_running_footers():
+    footer = "Jane Doe | jane@example.com | +1 555 0100"
+    text = f"Jane\t\t Doe\n\n\n\nSkills\nPython\nPython\n{footer}\nGo\n{footer}\nRust\n{footer}"
+    assert pb.clean_text(text) == f"Jane Doe\n\nSkills\nPython\n{footer}\nGo\nRust"
+
+
+def test_clean_text_drops_stock_phrases():
+    text = "CURRICULUM VITAE\nJane Doe\nReferences available upon request."
+    assert pb.clean_text(text) == "Jane Doe"
+
+
+def test_split_sections_by_heading():
+    blocks = pb.split_sections("Jane Doe\nWORK EXPERIENCE\nAcme\n## Skills:\nPython\nHobbies & Interests\nChess")
+    assert [(b["name"], b["priority"]) for b in blocks] == [
+        ("header", 0), ("experience", 0), ("skills", 0), ("interests", 5),
+    ]
+
+
+def test_compact_under_budget_only_cleans():
+    result = pb.compact("Jane   Doe\n\n\nSkills\nPython", budget=1000)
+    assert result["text"] == "Jane Doe\n\nSkills\nPython"
+    assert result["dropped"] == [] and result["truncated"] == []
+
+
+def test_compact_keeps_high_value_sections_over_budget():
+    experience = "\n".join(f"- Built service {i} in Python and FastAPI for team {i}" for i in range(200))
+    text = (
+        "Jane Doe\njane@example.com\n"
+        f"Experience\n{experience}\n"
+        "Skills\nPython, SQL\n"
+        "Education\nBSc CS, 2014\n"
+        "Hobbies\n" + "Chess and hiking on weekends. " * 200
+    )
+    result = pb.compact(text, budget=800)
+
+    assert result["tokens_after"] <= 800 + 20  # markers are added after budgeting
+    assert result["tokens_saved"] == result["tokens_before"] - result["tokens_after"] > 0
+    assert "interests" in result["dropped"]
+    assert "experience" in result["truncated"]
+    for kept in ("Jane Doe", "jane@example.com", "Built service 0", "Python, SQL", "BSc CS, 2014"):
+        assert kept in result["text"]
+    assert "Chess" not in result["text"]
+
+
+def test_compact_truncates_single_line_documents():
+    result = pb.compact("word " * 20000, budget=500)
+    assert 0 < result["tokens_after"] <= 510
+    assert result["truncated"] == ["header"]
+
+
+def test_compact_jd_keeps_requirements():
+    jd = (
+        "Senior Backend Engineer\n\n" + "We are growing fast. " * 400
+        + "\n\nRequirements:\n5+ years Python\n\nNice to have:\nKafka\n\nBenefits\n" + "Free lunch. " * 300
+    )
+    result = pb.compact(jd, budget=1500, kind="jd")
+    for kept in ("Senior Backend Engineer", "5+ years Python", "Kafka"):
+        assert kept in result["text"]
+    assert "benefits" in result["dropped"]
@@ -0,0 +1,26 @@
+import pytest
+
+from database import engine, Candidate
+from routes.candidate_routes import candidate_list_query
+from services import query_plans
+
+pytestmark = pytest.mark.skipif(engine.dialect.name != "sqlite", reason="EXPLAIN QUERY PLAN is SQLite-only")
+
+
+def test_no_hot_query_scans_its_table(db):
+    failures = [(name, plan) for name, ok, plan in query_plans.check_plans(db) if not ok]
+    assert failures == []
+
+
+def test_candidate_plan_is_the_route_query(db):
+    _, build = query_plans.HOT_QUERIES["GET /api/candidates?jd_id&sort_by=match_score"]
+    route_query, _, _ = candidate_list_query(db, ["id", "name", "match_score"], jd_id=1, sort_by="match_score")
+    assert query_plans.explain(db, build(db)) == query_plans.explain(db, route_query.limit(50))
+
+
+def test_full_scan_is_reported(db, monkeypatch):
+    monkeypatch.setattr(query_plans, "HOT_QUERIES", {
+        "unindexed": ("candidates", lambda db: db.query(Candidate.id).filter(Candidate.hr_notes == "x")),
+    })
+    [(name, ok, plan)] = query_plans.check_plans(db)
+    assert not ok and any("SCAN candidates" in line for line in plan)
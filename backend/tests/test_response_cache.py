@@ -0,0 +1,82 @@
+import pytest
+from fastapi import FastAPI
+from fastapi.responses import JSONResponse
+from fastapi.testclient import TestClient
+
+from services import response_cache
+from services.compression import CompressionMiddleware
+from services.response_cache import ResponseCacheMiddleware, etag_matches
+from tests.factories import make_jd
+
+PATH = "/api/jds"
+
+
+@pytest.fixture
+def client(monkeypatch):
+    monkeypatch.setattr(response_cache, "CACHED_PATHS", {PATH})
+    monkeypatch.setattr(response_cache, "RESPONSE_CACHE_ENABLED", True)
+    response_cache.invalidate()
+    renders = []
+
+    app = FastAPI()
+    app.add_middleware(ResponseCacheMiddleware)
+    app.add_middleware(CompressionMiddleware, minimum_size=100)
+
+    @app.get(PATH)
+    def listing():
+        renders.append(1)
+        return {"items": ["x" * 50] * 10, "render": len(renders)}
+
+    with TestClient(app) as c:
+        c.renders = renders
+        yield c
+
+
+def test_weak_etag_and_hits(client):
+    first = client.get(PATH, headers={"Accept-Encoding": "identity"})
+    second = client.get(PATH, headers={"Accept-Encoding": "identity"})
+    assert first.headers["etag"].startswith('W/"')
+    assert second.headers["etag"] == first.headers["etag"]
+    assert second.json()["render"] == 1 and len(client.renders) == 1
+
+
+def test_compressed_and_identity_share_the_weak_etag(client):
+    plain = client.get(PATH, headers={"Accept-Encoding": "identity"})
+    zipped = client.get(PATH, headers={"Accept-Encoding": "gzip"})
+    assert "content-encoding" not in plain.headers
+    assert zipped.headers["content-encoding"] == "gzip"
+    assert zipped.headers["etag"] == plain.headers["etag"]
+    assert zipped.headers["vary"] == plain.headers["vary"] == "Accept-Encoding"
+
+
+def test_not_modified_carries_vary(client):
+    etag = client.get(PATH).headers["etag"]
+    for sent in (etag, etag.removeprefix("W/"), f'"other", {etag}', "*"):
+        reply = client.get(PATH, headers={"If-None-Match": sent})
+        assert reply.status_code == 304
+        assert reply.headers["etag"] == etag and reply.headers["vary"] == "Accept-Encoding"
+
+
+def test_committed_writes_invalidate(client, db):
+    etag = client.get(PATH).headers["etag"]
+    make_jd(db)  # commits through SessionLocal
+    reply = client.get(PATH, headers={"If-None-Match": etag})
+    assert reply.status_code == 200 and reply.json()["render"] == 2
+
+
+def test_compression_weakens_strong_etags_from_routes():
+    app = FastAPI()
+    app.add_middleware(CompressionMiddleware, minimum_size=10)
+
+    @app.get("/strong")
+    def strong():
+        return JSONResponse({"a": "b" * 100}, headers={"ETag": '"abc"'})
+
+    with TestClient(app) as c:
+        reply = c.get("/strong", headers={"Accept-Encoding": "gzip"})
+    assert reply.headers["etag"] == 'W/"abc"'
+
+
+def test_etag_matches():
+    assert etag_matches('W/"a"', 'W/"a"') and etag_matches('"a"', 'W/"a"')
+    assert not etag_matches('"b"', 'W/"a"')
@@ -0,0 +1,64 @@
+import pytest
+
+from database import Candidate, fts_enabled
+from services import search_service
+from services.search_service import apply_search, to_match_query
+from tests.factories import make_jd, make_candidate
+
+
+@pytest.fixture
+def fts():
+    if not fts_enabled():  # only known once init_db() has run
+        pytest.skip("SQLite built without FTS5")
+
+
+def _search(db, term):
+    query, rank = apply_search(db.query(Candidate.name), term)
+    if rank is not None:
+        query = query.order_by(rank, Candidate.id)
+    return [row.name for row in query]
+
+
+def test_match_query_quotes_every_term_as_a_prefix():
+    assert to_match_query("jav dev") == '"jav"* "dev"*'
+    assert to_match_query('C++ "OR" NEAR(x) -foo') == '"C"* "OR"* "NEAR"* "x"* "foo"*'
+    assert to_match_query("  !!  ") == ""
+
+
+def test_blank_search_leaves_the_query_alone(db):
+    query = db.query(Candidate.id)
+    assert apply_search(query, " ?! ") == (query, None)
+
+
+def test_fts_ranks_name_hits_above_resume_text_hits(db, fts):
+    jd = make_jd(db)
+    make_candidate(db, jd, name="Priya Shah", resume_text="Kotlin and Android apps")
+    make_candidate(db, jd, name="Kotlin Kumar", resume_text="Swift on iOS")
+    make_candidate(db, jd, name="Ola Berg", resume_text="Python services")
+
+    assert _search(db, "kotl") == ["Kotlin Kumar", "Priya Shah"]
+    assert _search(db, "kotlin android") == ["Priya Shah"]
+
+
+def test_fts_index_follows_updates_and_deletes(db, fts):
+    jd = make_jd(db)
+    c = make_candidate(db, jd, name="Ola Berg", resume_text="Python services")
+    c.resume_text = "Rust services"
+    db.commit()
+    assert _search(db, "rust") == ["Ola Berg"]
+    assert _search(db, "python") == []
+
+    db.delete(c)
+    db.commit()
+    assert _search(db, "rust") == []
+
+
+def test_like_fallback_without_fts(db, monkeypatch):
+    monkeypatch.setattr(search_service, "fts_enabled", lambda: False)
+    jd = make_jd(db)
+    make_candidate(db, jd, name="Priya Shah", current_role="Android Engineer")
+    make_candidate(db, jd, name="Ola Berg", current_role="Data Engineer")
+
+    query, rank = apply_search(db.query(Candidate.name), "android")
+    assert rank is None
+    assert [r.name for r in query] == ["Priya Shah"]
@@ -0,0 +1,46 @@
+import json
+from datetime import date, datetime
+
+import pytest
+
+from database import Candidate
+from services import serializers
+from services.serializers import FastJSONResponse, json_list, or_zero, project, select_fields
+from tests.factories import make_jd, make_candidate
+
+SPECS = {
+    "id": (Candidate.id, None),
+    "name": (Candidate.name, None),
+    "matched_skills": (Candidate.matched_skills, json_list),
+    "match_score": (Candidate.match_score, or_zero),
+}
+
+
+@pytest.fixture(params=["orjson", "stdlib"])
+def json_backend(request, monkeypatch):
+    if request.param == "stdlib":
+        monkeypatch.setattr(serializers, "orjson", None)
+    elif serializers.orjson is None:
+        pytest.skip("orjson not installed")
+    return request.param
+
+
+def test_dumps_formats_dates_the_same_either_way(json_backend):
+    content = {"at": datetime(2024, 3, 13, 9, 30), "on": date(2024, 3, 13), "name": "Zoë"}
+    assert json.loads(serializers.dumps(content)) == {"at": "2024-03-13T09:30:00", "on": "2024-03-13", "name": "Zoë"}
+    assert FastJSONResponse([1, None]).body == serializers.dumps([1, None])
+
+
+def test_json_list_skips_empty_values(json_backend):
+    assert json_list(None) == json_list("") == json_list("[]") == []
+    assert json_list('["Go", "SQL"]') == ["Go", "SQL"]
+
+
+def test_project_applies_formatters_and_ignores_extra_columns(db):
+    jd = make_jd(db)
+    make_candidate(db, jd, name="Ana", score=None, matched_skills='["Go"]')
+    fields = list(SPECS)
+    rows = db.query(*select_fields(SPECS, fields)).add_columns(Candidate.id.label("sort_key")).all()
+
+    [item] = project(rows, fields, SPECS)
+    assert item == {"id": item["id"], "name": "Ana", "matched_skills": ["Go"], "match_score": 0}
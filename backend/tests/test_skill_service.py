@@ -0,0 +1,54 @@
+import json
+
+from database import Candidate, CandidateSkill
+from services import skill_service
+from services.analysis_service import save_analyzed_candidates
+from tests.factories import make_jd, make_candidate
+
+
+def _save(db, jd, name, matched, missing=()):
+    analysis = {"candidate_name": name, "overall_match_score": 70, "matched_skills": list(matched),
+                "missing_skills": list(missing)}
+    return save_analyzed_candidates(db, jd, [{"filename": f"{name}.pdf", "resume_text": "text", "analysis": analysis}])[0]
+
+
+def _names(db, *args, **kwargs):
+    query = db.query(Candidate.name).filter(skill_service.skill_filter(*args, **kwargs)).order_by(Candidate.name)
+    return [row.name for row in query]
+
+
+def test_skill_rows_normalize_and_dedupe():
+    rows = skill_service.skill_rows(1, 2, json.dumps(["  Node.JS ", "node.js", "Go", ""]), "not json")
+    assert [(r["kind"], r["skill_key"], r["skill"]) for r in rows] == [
+        ("matched", "node.js", "Node.JS"), ("matched", "go", "Go"),
+    ]
+
+
+def test_all_and_any_matching(db):
+    jd = make_jd(db)
+    _save(db, jd, "ana", ["Python", "Kubernetes"], missing=["Go"])
+    _save(db, jd, "ben", ["python"])
+    _save(db, jd, "cai", ["Go"])
+
+    assert _names(db, ["kubernetes", "PYTHON"]) == ["ana"]
+    assert _names(db, ["kubernetes", "python"], "any") == ["ana", "ben"]
+    assert _names(db, ["go"], kind="missing") == ["ana"]
+
+
+def test_filter_scoped_to_a_jd(db):
+    backend, data = make_jd(db), make_jd(db, title="Data Engineer")
+    _save(db, backend, "ana", ["Python"])
+    _save(db, data, "ben", ["Python"])
+    assert _names(db, ["python"], jd_id=data.id) == ["ben"]
+
+
+def test_backfill_indexes_only_unindexed_candidates(db):
+    jd = make_jd(db)
+    _save(db, jd, "ana", ["Python"])
+    make_candidate(db, jd, name="ben", matched_skills=json.dumps(["SQL", "Python"]))  # written without indexing
+
+    assert skill_service.backfill(db.connection()) == 2
+    db.commit()
+    assert db.query(CandidateSkill).count() == 3
+    assert _names(db, ["python"]) == ["ana", "ben"]
+    assert skill_service.backfill(db.connection()) == 0
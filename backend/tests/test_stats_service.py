@@ -0,0 +1,178 @@
+import threading
+from datetime import datetime
+
+from sqlalchemy import event
+
+from database import ActivityLog, Candidate, PipelineCounter, SessionLocal, engine, action_category
+from services import stats_service
+from services.analysis_service import save_analyzed_candidates
+from services.prescreen_service import PRESCREENED_OUT, prescreened_analysis
+from tests.factories import make_jd
+
+
+def _save(db, jd, name, score, recommendation="RECOMMENDED"):
+    analysis = {"candidate_name": name, "overall_match_score": score, "recommendation": recommendation}
+    return save_analyzed_candidates(db, jd, [{"filename": f"{name}.pdf", "resume_text": "text", "analysis": analysis}])[0]
+
+
+def _seed(db):
+    backend = make_jd(db)
+    data = make_jd(db, title="Data Engineer", status="paused")
+    for i, score in enumerate([92, 75, 75, 40, 18.5]):
+        _save(db, backend, f"b{i}", score, "HIGHLY RECOMMENDED" if score > 90 else "MAYBE")
+    for i, score in enumerate([66, 100]):
+        _save(db, data, f"d{i}", score, "RECOMMENDED")
+    screened = prescreened_analysis("unrelated.pdf", "gardening", relevance=3.0, threshold=20)
+    save_analyzed_candidates(db, backend, [{"filename": "unrelated.pdf", "resume_text": "gardening", "analysis": screened}])
+    return backend, data
+
+
+def test_counters_match_the_scan(db):
+    backend, _ = _seed(db)
+    c = db.query(Candidate).filter(Candidate.name == "b1").one()
+    old = c.status
+    c.status = "shortlisted"
+    stats_service.on_status_changed(db, c, old)
+    db.commit()
+
+    for jd_id in (None, backend.id):
+        for width in (10, 20, 25):
+            assert stats_service.counter_pipeline_stats(db, jd_id=jd_id, bin_width=width) == \
+                stats_service.scan_pipeline_stats(db, jd_id=jd_id, bin_width=width)
+
+
+def test_rebuild_reproduces_incremental_counters(db):
+    _seed(db)
+    before = stats_service.counter_pipeline_stats(db)
+    stats_service.rebuild_counters(db)
+    assert stats_service.counter_pipeline_stats(db) == before
+
+
+def test_prescreened_candidates_count_in_totals_but_not_in_score_stats(db):
+    backend, _ = _seed(db)
+    assert db.query(Candidate).filter(Candidate.recommendation == PRESCREENED_OUT).count() == 1
+
+    for stats in (stats_service.counter_pipeline_stats(db, jd_id=backend.id),
+                  stats_service.scan_pipeline_stats(db, jd_id=backend.id)):
+        assert stats["total_candidates"] == 6
+        assert stats["status_counts"]["new"] == 6
+        assert sum(stats["recommendation_counts"].values()) == 5
+        assert stats["min_score"] == 18.5
+        assert stats["avg_score"] == round((92 + 75 + 75 + 40 + 18.5) / 5, 1)
+        assert stats["score_distribution"][0] == {"range": "0-20", "count": 1}
+        assert stats["today_analyzed"] == 5
+    assert stats_service.pipeline_totals(db, jd_id=backend.id)["total"] == 6
+
+
+def test_screened_out_status_changes_move_the_totals(db):
+    backend, _ = _seed(db)
+    c = db.query(Candidate).filter(Candidate.recommendation == PRESCREENED_OUT).one()
+    c.status = "rejected"
+    stats_service.on_status_changed(db, c, "new")
+    db.commit()
+
+    assert stats_service.pipeline_totals(db, jd_id=backend.id)["by_status"]["rejected"] == 1
+    assert stats_service.counter_pipeline_stats(db) == stats_service.scan_pipeline_stats(db)
+
+
+def test_prescreened_log_is_not_counted_as_an_analysis(db):
+    _seed(db)
+    log = db.query(ActivityLog).filter(ActivityLog.action == "candidate_screened_out").one()
+    assert log.category == action_category(log.action) == "other"
+    assert db.query(ActivityLog).filter(ActivityLog.category == "resumes_analyzed").count() == 7
+
+
+KEY = {"jd_id": 1, "status": "new", "recommendation": "MAYBE"}
+
+
+def _counter(db):
+    return db.query(PipelineCounter.candidate_count, PipelineCounter.score_sum).filter_by(**KEY).one()
+
+
+def test_bump_is_a_single_upsert(db):
+    statements = []
+    listener = lambda conn, cursor, sql, *args: statements.append(sql)
+    event.listen(engine, "before_cursor_execute", listener)
+    try:
+        stats_service._bump(db, PipelineCounter, KEY, candidate_count=1, score_sum=40.0)
+        stats_service._bump(db, PipelineCounter, KEY, candidate_count=1, score_sum=60.0)
+        db.commit()
+    finally:
+        event.remove(engine, "before_cursor_execute", listener)
+
+    assert len(statements) == 2 and all("ON CONFLICT" in sql for sql in statements)
+    assert _counter(db) == (2, 100.0)
+
+
+def test_concurrent_bumps_on_a_new_key_all_count(db):
+    def writer():
+        session = SessionLocal()
+        try:
+            for _ in range(10):
+                stats_service._bump(session, PipelineCounter, KEY, candidate_count=1, score_sum=1.0)
+                session.commit()
+        finally:
+            session.close()
+
+    threads = [threading.Thread(target=writer) for _ in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert _counter(db) == (40, 40.0)
+
+
+def test_fallback_retries_when_another_writer_inserts_first(db, monkeypatch):
+    monkeypatch.setattr(stats_service, "_UPSERT_INSERTS", {})
+    other = SessionLocal()
+    other.add(PipelineCounter(**KEY, candidate_count=5, score_sum=5.0))
+    other.commit()
+    other.close()
+
+    # The first UPDATE "misses" as if it ran just before the other writer's INSERT landed
+    real_query, missed = db.query, []
+
+    def racing_query(*entities):
+        query = real_query(*entities)
+        if entities[0] is PipelineCounter and not missed:
+            missed.append(True)
+            query.update = lambda *a, **k: 0
+        return query
+
+    monkeypatch.setattr(db, "query", racing_query)
+    stats_service._bump(db, PipelineCounter, KEY, candidate_count=1, score_sum=2.0)
+    db.commit()
+    assert missed and _counter(db) == (6, 7.0)
+
+
+def test_score_bins_cover_0_to_100():
+    assert stats_service.score_bins(25) == [("0-25", 0, 25), ("25-50", 25, 50), ("50-75", 50, 75), ("75-100", 75, 100)]
+    assert stats_service.score_bins(30)[-1] == ("90-100", 90, 100)
+
+
+def test_scan_handles_windows_and_fractional_bins(db):
+    jd = make_jd(db)
+    old, recent = datetime(2024, 1, 10), datetime(2024, 3, 10)
+    for name, score, at in [("a", 100, recent), ("b", 12.5, recent), ("c", 70, old)]:
+        _save(db, jd, name, score)
+        db.query(Candidate).filter(Candidate.name == name).update({"analyzed_at": at})
+    db.commit()
+
+    windowed = stats_service.compute_pipeline_stats(db, date_from=datetime(2024, 3, 1), date_to=datetime(2024, 4, 1))
+    assert (windowed["total_candidates"], windowed["max_score"], windowed["min_score"]) == (2, 100, 12.5)
+    assert windowed["top_candidates_count"] == 1
+    assert windowed["score_distribution"][-1] == {"range": "80-100", "count": 1}  # 100 lands in the last bin
+
+    halves = stats_service.compute_pipeline_stats(db, bin_width=12.5)
+    assert [b["count"] for b in halves["score_distribution"]] == [0, 1, 0, 0, 0, 1, 0, 1]
+
+
+def test_non_numeric_model_output_is_stored_as_numbers(db):
+    jd = make_jd(db)
+    analysis = {"candidate_name": "ana", "overall_match_score": "85", "star_rating": "N/A", "experience_years": None}
+    [c] = save_analyzed_candidates(db, jd, [{"filename": "ana.pdf", "resume_text": "text", "analysis": analysis}])
+    _save(db, jd, "ben", "high")
+
+    assert (c.match_score, c.star_rating, c.experience_years) == (85.0, 1.0, 0.0)
+    assert stats_service.counter_pipeline_stats(db) == stats_service.scan_pipeline_stats(db)
+    assert stats_service.counter_pipeline_stats(db)["max_score"] == 85.0
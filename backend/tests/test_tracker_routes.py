@@ -0,0 +1,52 @@
+from datetime import datetime, timedelta
+
+import pytest
+from fastapi import HTTPException
+
+from database import ActivityLog, action_category
+from routes.tracker_routes import get_today_summary
+
+
+def _log(db, action, created_at):
+    entry = ActivityLog(action=action, entity_type="candidate", entity_id=1, created_at=created_at)
+    db.add(entry)
+    return entry
+
+
+def test_actions_are_classified_when_written():
+    assert action_category("resume_analyzed") == "resumes_analyzed"
+    assert action_category("jd_generated") == "jds_created"
+    assert action_category("Email_Sent") == "emails_sent"
+    assert action_category("candidate_screened_out") == "other"
+    assert action_category(None) == "other"
+
+
+def test_today_counts_and_pages_through_the_timeline(db):
+    now = datetime.utcnow().replace(microsecond=0)
+    start = now.replace(hour=0, minute=0, second=0)
+    _log(db, "resume_analyzed", start - timedelta(seconds=1))  # yesterday
+    same_instant = max(start, now - timedelta(minutes=5))
+    for action in ("resume_analyzed", "resume_analyzed", "status_changed", "email_sent", "jd_created"):
+        _log(db, action, same_instant)  # equal timestamps — only the id tie-break orders them
+    db.commit()
+
+    first = get_today_summary(limit=2, cursor=None, db=db)
+    assert first["total_actions"] == 5
+    assert first["breakdown"] == {
+        "resumes_analyzed": 2, "jds_created": 1, "emails_sent": 1, "status_updates": 1, "chats": 0,
+    }
+
+    ids, page = [], first
+    while True:
+        ids += [entry["id"] for entry in page["timeline"]]
+        if not page["next_cursor"]:
+            break
+        page = get_today_summary(limit=2, cursor=page["next_cursor"], db=db)
+    today_ids = [a.id for a in db.query(ActivityLog).filter(ActivityLog.created_at >= start)]
+    assert ids == sorted(today_ids, reverse=True)
+
+
+def test_bad_cursor_is_a_400(db):
+    with pytest.raises(HTTPException) as err:
+        get_today_summary(limit=2, cursor="garbage", db=db)
+    assert err.value.status_code == 400